@@ -1,32 +1,24 @@
 """
 판매 데이터 분석 및 자동 보고서 시스템
 CSV 파일 읽기 → 데이터 분석 → 워드 보고서 생성 → 이메일 전송
+python-docx와 이메일 모듈(smtplib, smtp_delivery, email_dispatch)은 사용하는 함수 안에서 가져옵니다.
 """
 
 import pandas as pd
 from datetime import datetime
-from docx import Document
-from docx.shared import Inches, Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-import matplotlib.pyplot as plt
-import matplotlib
-import seaborn as sns
-import numpy as np
+import io
 import os
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
+import sys
+from sales_cube import SalesCube
+from sales_index import load_report_data, parse_report_filters, describe_filters, print_no_matching_rows
+from chart_renderer import chart_task, render_charts, add_chart_picture, chart_exists
+from docx_tables import add_dataframe_table, format_numbers
+from pipeline_metrics import start_metrics, finish_metrics, stage, instrumented
 import warnings
 warnings.filterwarnings('ignore')
 
-# matplotlib 백엔드 설정 (GUI 없이 이미지만 생성)
-matplotlib.use('Agg')
-
-# 한글 폰트 설정 (Windows 환경)
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+# 차트 렌더 프로파일 (이메일 첨부 용량을 줄이기 위해 'email' 사용, 인쇄용은 'print')
+CHART_PROFILE = 'email'
 
 # ==================== 이메일 설정 ====================
 EMAIL_CONFIG = {
@@ -37,128 +29,28 @@ EMAIL_CONFIG = {
         'recipient@company.com'              # 필요시 다른 수신자 추가
     ],
     'smtp_server': 'smtp.gmail.com',         # SMTP 서버
-    'smtp_port': 587                         # SMTP 포트
+    'smtp_port': 587,                        # SMTP 포트
+    'group_size': 1,                         # 메시지당 받는 사람 수 (1이면 개인별 메시지)
+    'concurrency': 4                         # 동시에 전송할 최대 메시지 수
 }
 
-def load_and_clean_data(file_path):
-    """CSV 데이터 로드 및 전처리"""
-    print("="*50)
-    print("📊 데이터 로드 및 전처리")
-    print("="*50)
-    
-    try:
-        # CSV 파일 읽기
-        df = pd.read_csv(file_path, encoding='utf-8')
-        print(f"✅ 데이터 로드 완료: {file_path}")
-        print(f"📊 원본 데이터 개수: {len(df)}개")
-        print(f"📋 컬럼: {list(df.columns)}")
-        
-        # 데이터 정리
-        print("\n🔧 데이터 전처리 중...")
-        
-        # 1. 날짜 컬럼 변환
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        
-        # 2. 텍스트 데이터 정리
-        df['ProductName'] = df['ProductName'].str.title()
-        df['Category'] = df['Category'].str.title()
-        df['Salesperson'] = df['Salesperson'].str.title()
-        
-        # 3. 결측값 및 오류 데이터 제거
-        original_count = len(df)
-        df = df.dropna(subset=['Date', 'ProductID', 'Quantity', 'UnitPrice'])
-        df = df[df['ProductID'] != 'P0000']  # 잘못된 제품 ID 제거
-        df = df[df['Quantity'] > 0]
-        df = df[df['UnitPrice'] > 0]
-        
-        # 4. TotalPrice 재계산
-        df['TotalPrice'] = df['Quantity'] * df['UnitPrice']
-        
-        cleaned_count = len(df)
-        removed_count = original_count - cleaned_count
-        
-        print(f"✅ 데이터 전처리 완료")
-        print(f"📊 정리 후 데이터: {cleaned_count}개")
-        print(f"🗑️  제거된 데이터: {removed_count}개")
-        
-        return df
-        
-    except FileNotFoundError:
-        print(f"❌ 파일을 찾을 수 없습니다: {file_path}")
-        return None
-    except Exception as e:
-        print(f"❌ 데이터 로드 중 오류 발생: {e}")
-        return None
-
-def create_charts(df):
-    """시각화 차트 생성"""
+def create_charts(cube, in_memory=False):
+    """시각화 차트 생성 (차트별로 병렬 렌더링, in_memory이면 파일 대신 ChartImage 리스트 반환)"""
     print("\n📊 시각화 차트 생성 중...")
     
-    chart_files = []
-    
     try:
-        # 1. 카테고리별 매출 파이차트
-        category_sales = df.groupby('Category')['TotalPrice'].sum().sort_values(ascending=False)
-        
-        plt.figure(figsize=(8, 6))
-        colors = plt.cm.Set3(np.linspace(0, 1, len(category_sales)))
-        wedges, texts, autotexts = plt.pie(category_sales.values, labels=category_sales.index, 
-                                          autopct='%1.1f%%', colors=colors, startangle=90)
-        plt.title('카테고리별 매출 비율', fontsize=14, fontweight='bold', pad=20)
-        
-        plt.legend(wedges, [f'{cat}\n{val:,.0f}원' for cat, val in category_sales.items()], 
-                  title="카테고리별 매출액", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
-        
-        plt.tight_layout()
-        chart1_path = 'chart_category_pie.png'
-        plt.savefig(chart1_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        chart_files.append(chart1_path)
-        
-        # 2. 지역별 매출 막대차트
-        region_sales = df.groupby('Region')['TotalPrice'].sum().sort_values(ascending=False)
-        
-        plt.figure(figsize=(10, 6))
-        bars = plt.bar(region_sales.index, region_sales.values, color=['#FF9999', '#66B2FF', '#99FF99', '#FFCC99'])
-        plt.title('지역별 매출액', fontsize=14, fontweight='bold', pad=20)
-        plt.xlabel('지역', fontsize=12)
-        plt.ylabel('매출액 (원)', fontsize=12)
-        
-        for bar, value in zip(bars, region_sales.values):
-            plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(region_sales.values) * 0.01, 
-                    f'{value:,.0f}원', ha='center', va='bottom', fontsize=10)
-        
-        plt.xticks(rotation=45)
-        plt.grid(axis='y', alpha=0.3)
-        plt.tight_layout()
-        chart2_path = 'chart_region_bar.png'
-        plt.savefig(chart2_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        chart_files.append(chart2_path)
-        
-        # 3. 일별 매출 추이 선 그래프
-        daily_sales = df.groupby('Date')['TotalPrice'].sum().sort_index()
-        
-        plt.figure(figsize=(12, 6))
-        plt.plot(daily_sales.index, daily_sales.values, marker='o', linewidth=2, markersize=4, color='#2E86AB')
-        plt.title('일별 매출 추이', fontsize=14, fontweight='bold', pad=20)
-        plt.xlabel('날짜', fontsize=12)
-        plt.ylabel('매출액 (원)', fontsize=12)
-        
-        max_idx = daily_sales.idxmax()
-        plt.annotate(f'최고: {daily_sales[max_idx]:,.0f}원', 
-                    xy=(max_idx, daily_sales[max_idx]), xytext=(10, 10),
-                    textcoords='offset points', ha='left',
-                    bbox=dict(boxstyle='round,pad=0.3', fc='yellow', alpha=0.7),
-                    arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
-        
-        plt.xticks(rotation=45)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        chart3_path = 'chart_daily_trend.png'
-        plt.savefig(chart3_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        chart_files.append(chart3_path)
+        tasks = [
+            # 1. 카테고리별 매출 파이차트
+            chart_task('pie', cube.sales_by('Category'), 'chart_category_pie.png'),
+            # 2. 지역별 매출 막대차트
+            chart_task('bar', cube.sales_by('Region'), 'chart_region_bar.png',
+                       title='지역별 매출액', xlabel='지역',
+                       color=['#FF9999', '#66B2FF', '#99FF99', '#FFCC99']),
+            # 3. 일별 매출 추이 선 그래프
+            chart_task('line', cube.daily_totals(), 'chart_daily_trend.png')
+        ]
+        
+        chart_files = render_charts(tasks, profile=CHART_PROFILE, in_memory=in_memory)
         
         print(f"✅ {len(chart_files)}개의 차트가 생성되었습니다.")
         return chart_files
@@ -167,9 +59,13 @@ def create_charts(df):
         print(f"❌ 차트 생성 중 오류 발생: {e}")
         return []
 
-def generate_word_report(df, chart_files):
-    """워드 보고서 생성"""
+@instrumented('document')
+def generate_word_report(cube, chart_files, in_memory=False, scope=None):
+    """워드 보고서 생성 (파일 이름 반환, in_memory이면 저장하지 않고 (파일 이름, .docx 바이트) 반환, scope는 보고서 대상 설명)"""
     print("\n📄 워드 보고서 생성 중...")
+    from docx import Document
+    from docx.shared import Inches
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
     
     try:
         # 새 문서 생성
@@ -179,25 +75,23 @@ def generate_word_report(df, chart_files):
         title = doc.add_heading('판매 데이터 분석 보고서', 0)
         title.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
+        summary = cube.summary()
+        date_range = f"{summary['min_date'].strftime('%Y-%m-%d')} ~ {summary['max_date'].strftime('%Y-%m-%d')}"
+        
         # 생성 일자 및 기본 정보
         doc.add_paragraph(f"보고서 생성일: {datetime.now().strftime('%Y년 %m월 %d일 %H시 %M분')}")
-        doc.add_paragraph(f"데이터 분석 기간: {df['Date'].min().strftime('%Y-%m-%d')} ~ {df['Date'].max().strftime('%Y-%m-%d')}")
+        doc.add_paragraph(f"데이터 분석 기간: {date_range}")
+        if scope:
+            doc.add_paragraph(f"보고서 대상: {scope}")
         doc.add_paragraph("")
         
         # === 1. 요약 통계 ===
         doc.add_heading('📊 요약 통계', level=1)
         
-        summary_table = doc.add_table(rows=6, cols=2)
-        summary_table.style = 'Table Grid'
-        
-        summary_table.cell(0, 0).text = '구분'
-        summary_table.cell(0, 1).text = '값'
-        
-        total_sales = df['TotalPrice'].sum()
-        total_quantity = df['Quantity'].sum()
-        avg_order_value = df['TotalPrice'].mean()
-        unique_products = df['ProductID'].nunique()
-        date_range = f"{df['Date'].min().strftime('%Y-%m-%d')} ~ {df['Date'].max().strftime('%Y-%m-%d')}"
+        total_sales = summary['total_sales']
+        total_quantity = summary['total_quantity']
+        avg_order_value = summary['avg_order_value']
+        unique_products = summary['unique_products']
         
         summary_data = [
             ['분석 기간', date_range],
@@ -207,101 +101,67 @@ def generate_word_report(df, chart_files):
             ['판매된 제품 종류', f"{unique_products}개"]
         ]
         
-        for i, (category, value) in enumerate(summary_data, 1):
-            summary_table.cell(i, 0).text = category
-            summary_table.cell(i, 1).text = value
+        add_dataframe_table(doc, pd.DataFrame(summary_data, columns=['구분', '값']))
         
         doc.add_paragraph("")
         
         # === 2. 카테고리별 분석 ===
         doc.add_heading('📊 카테고리별 판매 분석', level=1)
         
-        category_sales = df.groupby('Category').agg({
-            'TotalPrice': 'sum',
-            'Quantity': 'sum',
-            'ProductID': 'nunique'
-        }).round(2)
-        category_sales.columns = ['총 매출액', '총 수량', '제품 종류 수']
-        category_sales = category_sales.sort_values('총 매출액', ascending=False)
-        
-        cat_table = doc.add_table(rows=len(category_sales)+1, cols=4)
-        cat_table.style = 'Table Grid'
+        category_sales = cube.category_sales()
         
-        cat_headers = ['카테고리', '총 매출액 (원)', '총 수량 (개)', '제품 종류 수']
-        for i, header in enumerate(cat_headers):
-            cat_table.cell(0, i).text = header
-        
-        for i, (category, row) in enumerate(category_sales.iterrows(), 1):
-            cat_table.cell(i, 0).text = category
-            cat_table.cell(i, 1).text = f"{row['총 매출액']:,.0f}"
-            cat_table.cell(i, 2).text = f"{row['총 수량']:,.0f}"
-            cat_table.cell(i, 3).text = str(row['제품 종류 수'])
+        add_dataframe_table(doc, pd.DataFrame({
+            '카테고리': category_sales.index,
+            '총 매출액 (원)': format_numbers(category_sales['총 매출액']),
+            '총 수량 (개)': format_numbers(category_sales['총 수량']),
+            '제품 종류 수': category_sales['제품 종류 수'].astype('float64')
+        }))
         
         # 카테고리 차트 삽입
-        if len(chart_files) > 0 and os.path.exists(chart_files[0]):
+        if len(chart_files) > 0 and chart_exists(chart_files[0]):
             doc.add_paragraph("")
             doc.add_paragraph("📊 카테고리별 매출 비율 차트", style='Heading 2')
-            doc.add_picture(chart_files[0], width=Inches(6))
+            add_chart_picture(doc, chart_files[0], Inches(6))
         
         doc.add_paragraph("")
         
         # === 3. 지역별 분석 ===
         doc.add_heading('🌍 지역별 판매 분석', level=1)
         
-        region_sales = df.groupby('Region').agg({
-            'TotalPrice': 'sum',
-            'Quantity': 'sum'
-        }).round(2)
-        region_sales.columns = ['총 매출액', '총 수량']
-        region_sales = region_sales.sort_values('총 매출액', ascending=False)
-        
-        region_table = doc.add_table(rows=len(region_sales)+1, cols=3)
-        region_table.style = 'Table Grid'
+        region_sales = cube.region_sales()
         
-        region_headers = ['지역', '총 매출액 (원)', '총 수량 (개)']
-        for i, header in enumerate(region_headers):
-            region_table.cell(0, i).text = header
-        
-        for i, (region, row) in enumerate(region_sales.iterrows(), 1):
-            region_table.cell(i, 0).text = region
-            region_table.cell(i, 1).text = f"{row['총 매출액']:,.0f}"
-            region_table.cell(i, 2).text = f"{row['총 수량']:,.0f}"
+        add_dataframe_table(doc, pd.DataFrame({
+            '지역': region_sales.index,
+            '총 매출액 (원)': format_numbers(region_sales['총 매출액']),
+            '총 수량 (개)': format_numbers(region_sales['총 수량'])
+        }))
         
         # 지역별 차트 삽입
-        if len(chart_files) > 1 and os.path.exists(chart_files[1]):
+        if len(chart_files) > 1 and chart_exists(chart_files[1]):
             doc.add_paragraph("")
             doc.add_paragraph("📊 지역별 매출 비교 차트", style='Heading 2')
-            doc.add_picture(chart_files[1], width=Inches(6))
+            add_chart_picture(doc, chart_files[1], Inches(6))
         
         doc.add_paragraph("")
         
         # === 4. 베스트셀러 제품 ===
         doc.add_heading('🏆 베스트셀러 제품 TOP 10', level=1)
         
-        top_products = df.groupby(['ProductID', 'ProductName']).agg({
-            'TotalPrice': 'sum',
-            'Quantity': 'sum'
-        }).sort_values('TotalPrice', ascending=False).head(10)
-        
-        product_table = doc.add_table(rows=len(top_products)+1, cols=4)
-        product_table.style = 'Table Grid'
+        top_products = cube.product_sales(top_n=10)
         
-        product_headers = ['순위', '제품명', '총 매출액 (원)', '총 수량 (개)']
-        for i, header in enumerate(product_headers):
-            product_table.cell(0, i).text = header
-        
-        for i, ((product_id, product_name), row) in enumerate(top_products.iterrows(), 1):
-            product_table.cell(i, 0).text = str(i)
-            product_table.cell(i, 1).text = product_name
-            product_table.cell(i, 2).text = f"{row['TotalPrice']:,.0f}"
-            product_table.cell(i, 3).text = f"{row['Quantity']:,.0f}"
+        add_dataframe_table(doc, pd.DataFrame({
+            '순위': range(1, len(top_products) + 1),
+            '제품명': top_products.index.get_level_values('ProductName'),
+            '총 매출액 (원)': format_numbers(top_products['총 매출액']),
+            '총 수량 (개)': format_numbers(top_products['총 수량'])
+        }))
         
         doc.add_paragraph("")
         
         # === 5. 일별 매출 추이 ===
         doc.add_heading('📈 일별 매출 추이', level=1)
         
-        daily_sales_data = df.groupby('Date')['TotalPrice'].sum()
+        daily_sales_data = cube.daily_totals()
         max_sales_day = daily_sales_data.idxmax()
         min_sales_day = daily_sales_data.idxmin()
         avg_daily_sales = daily_sales_data.mean()
@@ -312,10 +172,10 @@ def generate_word_report(df, chart_files):
         daily_stats.add_run(f"• 일평균 매출액: {avg_daily_sales:,.0f}원")
         
         # 일별 추이 차트 삽입
-        if len(chart_files) > 2 and os.path.exists(chart_files[2]):
+        if len(chart_files) > 2 and chart_exists(chart_files[2]):
             doc.add_paragraph("")
             doc.add_paragraph("📊 일별 매출 추이 차트", style='Heading 2')
-            doc.add_picture(chart_files[2], width=Inches(7))
+            add_chart_picture(doc, chart_files[2], Inches(7))
         
         # === 6. 결론 및 제안사항 ===
         doc.add_heading('💡 결론 및 제안사항', level=1)
@@ -331,7 +191,14 @@ def generate_word_report(df, chart_files):
         
         # 문서 저장
         report_filename = f'sales_analysis_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.docx'
-        doc.save(report_filename)
+        if in_memory:
+            with stage('save'):
+                buffer = io.BytesIO()
+                doc.save(buffer)
+            print(f"✅ 워드 보고서 생성 완료 (메모리): {report_filename} ({len(buffer.getvalue()) / 1024:.1f}KB)")
+            return report_filename, buffer.getvalue()
+        with stage('save'):
+            doc.save(report_filename)
         
         print(f"✅ 워드 보고서 생성 완료: {report_filename}")
         return report_filename
@@ -340,19 +207,14 @@ def generate_word_report(df, chart_files):
         print(f"❌ 워드 보고서 생성 중 오류 발생: {e}")
         return None
 
-def send_email_with_report(report_file, config):
-    """이메일로 보고서 전송"""
-    print(f"\n📧 이메일 전송 중...")
+def build_report_email(report_file, config, report_data=None):
+    """보고서 이메일 메시지 생성 (받는 사람별 또는 그룹별, 파일이 없으면 None, report_data를 주면 파일 대신 첨부)"""
+    from smtp_delivery import build_report_messages, DEFAULT_GROUP_SIZE
     
-    try:
-        # 이메일 메시지 생성
-        msg = MIMEMultipart()
-        msg['From'] = config['sender_email']
-        msg['To'] = ", ".join(config['recipient_emails'])
-        msg['Subject'] = f"판매 데이터 분석 보고서 - {datetime.now().strftime('%Y년 %m월 %d일')}"
-        
-        # 이메일 본문
-        body = f"""
+    subject = f"판매 데이터 분석 보고서 - {datetime.now().strftime('%Y년 %m월 %d일')}"
+    
+    # 이메일 본문
+    body = f"""
 안녕하세요,
 
 첨부된 파일은 {datetime.now().strftime('%Y년 %m월 %d일 %H시 %M분')}에 자동 생성된 판매 데이터 분석 보고서입니다.
@@ -373,37 +235,40 @@ def send_email_with_report(report_file, config):
 ⚡ 자동화 시스템으로 생성된 보고서
 🕒 생성 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
-        
-        # 본문 첨부
-        msg.attach(MIMEText(body, 'plain', 'utf-8'))
-        
-        # 워드 파일 첨부
-        if os.path.exists(report_file):
-            with open(report_file, "rb") as attachment:
-                part = MIMEBase('application', 'vnd.openxmlformats-officedocument.wordprocessingml.document')
-                part.set_payload(attachment.read())
-            
-            encoders.encode_base64(part)
-            filename = os.path.basename(report_file)
-            part.add_header(
-                'Content-Disposition',
-                f'attachment; filename= {filename}',
-            )
-            msg.attach(part)
-            
-            print(f"📎 파일 첨부 완료: {filename}")
-        else:
-            print(f"❌ 보고서 파일을 찾을 수 없습니다: {report_file}")
+    
+    if report_data is None and not os.path.exists(report_file):
+        print(f"❌ 보고서 파일을 찾을 수 없습니다: {report_file}")
+        return None
+    
+    messages = build_report_messages(
+        config['sender_email'], config['recipient_emails'], subject, body,
+        attachment_path=report_file, group_size=config.get('group_size', DEFAULT_GROUP_SIZE),
+        attachment_data=report_data
+    )
+    print(f"📎 파일 첨부 완료: {os.path.basename(report_file)}")
+    return messages
+
+def send_email_with_report(report_file, config):
+    """이메일로 보고서 전송"""
+    import smtplib
+    from smtp_delivery import send_messages, failed_recipients, print_delivery_failures
+    
+    print(f"\n📧 이메일 전송 중...")
+    
+    try:
+        messages = build_report_email(report_file, config)
+        if messages is None:
             return False
         
-        # SMTP 서버 연결 및 전송
-        server = smtplib.SMTP(config['smtp_server'], config['smtp_port'])
-        server.starttls()
-        server.login(config['sender_email'], config['sender_password'])
+        # 재사용 연결 풀로 SMTP 서버 연결 및 전송
+        results = send_messages(messages, config['smtp_server'], config['smtp_port'],
+                                config['sender_email'], config['sender_password'])
         
-        text = msg.as_string()
-        server.sendmail(config['sender_email'], config['recipient_emails'], text)
-        server.quit()
+        failed = failed_recipients(results)
+        if failed:
+            print(f"❌ 일부 받는 사람에게 전송하지 못했습니다 ({len(failed)}명):")
+            print_delivery_failures(results)
+            return False
         
         print("✅ 이메일 전송 완료!")
         print(f"📧 받는 사람: {', '.join(config['recipient_emails'])}")
@@ -417,51 +282,96 @@ def send_email_with_report(report_file, config):
         print(f"❌ 이메일 전송 중 오류 발생: {e}")
         return False
 
-def main():
-    """메인 함수 - 전체 프로세스 실행"""
+def create_email_dispatcher(config):
+    """설정의 SMTP 서버로 백그라운드 이메일 발송기 생성"""
+    from smtp_delivery import get_pool
+    from email_dispatch import EmailDispatcher
+    
+    pool = get_pool(config['smtp_server'], config['smtp_port'], config['sender_email'], config['sender_password'])
+    return EmailDispatcher(pool, concurrency=config.get('concurrency'))
+
+def report_dispatch_results(results):
+    """발송기 결과를 출력하고 전체 성공 여부 반환"""
+    import smtplib
+    from smtp_delivery import failed_recipients
+    from email_dispatch import print_dispatch_report
+    
+    print_dispatch_report(results)
+    if any(isinstance(result['error'], smtplib.SMTPAuthenticationError) for result in results):
+        print("❌ 이메일 인증 실패 - 이메일 주소와 앱 비밀번호를 확인하세요.")
+    return bool(results) and not failed_recipients(results)
+
+def main(in_memory=False, filters=None):
+    """메인 함수 - 전체 프로세스 실행 (in_memory이면 차트와 보고서를 파일로 남기지 않고 메모리에서 바로 전송, filters는 보고서 대상 조건)"""
     print("🚀 판매 데이터 분석 및 자동 보고서 시스템")
     print("="*60)
     print("📋 프로세스: CSV 읽기 → 분석 → 워드 보고서 → 이메일 전송")
     print("="*60)
     
-    start_time = datetime.now()
+    # 단계별 실행 시간, CPU 시간, 최대 RSS, 행 수 측정
+    metrics = start_metrics('automated_sales_report')
+    dispatcher = None
     
     try:
         # Step 1: CSV 데이터 로드 및 전처리
         csv_file = 'cicd_data.csv'
-        df = load_and_clean_data(csv_file)
+        df = load_report_data(csv_file, filters)
         
         if df is None:
             print("❌ 데이터 로드에 실패했습니다. 프로그램을 종료합니다.")
             return
+        if df.empty:
+            print_no_matching_rows(filters)
+            return
+        
+        # 보고서를 만드는 동안 SMTP 연결과 로그인을 백그라운드에서 미리 진행
+        dispatcher = create_email_dispatcher(EMAIL_CONFIG).warm_up()
+        
+        # 집계 큐브 생성 (차트와 표는 모두 이 결과를 다시 묶어서 사용)
+        cube = SalesCube.from_dataframe(df)
         
         # Step 2: 시각화 차트 생성
-        chart_files = create_charts(df)
+        chart_files = create_charts(cube, in_memory=in_memory)
         
         # Step 3: 워드 보고서 생성
-        report_file = generate_word_report(df, chart_files)
+        report = generate_word_report(cube, chart_files, in_memory=in_memory, scope=describe_filters(filters))
         
-        if report_file is None:
+        if report is None:
             print("❌ 보고서 생성에 실패했습니다.")
             return
+        report_file, report_data = report if in_memory else (report, None)
         
-        # Step 4: 이메일 전송
+        # Step 4: 이메일 전송 (백그라운드 발송기에 맡기고 나머지 작업을 계속 진행)
         print(f"\n📧 이메일 설정 확인...")
         print(f"보내는 사람: {EMAIL_CONFIG['sender_email']}")
         print(f"받는 사람: {', '.join(EMAIL_CONFIG['recipient_emails'])}")
         
-        # 실제 이메일 전송
-        email_success = send_email_with_report(report_file, EMAIL_CONFIG)
+        with stage('email_build') as info:
+            messages = build_report_email(report_file, EMAIL_CONFIG, report_data=report_data)
+            info['rows'] = len(messages) if messages else 0
+        if messages:
+            print(f"📤 이메일 {len(messages)}개 전송 시작 (백그라운드)")
+            dispatcher.submit(messages)
+        
+        # 생성된 파일 목록 출력
+        print("\n📁 생성된 파일 목록:")
+        if in_memory:
+            print("   (메모리 모드 - 저장된 파일 없음)")
+        elif os.path.exists(report_file):
+            file_size = os.path.getsize(report_file) / 1024  # KB
+            print(f"   📄 {report_file} ({file_size:.1f}KB)")
         
-        # 테스트용 - 위 라인이 활성화되면 아래는 주석 처리
-        # print("📧 이메일 전송 기능은 설정 완료 후 사용하세요.")
-        # print("💡 EMAIL_CONFIG에서 실제 이메일 정보를 입력하고 send_email_with_report 함수 주석을 해제하세요.")
-        # email_success = True  # 테스트용
+        for chart_file in chart_files:
+            if not in_memory and os.path.exists(chart_file):
+                file_size = os.path.getsize(chart_file) / 1024  # KB
+                print(f"   📊 {chart_file} ({file_size:.1f}KB)")
         
-        # 결과 요약
-        end_time = datetime.now()
-        execution_time = (end_time - start_time).seconds
+        # 전송 완료 대기 및 메시지별 결과 확인
+        with stage('email_send', rows=len(messages) if messages else 0):
+            results = dispatcher.finish()
+        email_success = report_dispatch_results(results)
         
+        # 결과 요약
         print("\n" + "="*60)
         print("🎉 자동 보고서 시스템 실행 완료!")
         print("="*60)
@@ -469,21 +379,11 @@ def main():
         print(f"📄 생성된 보고서: {report_file}")
         print(f"📈 생성된 차트: {len(chart_files)}개")
         print(f"📧 이메일 전송: {'성공' if email_success else '실패'}")
-        print(f"⏱️  총 실행 시간: {execution_time}초")
+        print(f"⏱️  총 실행 시간: {metrics.total_seconds:.2f}초")
         print("="*60)
         
-        # 생성된 파일 목록 출력
-        print("\n📁 생성된 파일 목록:")
-        if os.path.exists(report_file):
-            file_size = os.path.getsize(report_file) / 1024  # KB
-            print(f"   📄 {report_file} ({file_size:.1f}KB)")
-        
-        for chart_file in chart_files:
-            if os.path.exists(chart_file):
-                file_size = os.path.getsize(chart_file) / 1024  # KB
-                print(f"   📊 {chart_file} ({file_size:.1f}KB)")
-        
-        print(f"\n💡 보고서를 확인하려면 '{report_file}' 파일을 열어보세요!")
+        if not in_memory:
+            print(f"\n💡 보고서를 확인하려면 '{report_file}' 파일을 열어보세요!")
         
     except KeyboardInterrupt:
         print("\n❌ 사용자가 프로그램을 중단했습니다.")
@@ -491,6 +391,17 @@ def main():
         print(f"\n❌ 예상치 못한 오류가 발생했습니다: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        # 보고서 생성 실패나 예외로 끝나도 미리 연결해 둔 발송기 스레드와 이벤트 루프를 정리
+        if dispatcher is not None:
+            dispatcher.finish()
+        # 단계별 측정 결과 출력 및 저장 (실패한 실행도 어느 단계에서 멈췄는지 남김)
+        finish_metrics()
+        print("\n" + metrics.format_table())
+        json_path, table_path = metrics.write()
+        print(f"\n📈 단계별 측정 결과 저장: {json_path}, {table_path}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # --in-memory 옵션: 차트와 보고서를 디스크에 저장하지 않고 메모리에서 바로 이메일로 전송
+    # --start/--end/--region/--category/--salesperson 옵션: 보고서 대상 조건
+    main(in_memory='--in-memory' in sys.argv, filters=parse_report_filters(sys.argv[1:]))
\ No newline at end of file
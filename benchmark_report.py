@@ -0,0 +1,306 @@
+"""
+보고서 파이프라인 벤치마크
+sales_data_generator로 만든 합성 데이터(10^3~10^8행)로 단계별(로드, 정리, 집계, 분석, 차트, DOCX, XLSX, 이메일 생성)
+실행 시간, CPU 시간, 메모리 사용량을 측정하고 결과를 커밋 정보와 함께 benchmarks/results.jsonl에 누적합니다.
+같은 설정의 이전 결과와 비교하여 느려진 단계를 표시합니다.
+
+사용 예:
+    python benchmark_report.py                         # 10^3, 10^4, 10^5행
+    python benchmark_report.py --rows 1e6 1e7 --dirty-ratio 0.05
+    python benchmark_report.py --rows 1e8 --skip xlsx  # 10^8행은 스트리밍 집계로 측정
+    python benchmark_report.py --trace-memory          # 단계별 최대 메모리 할당량까지 측정
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from sales_data_generator import add_generator_arguments, generator_settings, write_sales_csv
+from sales_data_loader import read_sales_csv, clean_sales_data, load_and_aggregate_streaming, iter_clean_chunks
+from sales_cube import SalesCube
+
+# 리눅스/macOS에서만 프로세스 최대 메모리(RSS) 측정
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# 기본 측정 행 수
+DEFAULT_BENCHMARK_ROWS = [1_000, 10_000, 100_000]
+
+# 생성한 합성 데이터 저장 폴더 (같은 설정이면 다시 생성하지 않음)
+BENCHMARK_DATA_DIR = os.path.join('.cache', 'benchmark_data')
+
+# 측정 결과 누적 파일 (한 줄에 한 실행)
+BENCHMARK_RESULTS_PATH = os.path.join('benchmarks', 'results.jsonl')
+
+# 이 행 수를 넘으면 전체를 메모리에 올리지 않고 스트리밍 집계로 측정
+STREAMING_ROW_THRESHOLD = 10_000_000
+
+# 이전 결과보다 이 비율 이상 느려지면 회귀로 표시 (너무 짧은 단계는 제외)
+REGRESSION_THRESHOLD = 1.2
+REGRESSION_MIN_SECONDS = 0.05
+
+# 이메일 생성 단계의 받는 사람 수
+BENCHMARK_RECIPIENTS = [f"user{i}@example.com" for i in range(10)]
+
+def _max_rss_mb():
+    """프로세스 최대 RSS (MB, 측정할 수 없으면 None)"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, 리눅스는 KB 단위
+    return round(max_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def measure_stage(results, stage, rows, func, *args, **kwargs):
+    """
+    단계 하나를 실행하며 실행 시간, CPU 시간, 메모리 사용량 기록
+
+    Args:
+        results (list): 단계별 결과를 추가할 리스트
+        stage (str): 단계 이름
+        rows (int): 단계가 처리하는 행 수
+        func (function): 실행할 함수
+
+    Returns:
+        func의 반환값
+    """
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    # 파이프라인 함수의 진행 메시지는 측정 결과 출력에 섞이지 않도록 숨김
+    with contextlib.redirect_stdout(io.StringIO()):
+        value = func(*args, **kwargs)
+    record = {
+        'stage': stage,
+        'rows': rows,
+        'wall_seconds': round(time.perf_counter() - wall_started, 4),
+        'cpu_seconds': round(time.process_time() - cpu_started, 4),
+        'peak_traced_mb': round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1) if tracemalloc.is_tracing() else None,
+        'max_rss_mb': _max_rss_mb()
+    }
+    results.append(record)
+    return value
+
+def benchmark_data_path(rows, settings, data_dir=BENCHMARK_DATA_DIR):
+    """설정별 합성 데이터 파일 경로"""
+    key = hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(data_dir, f"sales_{rows}_{key}.csv")
+
+def _build_xlsx(file_path, cube, raw_data, raw_row_count):
+    """simple_sales_report와 같은 구성의 Excel 보고서 작성"""
+    from excel_writer import write_excel_report
+    write_excel_report(file_path, [
+        ('카테고리별분석', cube.category_sales(), True),
+        ('지역별분석', cube.region_sales(), True),
+        ('영업사원별분석', cube.salesperson_sales(), True),
+        ('일별추이', cube.daily_sales(), True),
+        ('베스트셀러제품', cube.product_sales(top_n=10), True)
+    ], raw_data=raw_data, raw_row_count=raw_row_count)
+
+def _build_docx(cube, charts):
+    """보고서 문서를 만들어 .docx 바이트로 저장"""
+    import word_report_generator as word_report
+    buffer = io.BytesIO()
+    word_report.build_report_document(cube, charts).save(buffer)
+    return buffer.getvalue()
+
+def _rollups(cube):
+    """보고서가 사용하는 모든 분석 표 계산"""
+    return [cube.summary(), cube.category_sales(), cube.region_sales(), cube.product_sales(top_n=10),
+            cube.salesperson_sales(), cube.daily_sales()]
+
+def run_benchmark(rows, settings, skip=(), parallel_charts=False, trace_memory=False):
+    """
+    합성 데이터 한 크기에 대해 단계별 측정 (별도 프로세스에서 실행하여 메모리 측정이 섞이지 않게 함)
+
+    Args:
+        rows (int): 합성 데이터 행 수
+        settings (dict): sales_data_generator 생성 설정
+        skip (list): 건너뛸 단계 이름
+        parallel_charts (bool): 차트를 프로세스 풀에서 렌더링할지 여부
+        trace_memory (bool): tracemalloc으로 단계별 최대 할당량 측정 (느려지지만 단계별 메모리 확인 가능)
+
+    Returns:
+        dict: 측정 결과 (rows, settings, generate_seconds, stages)
+    """
+    from chart_renderer import render_charts
+    from smtp_delivery import build_report_messages
+    import word_report_generator as word_report
+
+    data_path = benchmark_data_path(rows, settings)
+    generate_seconds = None
+    if not os.path.exists(data_path):
+        started = time.perf_counter()
+        write_sales_csv(data_path, rows, **settings)
+        generate_seconds = round(time.perf_counter() - started, 2)
+
+    if trace_memory:
+        tracemalloc.start()
+
+    stages = []
+    streaming = rows > STREAMING_ROW_THRESHOLD
+    if streaming:
+        # 전체를 메모리에 올리지 않고 청크 단위로 읽고 정리하며 집계
+        cube = measure_stage(stages, 'load_clean_aggregate', rows, load_and_aggregate_streaming, data_path)
+        raw_data = iter_clean_chunks(data_path)
+    else:
+        df = measure_stage(stages, 'load', rows, read_sales_csv, data_path)
+        raw_data = measure_stage(stages, 'clean', len(df), clean_sales_data, df)
+        cube = measure_stage(stages, 'aggregate', len(raw_data), SalesCube.from_dataframe, raw_data)
+    raw_row_count = cube.row_count
+
+    cube_rows = len(cube.data)
+    measure_stage(stages, 'rollups', cube_rows, _rollups, cube)
+
+    charts = []
+    if 'charts' not in skip:
+        charts = measure_stage(stages, 'charts', cube_rows, render_charts, word_report.build_chart_tasks(cube),
+                               profile=word_report.CHART_PROFILE, parallel=parallel_charts, use_cache=False,
+                               in_memory=True)
+
+    docx_data = None
+    if 'docx' not in skip:
+        docx_data = measure_stage(stages, 'docx', cube_rows, _build_docx, cube, charts)
+
+    if 'xlsx' not in skip:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            measure_stage(stages, 'xlsx', raw_row_count, _build_xlsx, os.path.join(tmp_dir, 'report.xlsx'),
+                          cube, raw_data, raw_row_count)
+
+    if 'email_build' not in skip and docx_data is not None:
+        measure_stage(stages, 'email_build', len(BENCHMARK_RECIPIENTS), build_report_messages,
+                      'bench@example.com', BENCHMARK_RECIPIENTS, '벤치마크 보고서', '벤치마크',
+                      attachment_path='sales_analysis_report.docx', attachment_data=docx_data)
+
+    if trace_memory:
+        tracemalloc.stop()
+
+    return {
+        'rows': rows,
+        'settings': settings,
+        'streaming': streaming,
+        'trace_memory': trace_memory,
+        'generate_seconds': generate_seconds,
+        'stages': stages
+    }
+
+def _git_commit():
+    """현재 커밋 해시 (git이 없거나 저장소가 아니면 None)"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=10)
+        if commit.returncode != 0:
+            return None
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, timeout=30).stdout.strip()
+        return commit.stdout.strip() + ('-dirty' if dirty else '')
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def load_results(results_path=BENCHMARK_RESULTS_PATH):
+    """누적된 측정 결과 리스트 (파일이 없으면 빈 리스트)"""
+    if not os.path.exists(results_path):
+        return []
+    with open(results_path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def append_result(record, results_path=BENCHMARK_RESULTS_PATH):
+    """측정 결과 한 건을 결과 파일에 추가"""
+    os.makedirs(os.path.dirname(results_path) or '.', exist_ok=True)
+    with open(results_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+def find_baseline(record, previous):
+    """같은 행 수, 생성 설정, 메모리 측정 방식의 가장 최근 이전 결과 (다른 커밋 우선)"""
+    # tracemalloc 측정은 실행 시간을 크게 늘리므로 같은 방식끼리만 비교
+    same = [old for old in previous
+            if old['rows'] == record['rows'] and old['settings'] == record['settings']
+            and old.get('trace_memory') == record.get('trace_memory')]
+    other_commits = [old for old in same if old.get('commit') != record.get('commit')]
+    candidates = other_commits or same
+    return candidates[-1] if candidates else None
+
+def print_result(record, baseline=None):
+    """단계별 측정 결과 표 출력 (이전 결과가 있으면 변화율과 회귀 표시)"""
+    print(f"\n📏 {record['rows']:,}행 {'(스트리밍)' if record['streaming'] else ''}")
+    if record['generate_seconds'] is not None:
+        print(f"   🧪 합성 데이터 생성: {record['generate_seconds']:.2f}초")
+    if baseline is not None:
+        print(f"   비교 대상: {baseline.get('commit') or '알 수 없음'} ({baseline['timestamp']})")
+
+    old_stages = {stage['stage']: stage for stage in baseline['stages']} if baseline else {}
+    print(f"   {'단계':<22}{'행 수':>14}{'시간(초)':>11}{'CPU(초)':>10}{'할당(MB)':>10}{'RSS(MB)':>10}  변화")
+    regressions = []
+    for stage in record['stages']:
+        change = ''
+        old = old_stages.get(stage['stage'])
+        if old is not None and old['wall_seconds'] > 0:
+            ratio = stage['wall_seconds'] / old['wall_seconds']
+            change = f"{(ratio - 1) * 100:+.0f}%"
+            if ratio >= REGRESSION_THRESHOLD and stage['wall_seconds'] >= REGRESSION_MIN_SECONDS:
+                change += ' ⚠️'
+                regressions.append(stage['stage'])
+        traced = '-' if stage['peak_traced_mb'] is None else f"{stage['peak_traced_mb']:,.1f}"
+        rss = '-' if stage['max_rss_mb'] is None else f"{stage['max_rss_mb']:,.1f}"
+        print(f"   {stage['stage']:<22}{stage['rows']:>14,}{stage['wall_seconds']:>11.3f}"
+              f"{stage['cpu_seconds']:>10.3f}{traced:>10}{rss:>10}  {change}")
+    return regressions
+
+def _parse_rows(value):
+    """'1e6' 같은 지수 표기도 허용하는 행 수"""
+    return int(float(value))
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='보고서 파이프라인 단계별 벤치마크')
+    parser.add_argument('--rows', type=_parse_rows, nargs='+', default=DEFAULT_BENCHMARK_ROWS,
+                        help='측정할 행 수 (예: 1e3 1e5 1e7)')
+    parser.add_argument('--skip', nargs='*', default=[], choices=['charts', 'docx', 'xlsx', 'email_build'],
+                        help='건너뛸 단계')
+    parser.add_argument('--parallel-charts', action='store_true', help='차트를 프로세스 풀에서 렌더링')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='tracemalloc으로 단계별 최대 할당량 측정 (실행 시간이 크게 늘어남)')
+    parser.add_argument('--output', default=BENCHMARK_RESULTS_PATH, help='결과 누적 파일 경로')
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    settings = generator_settings(args)
+    previous = load_results(args.output)
+    commit = _git_commit()
+    print("🏁 보고서 파이프라인 벤치마크")
+    print(f"   커밋: {commit or '알 수 없음'} / Python {platform.python_version()} / CPU {os.cpu_count()}개")
+    print(f"   생성 설정: {json.dumps(settings, ensure_ascii=False)}")
+
+    regressions = []
+    for rows in sorted(args.rows):
+        try:
+            # 크기마다 새 프로세스에서 측정하여 이전 크기의 메모리 사용량이 섞이지 않게 함
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(run_benchmark, rows, settings, args.skip, args.parallel_charts,
+                                         args.trace_memory).result()
+        except Exception as e:
+            print(f"❌ {rows:,}행 측정 중 오류 발생: {e}")
+            continue
+
+        record = dict(result, timestamp=datetime.now().isoformat(timespec='seconds'), commit=commit,
+                      python=platform.python_version(), platform=platform.platform(), cpu_count=os.cpu_count())
+        regressions += [f"{rows:,}행 {stage}" for stage in print_result(record, find_baseline(record, previous))]
+        append_result(record, args.output)
+
+    print(f"\n💾 결과 저장: {args.output}")
+    if regressions:
+        print(f"⚠️  이전 결과보다 {REGRESSION_THRESHOLD:.1f}배 이상 느려진 단계: {', '.join(regressions)}")
+
+if __name__ == "__main__":
+    main()
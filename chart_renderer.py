@@ -0,0 +1,494 @@
+"""
+보고서 차트 렌더러
+pyplot 전역 상태 대신 Figure 객체 API로 차트를 그리고,
+서로 독립적인 차트들은 프로세스 풀에서 동시에 렌더링합니다.
+각 작업에는 이미 집계된 작은 Series만 전달됩니다.
+집계 데이터와 스타일이 같은 차트는 캐시된 이미지를 그대로 재사용합니다.
+출력 해상도와 형식은 용도별 렌더 프로파일(email/print/vector)로 정하며,
+프로파일의 용량 한도를 넘으면 해상도를 낮춰 다시 렌더링합니다.
+in_memory=True이면 차트를 파일로 저장하지 않고 메모리의 ChartImage로 반환하여 문서에 바로 넣습니다.
+matplotlib, numpy, PIL은 실제로 차트를 그릴 때만 가져오므로 캐시된 차트만 쓰는 실행은 가져오기 비용이 없습니다.
+python-docx도 문서에 차트를 넣을 때만 가져옵니다.
+pipeline_metrics 측정 중에는 작업 프로세스에서 잰 차트별 렌더링 시간도 함께 기록합니다.
+"""
+
+import hashlib
+import io
+import json
+import os
+import math
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from pipeline_metrics import current_metrics, current_rss, stage
+
+# 기본 폰트 설정 (Windows 환경의 한글 폰트)
+DEFAULT_FONT_FAMILY = 'Malgun Gothic'
+
+# 용도별 렌더 프로파일
+# - format: 'png' 또는 'svg' (svg는 Word용 PNG 대체 이미지를 함께 저장)
+# - dpi: 기본 PNG 해상도, min_dpi: 용량 한도를 맞추기 위해 낮출 수 있는 최저 해상도
+# - quantize: PNG를 256색 팔레트로 줄이고 최적화하여 저장
+# - max_total_bytes: 한 번에 렌더링하는 차트 파일 전체의 목표 최대 용량
+RENDER_PROFILES = {
+    'email': {
+        'format': 'png',
+        'dpi': 120,
+        'min_dpi': 72,
+        'quantize': True,
+        'max_total_bytes': 1 * 1024 * 1024
+    },
+    'print': {
+        'format': 'png',
+        'dpi': 300,
+        'min_dpi': 150,
+        'quantize': False,
+        'max_total_bytes': 10 * 1024 * 1024
+    },
+    'vector': {
+        'format': 'svg',
+        'dpi': 150,
+        'min_dpi': 72,
+        'quantize': True,
+        'max_total_bytes': 3 * 1024 * 1024
+    }
+}
+
+# 기본 렌더 프로파일 (기존과 같은 300 DPI PNG)
+DEFAULT_PROFILE = 'print'
+
+# Word 문서의 SVG 이미지 확장 (Office 2016 이상에서 표시, 이전 버전은 PNG 대체 이미지 표시)
+SVG_BLIP_EXTENSION_URI = '{96DAC541-7B7A-43D3-8B79-37D633B846F1}'
+SVG_BLIP_NAMESPACE = 'http://schemas.microsoft.com/office/drawing/2016/SVG/main'
+
+# 렌더링된 차트 캐시 저장 폴더
+CHART_CACHE_DIR = os.path.join('.cache', 'charts')
+
+# 차트 그리기 규칙 버전 (그리기 함수를 바꾸면 올려서 기존 캐시를 무효화)
+CHART_RENDERER_VERSION = 1
+
+# 차트 종류별 기본 스타일 (한글 보고서 기준)
+DEFAULT_STYLES = {
+    'pie': {
+        'figsize': (8, 6),
+        'title': '카테고리별 매출 비율',
+        'title_fontsize': 14,
+        'colormap': 'Set3',
+        'legend_title': '카테고리별 매출액',
+        'legend_format': '{label}\n{value:,.0f}원'
+    },
+    'bar': {
+        'figsize': (10, 6),
+        'title': '',
+        'title_fontsize': 14,
+        'xlabel': '',
+        'ylabel': '매출액 (원)',
+        'label_fontsize': 12,
+        'color': '#66B2FF',
+        'value_format': '{:,.0f}원',
+        'value_fontsize': 10,
+        'value_fontweight': 'normal',
+        'xtick_rotation': 45
+    },
+    'barh': {
+        'figsize': (10, 6),
+        'title': '',
+        'title_fontsize': 14,
+        'xlabel': '매출액 (원)',
+        'ylabel': '',
+        'label_fontsize': 12,
+        'color': '#FFB347',
+        'value_format': '{:,.0f}원',
+        'value_fontsize': 10
+    },
+    'line': {
+        'figsize': (12, 6),
+        'title': '일별 매출 추이',
+        'title_fontsize': 14,
+        'xlabel': '날짜',
+        'ylabel': '매출액 (원)',
+        'label_fontsize': 12,
+        'color': '#2E86AB',
+        'marker': 'o',
+        'linewidth': 2,
+        'markersize': 4,
+        'markerfacecolor': None,
+        'peak_format': '최고: {:,.0f}원',
+        'peak_offset': (10, 10),
+        'peak_box_pad': 0.3,
+        'peak_box_alpha': 0.7,
+        'peak_arrow_rad': 0
+    }
+}
+
+def chart_task(kind, data, path=None, **style):
+    """차트 렌더링 작업 정의 (종류, 집계 Series, 저장 경로(메모리 렌더링이면 None), 기본값을 덮어쓸 스타일)"""
+    merged_style = dict(DEFAULT_STYLES[kind])
+    merged_style.update(style)
+    return {'kind': kind, 'data': data, 'path': path, 'style': merged_style}
+
+def _draw_pie(ax, data, style):
+    """매출 비율 파이차트"""
+    import matplotlib
+    import numpy as np
+    colors = matplotlib.colormaps[style['colormap']](np.linspace(0, 1, len(data)))
+    wedges, texts, autotexts = ax.pie(data.values, labels=data.index, autopct='%1.1f%%',
+                                      colors=colors, startangle=90)
+    ax.set_title(style['title'], fontsize=style['title_fontsize'], fontweight='bold', pad=20)
+
+    # 범례 추가
+    ax.legend(wedges, [style['legend_format'].format(label=label, value=value) for label, value in data.items()],
+              title=style['legend_title'], loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
+
+def _draw_bar(ax, data, style):
+    """세로 막대차트 (막대 위에 값 표시)"""
+    bars = ax.bar(data.index, data.values, color=style['color'])
+    ax.set_title(style['title'], fontsize=style['title_fontsize'], fontweight='bold', pad=20)
+    ax.set_xlabel(style['xlabel'], fontsize=style['label_fontsize'])
+    ax.set_ylabel(style['ylabel'], fontsize=style['label_fontsize'])
+
+    for bar, value in zip(bars, data.values):
+        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(data.values) * 0.01,
+                style['value_format'].format(value), ha='center', va='bottom',
+                fontsize=style['value_fontsize'], fontweight=style['value_fontweight'])
+
+    ax.tick_params(axis='x', rotation=style['xtick_rotation'])
+    ax.grid(axis='y', alpha=0.3)
+
+def _draw_barh(ax, data, style):
+    """가로 막대차트 (막대 끝에 값 표시)"""
+    bars = ax.barh(range(len(data)), data.values, color=style['color'])
+    ax.set_title(style['title'], fontsize=style['title_fontsize'], fontweight='bold', pad=20)
+    ax.set_xlabel(style['xlabel'], fontsize=style['label_fontsize'])
+    ax.set_ylabel(style['ylabel'], fontsize=style['label_fontsize'])
+
+    # y축 레이블 설정
+    ax.set_yticks(range(len(data)))
+    ax.set_yticklabels(data.index)
+
+    for bar, value in zip(bars, data.values):
+        ax.text(bar.get_width() + max(data.values) * 0.01, bar.get_y() + bar.get_height()/2,
+                style['value_format'].format(value), ha='left', va='center', fontsize=style['value_fontsize'])
+
+    ax.grid(axis='x', alpha=0.3)
+
+def _draw_line(ax, data, style):
+    """추이 선 그래프 (최고점 표시)"""
+    ax.plot(data.index, data.values, marker=style['marker'], linewidth=style['linewidth'],
+            markersize=style['markersize'], color=style['color'], markerfacecolor=style['markerfacecolor'])
+    ax.set_title(style['title'], fontsize=style['title_fontsize'], fontweight='bold', pad=20)
+    ax.set_xlabel(style['xlabel'], fontsize=style['label_fontsize'])
+    ax.set_ylabel(style['ylabel'], fontsize=style['label_fontsize'])
+
+    # 최고점 표시
+    max_idx = data.idxmax()
+    ax.annotate(style['peak_format'].format(data[max_idx]),
+                xy=(max_idx, data[max_idx]), xytext=style['peak_offset'],
+                textcoords='offset points', ha='left',
+                bbox=dict(boxstyle=f"round,pad={style['peak_box_pad']}", fc='yellow', alpha=style['peak_box_alpha']),
+                arrowprops=dict(arrowstyle='->', connectionstyle=f"arc3,rad={style['peak_arrow_rad']}"))
+
+    ax.tick_params(axis='x', rotation=45)
+    ax.grid(True, alpha=0.3)
+
+CHART_DRAWERS = {
+    'pie': _draw_pie,
+    'bar': _draw_bar,
+    'barh': _draw_barh,
+    'line': _draw_line
+}
+
+def _init_worker(font_family):
+    """작업 프로세스 초기화 (폰트 설정)"""
+    import matplotlib
+    matplotlib.rcParams['font.family'] = font_family
+    matplotlib.rcParams['axes.unicode_minus'] = False
+
+class ChartImage:
+    """메모리에 렌더링된 차트 (PNG 바이트와 vector 프로파일의 SVG 바이트)"""
+
+    def __init__(self, png, svg=None):
+        self.png = png
+        self.svg = svg
+
+    @property
+    def contents(self):
+        """output_files() 순서와 같은 출력 내용 리스트 (svg는 PNG 대체 이미지 포함)"""
+        return [self.svg, self.png] if self.svg is not None else [self.png]
+
+    @property
+    def size(self):
+        """차트 전체 바이트 수"""
+        return sum(len(content) for content in self.contents)
+
+    @classmethod
+    def from_files(cls, paths):
+        """output_files() 순서의 파일들로 생성"""
+        contents = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                contents.append(f.read())
+        return cls(contents[-1], contents[0] if len(contents) > 1 else None)
+
+    def save(self, paths):
+        """output_files() 순서의 경로에 저장"""
+        for path, content in zip(paths, self.contents):
+            with open(path, 'wb') as f:
+                f.write(content)
+
+def _output_extensions(settings):
+    """출력 형식별 파일 확장자 (첫 번째가 보고서에 넣을 차트)"""
+    return ['.svg', '.png'] if settings['format'] == 'svg' else ['.png']
+
+def output_files(task, settings):
+    """작업이 만드는 파일 경로 리스트 (첫 번째가 보고서에 넣을 차트, svg는 PNG 대체 이미지 포함)"""
+    base = os.path.splitext(task['path'])[0]
+    return [base + extension for extension in _output_extensions(settings)]
+
+def _png_bytes(fig, settings):
+    """PNG 바이트 생성 (quantize 설정 시 256색 팔레트로 줄이고 최적화)"""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=settings['dpi'], bbox_inches='tight')
+    if settings['quantize']:
+        from PIL import Image
+        buffer.seek(0)
+        with Image.open(buffer) as image:
+            palette_image = image.convert('RGB').quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+        buffer = io.BytesIO()
+        palette_image.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+def render_image(task, settings):
+    """차트 하나를 그려 메모리의 ChartImage로 반환"""
+    from matplotlib.figure import Figure
+    style = task['style']
+    fig = Figure(figsize=style['figsize'])
+    ax = fig.add_subplot()
+    CHART_DRAWERS[task['kind']](ax, task['data'], style)
+    fig.tight_layout()
+
+    svg = None
+    if settings['format'] == 'svg':
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='svg', bbox_inches='tight')
+        svg = buffer.getvalue()
+    return ChartImage(_png_bytes(fig, settings), svg)
+
+def render_chart(task, settings):
+    """차트 하나를 그려 파일로 저장하고 보고서에 넣을 파일 경로 반환"""
+    paths = output_files(task, settings)
+    render_image(task, settings).save(paths)
+    return paths[0]
+
+def chart_exists(chart):
+    """보고서에 넣을 수 있는 차트인지 확인 (ChartImage 또는 존재하는 파일 경로)"""
+    if isinstance(chart, ChartImage):
+        return True
+    return chart is not None and os.path.exists(chart)
+
+def chart_cache_key(task, font_family, settings):
+    """집계 데이터(값과 레이블), 차트 종류, 스타일, 폰트, 출력 설정으로 캐시 키 생성"""
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(task['data'], index=True).values.tobytes())
+    settings = {
+        'kind': task['kind'],
+        'style': task['style'],
+        'font_family': font_family,
+        'settings': settings,
+        'version': CHART_RENDERER_VERSION
+    }
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+def _cache_files(settings, cache_base):
+    """출력 파일별 캐시 파일 경로 (output_files()와 같은 순서와 확장자)"""
+    return [cache_base + extension for extension in _output_extensions(settings)]
+
+def _store_in_cache(chart, cache_paths):
+    """렌더링한 차트(파일 경로 리스트 또는 ChartImage)를 캐시에 저장 (캐시 저장 실패는 무시)"""
+    try:
+        os.makedirs(os.path.dirname(cache_paths[0]), exist_ok=True)
+        contents = chart.contents if isinstance(chart, ChartImage) else chart
+        for content, cache_path in zip(contents, cache_paths):
+            # 다른 프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            if isinstance(content, bytes):
+                with open(tmp_path, 'wb') as f:
+                    f.write(content)
+            else:
+                shutil.copyfile(content, tmp_path)
+            os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"⚠️  차트 캐시 저장 실패 (보고서 생성에는 영향 없음): {e}")
+
+def _chart_name(task):
+    """측정 기록용 차트 이름 (저장 경로의 파일 이름, 없으면 차트 종류)"""
+    if task['path']:
+        return os.path.splitext(os.path.basename(task['path']))[0]
+    return task['kind']
+
+def _timed_render(render, task, settings):
+    """차트 하나를 렌더링하고 (결과, 실행 시간, CPU 시간, RSS) 반환 (작업 프로세스에서 실행)"""
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    chart = render(task, settings)
+    return chart, time.perf_counter() - wall_started, time.process_time() - cpu_started, current_rss()
+
+def _render_all(tasks, font_family, settings, max_workers, parallel, in_memory=False):
+    """작업 리스트를 프로세스 풀 또는 현재 프로세스에서 렌더링 (in_memory이면 ChartImage 리스트 반환)"""
+    render = render_image if in_memory else render_chart
+    if max_workers is None:
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+
+    rendered = None
+    if parallel and max_workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(font_family,)) as executor:
+                rendered = list(executor.map(_timed_render, [render] * len(tasks), tasks, [settings] * len(tasks)))
+        except (OSError, NotImplementedError) as e:
+            # 프로세스 생성이 제한된 환경에서는 순차 렌더링으로 대체
+            print(f"⚠️  병렬 렌더링을 사용할 수 없어 순차 렌더링합니다: {e}")
+
+    if rendered is None:
+        _init_worker(font_family)
+        rendered = [_timed_render(render, task, settings) for task in tasks]
+
+    # 작업 프로세스에서 잰 차트별 시간을 측정 결과에 추가
+    metrics = current_metrics()
+    if metrics is not None:
+        for task, (chart, wall, cpu, rss) in zip(tasks, rendered):
+            metrics.add(f"chart:{_chart_name(task)}", wall, cpu, rss, rows=len(task['data']))
+    return [chart for chart, _, _, _ in rendered]
+
+def _render_with_cache(tasks, font_family, settings, max_workers, parallel, use_cache, cache_dir, in_memory=False):
+    """캐시에 있는 차트는 복사(in_memory이면 읽기)하고 나머지만 렌더링"""
+    if not use_cache:
+        return _render_all(tasks, font_family, settings, max_workers, parallel, in_memory)
+
+    # 1. 캐시에 있는 차트는 저장 경로로 복사하거나 메모리로 읽음
+    charts = [None] * len(tasks)
+    pending = []
+    for index, task in enumerate(tasks):
+        cache_paths = _cache_files(settings, os.path.join(cache_dir, chart_cache_key(task, font_family, settings)))
+        if all(os.path.exists(cache_path) for cache_path in cache_paths):
+            if in_memory:
+                charts[index] = ChartImage.from_files(cache_paths)
+            else:
+                for cache_path, path in zip(cache_paths, output_files(task, settings)):
+                    shutil.copyfile(cache_path, path)
+                charts[index] = output_files(task, settings)[0]
+        else:
+            pending.append((index, cache_paths))
+
+    if len(pending) < len(tasks):
+        print(f"⚡ 캐시된 차트 재사용: {len(tasks) - len(pending)}개")
+
+    # 2. 캐시에 없는 차트만 렌더링 후 캐시에 저장
+    if pending:
+        rendered = _render_all([tasks[index] for index, _ in pending], font_family, settings,
+                               max_workers, parallel, in_memory)
+        for (index, cache_paths), chart in zip(pending, rendered):
+            charts[index] = chart
+            _store_in_cache(chart if in_memory else output_files(tasks[index], settings), cache_paths)
+
+    return charts
+
+def render_charts(tasks, font_family=DEFAULT_FONT_FAMILY, profile=DEFAULT_PROFILE, max_workers=None, parallel=True,
+                  use_cache=True, cache_dir=CHART_CACHE_DIR, in_memory=False):
+    """
+    여러 차트를 프로세스 풀에서 동시에 렌더링 (캐시에 있는 차트는 복사만 함)
+
+    Args:
+        tasks (list): chart_task()로 만든 작업 리스트
+        font_family (str): 차트 폰트
+        profile (str): 렌더 프로파일 이름 ('email', 'print', 'vector')
+        max_workers (int): 최대 작업 프로세스 수 (기본값: 렌더링할 작업 수와 CPU 수 중 작은 값)
+        parallel (bool): False이면 현재 프로세스에서 순서대로 렌더링
+        use_cache (bool): 렌더링된 차트 캐시 사용 여부
+        cache_dir (str): 차트 캐시 저장 폴더
+        in_memory (bool): True이면 파일로 저장하지 않고 ChartImage로 반환 (작업의 path는 사용하지 않음)
+
+    Returns:
+        list: 작업 순서대로 정렬된 차트 파일 경로 리스트 (vector 프로파일은 .svg 경로, in_memory이면 ChartImage 리스트)
+    """
+    profile_settings = RENDER_PROFILES[profile]
+    settings = {
+        'format': profile_settings['format'],
+        'dpi': profile_settings['dpi'],
+        'quantize': profile_settings['quantize']
+    }
+
+    with stage('charts', rows=len(tasks)):
+        while True:
+            charts = _render_with_cache(tasks, font_family, settings, max_workers, parallel, use_cache, cache_dir,
+                                        in_memory)
+
+            # 용량 한도 확인 (PNG 용량은 대략 해상도의 제곱에 비례)
+            if in_memory:
+                total_bytes = sum(chart.size for chart in charts)
+            else:
+                total_bytes = sum(os.path.getsize(path) for task in tasks for path in output_files(task, settings))
+            if total_bytes <= profile_settings['max_total_bytes'] or settings['dpi'] <= profile_settings['min_dpi']:
+                break
+
+            scale = math.sqrt(profile_settings['max_total_bytes'] / total_bytes) * 0.95
+            new_dpi = max(profile_settings['min_dpi'], int(settings['dpi'] * scale))
+            print(f"⚠️  차트 용량 {total_bytes / 1024:,.0f}KB가 '{profile}' 한도를 넘어 "
+                  f"해상도를 {settings['dpi']} → {new_dpi} DPI로 낮춥니다.")
+            settings = dict(settings, dpi=new_dpi)
+
+    return charts
+
+def _next_media_partname(package, extension):
+    """문서 패키지에서 사용하지 않은 미디어 파트 이름 생성"""
+    from docx.opc.packuri import PackURI
+    used = {str(part.partname) for part in package.iter_parts()}
+    number = 1
+    while f'/word/media/chart{number}.{extension}' in used:
+        number += 1
+    return PackURI(f'/word/media/chart{number}.{extension}')
+
+def add_chart_picture(doc, chart_file, width, run=None):
+    """
+    문서에 차트 이미지 추가 (SVG는 PNG 대체 이미지와 함께 벡터 이미지로 삽입)
+
+    Args:
+        doc (Document): python-docx 문서
+        chart_file (str 또는 ChartImage): render_charts()가 반환한 차트 파일 경로 또는 메모리 차트
+        width (Length): 이미지 너비 (예: Inches(6))
+        run (Run): 이미지를 넣을 run (기본값: 문서 끝에 새 문단 추가)
+    """
+    add_picture = doc.add_picture if run is None else run.add_picture
+
+    if isinstance(chart_file, ChartImage):
+        png_source = io.BytesIO(chart_file.png)
+        svg_blob = chart_file.svg
+    elif chart_file.endswith('.svg'):
+        png_source = os.path.splitext(chart_file)[0] + '.png'
+        with open(chart_file, 'rb') as f:
+            svg_blob = f.read()
+    else:
+        png_source = chart_file
+        svg_blob = None
+
+    # 1. PNG 그림 추가 (SVG가 있으면 SVG를 지원하지 않는 Word에서 표시할 대체 이미지)
+    picture = add_picture(png_source, width=width)
+    if svg_blob is None:
+        return
+
+    # 2. SVG 파트를 문서에 추가하고 그림의 blip에 svgBlip 확장으로 연결
+    from docx.opc.constants import RELATIONSHIP_TYPE as RT
+    from docx.opc.part import Part
+    from docx.oxml import parse_xml
+    svg_part = Part(_next_media_partname(doc.part.package, 'svg'), 'image/svg+xml', svg_blob, doc.part.package)
+    r_id = doc.part.relate_to(svg_part, RT.IMAGE)
+    blip = picture._inline.graphic.graphicData.pic.blipFill.blip
+    blip.append(parse_xml(
+        f'<a:extLst xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+        f'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<a:ext uri="{SVG_BLIP_EXTENSION_URI}">'
+        f'<asvg:svgBlip xmlns:asvg="{SVG_BLIP_NAMESPACE}" r:embed="{r_id}"/>'
+        f'</a:ext></a:extLst>'
+    ))
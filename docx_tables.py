@@ -0,0 +1,64 @@
+"""
+Word 보고서 표 작성 도구
+python-docx의 table.cell(i, j)는 호출할 때마다 표 XML을 다시 탐색하므로 행이 많으면 느려집니다.
+여기서는 숫자 서식을 컬럼 단위로 한 번에 적용하고, 표의 모든 행 XML을 한 번에 만들어 추가합니다.
+"""
+
+from xml.sax.saxutils import escape
+import pandas as pd
+
+# 기본 표 스타일
+DEFAULT_TABLE_STYLE = 'Table Grid'
+
+def format_numbers(values, decimals=0, prefix='', suffix=''):
+    """숫자 컬럼 전체에 천 단위 구분 서식 적용 (예: 1234.5 → '1,234', 결측값은 'nan')"""
+    number_format = f'{{:,.{decimals}f}}'.format
+    # 빈 입력이면 map 결과가 float64로 남아 문자열과 더할 수 없으므로 str로 고정
+    formatted = pd.Series(values).astype('float64').map(number_format).astype(str)
+    return (prefix + formatted + suffix).tolist()
+
+def format_dates(values, date_format='%Y-%m-%d'):
+    """날짜 컬럼 전체를 문자열로 변환"""
+    return pd.DatetimeIndex(values).strftime(date_format).tolist()
+
+def _cell_xml(text, width):
+    """셀 하나의 XML (cell.text 대입 결과와 같은 구조)"""
+    if text == '':
+        paragraph = '<w:p/>'
+    else:
+        space = ' xml:space="preserve"' if text != text.strip() else ''
+        paragraph = f'<w:p><w:r><w:t{space}>{escape(text)}</w:t></w:r></w:p>'
+    return f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr>{paragraph}</w:tc>'
+
+def add_dataframe_table(doc, frame, style=DEFAULT_TABLE_STYLE):
+    """
+    DataFrame을 Word 표로 추가 (컬럼 이름이 머리글 행)
+
+    Args:
+        doc (Document): python-docx 문서
+        frame (DataFrame): 표에 넣을 값 (서식이 적용된 문자열 권장, 나머지는 str()로 변환)
+        style (str): 표 스타일 이름
+
+    Returns:
+        Table: 추가된 표
+    """
+    from docx.oxml import parse_xml
+    from docx.oxml.ns import nsdecls
+
+    table = doc.add_table(rows=0, cols=len(frame.columns))
+    table.style = style
+
+    # 열 너비는 add_table이 만든 표 그리드 값을 그대로 사용
+    widths = [grid_col.w.twips for grid_col in table._tbl.tblGrid.gridCol_lst]
+
+    # 머리글과 데이터 행의 XML을 한 번에 만든 뒤 한 번만 파싱
+    rows = [[str(column) for column in frame.columns]]
+    rows.extend(frame.astype(str).values.tolist())
+    rows_xml = ''.join(
+        '<w:tr>' + ''.join(_cell_xml(text, width) for text, width in zip(row, widths)) + '</w:tr>'
+        for row in rows
+    )
+    parsed = parse_xml(f'<w:tbl {nsdecls("w")}>{rows_xml}</w:tbl>')
+    table._tbl.extend(list(parsed))
+
+    return table
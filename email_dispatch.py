@@ -0,0 +1,176 @@
+"""
+비동기 이메일 발송기
+백그라운드 스레드에서 asyncio 이벤트 루프를 돌리며, 제출된 메시지를 동시 전송 수 제한(Semaphore) 안에서 보냅니다.
+메인 스레드는 메시지를 제출한 뒤 바로 다음 보고서 작성을 이어가고, 마지막에 finish()로 결과를 모읍니다.
+SMTP 호출 자체는 smtp_delivery의 연결 풀을 스레드에서 사용하며, 재시도 대기는 이벤트 루프에서 처리합니다.
+"""
+
+import asyncio
+import threading
+import time
+from smtp_delivery import (
+    DEFAULT_BACKOFF_SECONDS, DEFAULT_MAX_ATTEMPTS,
+    flatten_message, is_transient_error, new_result, send_once, retry_delay, print_delivery_failures,
+)
+
+class EmailDispatcher:
+    """
+    메시지를 백그라운드에서 동시에 전송하는 발송기
+
+    사용 예:
+        with EmailDispatcher(pool, concurrency=8) as dispatcher:
+            dispatcher.warm_up()          # 연결과 로그인을 미리 시작
+            ...                            # 보고서 작성
+            dispatcher.submit(messages)   # 바로 반환
+            ...                            # 다음 보고서 작성
+            results = dispatcher.finish()  # 전송 완료까지 대기
+    """
+
+    def __init__(self, pool, concurrency=None, max_attempts=DEFAULT_MAX_ATTEMPTS, backoff=DEFAULT_BACKOFF_SECONDS):
+        self.pool = pool
+        self.concurrency = concurrency or pool.size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='email-dispatch', daemon=True)
+        self._semaphore = None
+        self._opened = None
+        self._futures = []
+        self._results = None
+
+    def start(self):
+        """이벤트 루프 스레드 시작"""
+        if not self._thread.is_alive():
+            self._thread.start()
+            self._semaphore = asyncio.run_coroutine_threadsafe(self._create_semaphore(), self._loop).result()
+        return self
+
+    async def _create_semaphore(self):
+        """이벤트 루프 안에서 동시 전송 수 제한 생성"""
+        return asyncio.Semaphore(self.concurrency)
+
+    async def _open_pool(self):
+        """첫 전송 전에 한 번만 연결과 인증 확인"""
+        if self._opened is None:
+            self._opened = asyncio.ensure_future(asyncio.to_thread(self.pool.open))
+        await self._opened
+
+    async def _warm_up(self):
+        """연결 확인만 미리 수행 (오류는 메시지 전송 때 결과에 기록)"""
+        try:
+            await self._open_pool()
+        except Exception:
+            pass
+
+    def warm_up(self):
+        """보고서를 만드는 동안 SMTP 연결과 로그인을 백그라운드에서 미리 수행"""
+        self.start()
+        asyncio.run_coroutine_threadsafe(self._warm_up(), self._loop)
+        return self
+
+    async def _send(self, recipients, msg, queued_at):
+        """메시지 하나를 전송하고 결과(대기 포함 지연 시간, 전송 시간) 반환"""
+        result = new_result(recipients)
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                await self._open_pool()
+            except Exception as e:
+                # 인증 실패 등 영구 오류는 모든 메시지를 실패 처리 (일시적인 오류는 아래 재시도에 맡김)
+                if not is_transient_error(e):
+                    result['error'] = e
+            if result['error'] is None:
+                text = await asyncio.to_thread(flatten_message, msg)
+                for attempt in range(1, self.max_attempts + 1):
+                    result['attempts'] = attempt
+                    try:
+                        result['refused'] = await asyncio.to_thread(send_once, self.pool, recipients, msg, text)
+                        result['success'] = True
+                        result['error'] = None
+                        break
+                    except Exception as e:
+                        result['error'] = e
+                        delay = retry_delay(e, attempt, self.max_attempts, self.backoff, recipients)
+                        if delay is None:
+                            break
+                        await asyncio.sleep(delay)
+
+        finished = time.perf_counter()
+        result['seconds'] = finished - started
+        result['latency'] = finished - queued_at
+        return result
+
+    def submit(self, messages):
+        """
+        메시지 전송 예약 (전송 완료를 기다리지 않고 바로 반환)
+
+        Args:
+            messages (list): (받는 사람 리스트, 메시지) 튜플 리스트
+
+        Returns:
+            int: 지금까지 예약된 메시지 수
+        """
+        self.start()
+        queued_at = time.perf_counter()
+        for recipients, msg in messages:
+            self._futures.append(
+                asyncio.run_coroutine_threadsafe(self._send(recipients, msg, queued_at), self._loop)
+            )
+        return len(self._futures)
+
+    def finish(self, timeout=None):
+        """
+        예약된 모든 메시지의 전송 완료를 기다린 뒤 이벤트 루프 종료
+        (메시지를 예약하지 않았어도 warm_up()을 호출했다면 반드시 호출해야 스레드와 루프가 정리됨)
+
+        Args:
+            timeout (float): 메시지당 최대 대기 시간(초)
+
+        Returns:
+            list: 메시지별 결과 딕셔너리 (recipients, success, attempts, refused, error, seconds, latency)
+        """
+        if self._results is None:
+            self._results = [future.result(timeout) for future in self._futures]
+            if self._thread.is_alive():
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+            self._shutdown_loop()
+        return self._results
+
+    def _shutdown_loop(self):
+        """남은 작업(끝나지 않은 warm-up 등)을 취소하고 연결 스레드가 끝날 때까지 기다린 뒤 루프 닫기"""
+        pending = asyncio.all_tasks(self._loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        # 진행 중인 pool.open()이 끝나 연결이 풀에 반납되어야 프로세스 종료 때 정상적으로 닫힘
+        self._loop.run_until_complete(self._loop.shutdown_default_executor())
+        self._loop.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.finish()
+
+def print_dispatch_report(results):
+    """메시지별 지연 시간과 실패 내역 출력"""
+    if not results:
+        print("📭 전송한 메시지가 없습니다.")
+        return
+
+    succeeded = sum(result['success'] and not result['refused'] for result in results)
+    latencies = sorted(result['latency'] for result in results)
+    print(f"\n📬 이메일 전송 결과: {succeeded}/{len(results)}개 성공")
+    print(f"⏱️  지연 시간: 평균 {sum(latencies) / len(latencies):.2f}초, "
+          f"최소 {latencies[0]:.2f}초, 최대 {latencies[-1]:.2f}초")
+
+    for result in results:
+        status = '✅' if result['success'] and not result['refused'] else '❌'
+        print(f"   {status} {', '.join(result['recipients'])}: "
+              f"지연 {result['latency']:.2f}초 (전송 {result['seconds']:.2f}초, 시도 {result['attempts']}회)")
+
+    if succeeded < len(results):
+        print("❌ 실패 내역:")
+        print_delivery_failures(results)
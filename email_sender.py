@@ -1,19 +1,17 @@
 import os
 import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
 from datetime import datetime
 import getpass
+from smtp_delivery import build_report_messages, send_messages, failed_recipients, print_delivery_failures, DEFAULT_GROUP_SIZE
 
 def send_report_email(docx_file_path, recipient_emails, sender_email=None, sender_password=None, 
-                     smtp_server="smtp.gmail.com", smtp_port=587, custom_subject=None, custom_body=None):
+                     smtp_server="smtp.gmail.com", smtp_port=587, custom_subject=None, custom_body=None,
+                     group_size=DEFAULT_GROUP_SIZE, attachment_data=None):
     """
     워드 보고서를 첨부하여 이메일 전송
     
     Args:
-        docx_file_path (str): 전송할 워드 파일 경로
+        docx_file_path (str): 전송할 워드 파일 경로 (attachment_data를 주면 첨부 파일 이름으로만 사용)
         recipient_emails (list): 받는 사람 이메일 주소 리스트
         sender_email (str): 보내는 사람 이메일 주소
         sender_password (str): 보내는 사람 이메일 비밀번호
@@ -21,6 +19,8 @@ def send_report_email(docx_file_path, recipient_emails, sender_email=None, sende
         smtp_port (int): SMTP 포트 번호
         custom_subject (str): 사용자 정의 제목
         custom_body (str): 사용자 정의 본문
+        group_size (int): 메시지 하나에 넣을 받는 사람 수 (1이면 개인별 메시지, None이면 전체를 한 메시지로)
+        attachment_data (bytes): 메모리에서 만든 워드 보고서 내용 (파일을 읽지 않고 그대로 첨부)
     
     Returns:
         bool: 전송 성공 여부
@@ -30,13 +30,16 @@ def send_report_email(docx_file_path, recipient_emails, sender_email=None, sende
     print("="*50)
     
     try:
-        # 파일 존재 확인
-        if not os.path.exists(docx_file_path):
+        # 파일 존재 확인 (메모리의 보고서를 첨부할 때는 생략)
+        if attachment_data is None and not os.path.exists(docx_file_path):
             print(f"❌ 파일을 찾을 수 없습니다: {docx_file_path}")
             return False
         
         # 파일 크기 확인 (25MB 제한 - Gmail 기준)
-        file_size_mb = os.path.getsize(docx_file_path) / (1024 * 1024)
+        if attachment_data is not None:
+            file_size_mb = len(attachment_data) / (1024 * 1024)
+        else:
+            file_size_mb = os.path.getsize(docx_file_path) / (1024 * 1024)
         print(f"📎 첨부파일: {os.path.basename(docx_file_path)} ({file_size_mb:.2f}MB)")
         
         if file_size_mb > 25:
@@ -55,16 +58,11 @@ def send_report_email(docx_file_path, recipient_emails, sender_email=None, sende
         print(f"📧 받는 사람: {', '.join(recipient_emails)}")
         print(f"📡 SMTP 서버: {smtp_server}:{smtp_port}")
         
-        # 이메일 메시지 생성
-        msg = MIMEMultipart()
-        msg['From'] = sender_email
-        msg['To'] = ", ".join(recipient_emails)
-        
         # 제목 설정
         if custom_subject:
-            msg['Subject'] = custom_subject
+            subject = custom_subject
         else:
-            msg['Subject'] = f"판매 데이터 분석 보고서 - {datetime.now().strftime('%Y년 %m월 %d일')}"
+            subject = f"판매 데이터 분석 보고서 - {datetime.now().strftime('%Y년 %m월 %d일')}"
         
         # 본문 설정
         if custom_body:
@@ -97,41 +95,25 @@ def send_report_email(docx_file_path, recipient_emails, sender_email=None, sende
 🕒 생성 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
         
-        # 본문을 이메일에 추가
-        msg.attach(MIMEText(body, 'plain', 'utf-8'))
-        
-        # 워드 파일 첨부
+        # 워드 파일 첨부 (받는 사람별 메시지가 인코딩된 첨부 파일을 공유)
         print("📎 파일 첨부 중...")
-        with open(docx_file_path, "rb") as attachment:
-            part = MIMEBase('application', 'vnd.openxmlformats-officedocument.wordprocessingml.document')
-            part.set_payload(attachment.read())
-        
-        # 파일을 base64로 인코딩
-        encoders.encode_base64(part)
-        
-        # 헤더 추가
         filename = os.path.basename(docx_file_path)
-        part.add_header(
-            'Content-Disposition',
-            f'attachment; filename= {filename}',
-        )
-        
-        # 이메일에 파일 첨부
-        msg.attach(part)
+        messages = build_report_messages(sender_email, recipient_emails, subject, body,
+                                         attachment_path=docx_file_path, group_size=group_size,
+                                         attachment_data=attachment_data)
         print(f"✅ 파일 '{filename}' 첨부 완료")
         
-        # SMTP 서버 연결 및 이메일 전송
-        print("📡 SMTP 서버 연결 중...")
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.starttls()  # TLS 보안 연결 시작
-        print("🔐 로그인 중...")
-        server.login(sender_email, sender_password)
+        # 재사용 연결 풀로 SMTP 서버 연결, 로그인 및 이메일 전송
+        print("📡 SMTP 서버 연결 및 로그인 중...")
+        print(f"📤 이메일 전송 중... (메시지 {len(messages)}개)")
+        results = send_messages(messages, smtp_server, smtp_port, sender_email, sender_password)
         
-        # 이메일 전송
-        print("📤 이메일 전송 중...")
-        text = msg.as_string()
-        server.sendmail(sender_email, recipient_emails, text)
-        server.quit()
+        failed = failed_recipients(results)
+        if failed:
+            print(f"\n❌ 일부 받는 사람에게 전송하지 못했습니다 ({len(failed)}명):")
+            print_delivery_failures(results)
+            print("💡 이메일 주소를 다시 확인하거나 잠시 후 다시 시도해주세요.")
+            return False
         
         print("\n" + "="*50)
         print("🎉 이메일이 성공적으로 전송되었습니다!")
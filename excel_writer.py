@@ -0,0 +1,144 @@
+"""
+스트리밍 Excel 보고서 작성 도구
+openpyxl의 write-only 모드로 행을 하나씩 기록하여 통합 문서 전체를 메모리에 올리지 않습니다.
+원본 데이터는 DataFrame 또는 정리된 청크 반복자(iter_clean_chunks)로 받을 수 있으며,
+행 수가 기준을 넘으면 Excel 시트 대신 별도의 CSV/Parquet 파일로 저장합니다.
+"""
+
+import os
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+# pyarrow가 설치된 경우에만 Parquet 별도 파일 사용
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# 원본 데이터 시트 이름
+RAW_DATA_SHEET = '원본데이터'
+
+# 원본 데이터를 Excel 시트에 넣을 최대 행 수 (넘으면 별도 파일로 저장, Excel 한계는 1,048,576행)
+RAW_DATA_ROW_LIMIT = 500_000
+
+# 원본 데이터 별도 파일 형식 ('csv' 또는 'parquet')
+RAW_DATA_SIDECAR_FORMAT = 'csv'
+
+# 머리글 셀 서식 (pandas to_excel과 같은 서식)
+_THIN = Side(style='thin')
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='top')
+
+def _header_cell(ws, value):
+    """머리글 서식이 적용된 write-only 셀"""
+    cell = WriteOnlyCell(ws, value=value)
+    cell.font = HEADER_FONT
+    cell.border = HEADER_BORDER
+    cell.alignment = HEADER_ALIGNMENT
+    return cell
+
+def _iter_rows(frame):
+    """DataFrame 행을 Excel에 쓸 수 있는 값의 튜플로 반환 (결측값은 빈 셀)"""
+    values = frame.astype(object).where(frame.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+def _write_frame(ws, frame, index=True):
+    """DataFrame 하나를 시트에 기록 (index=True이면 인덱스를 머리글 서식으로 앞 열에 기록)"""
+    if not index:
+        ws.append([_header_cell(ws, column) for column in frame.columns])
+        for row in _iter_rows(frame):
+            ws.append(row)
+        return
+
+    index_names = [name if name is not None else '' for name in frame.index.names]
+    ws.append([_header_cell(ws, name) for name in index_names] +
+              [_header_cell(ws, column) for column in frame.columns])
+
+    index_values = frame.index.to_frame(index=False)
+    for labels, row in zip(_iter_rows(index_values), _iter_rows(frame)):
+        ws.append([_header_cell(ws, label) for label in labels] + list(row))
+
+def _iter_chunks(raw_data):
+    """원본 데이터를 청크 반복자로 통일"""
+    if isinstance(raw_data, pd.DataFrame):
+        yield raw_data
+    else:
+        yield from raw_data
+
+def _write_sidecar(raw_data, sidecar_path, sidecar_format):
+    """원본 데이터를 청크 단위로 별도 파일에 기록"""
+    if sidecar_format == 'parquet':
+        writer = None
+        try:
+            for chunk in _iter_chunks(raw_data):
+                # 청크마다 category 값 목록이 다르므로 문자열로 통일하여 스키마 고정
+                categories = chunk.select_dtypes('category').columns
+                chunk = chunk.astype({column: 'string' for column in categories})
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(sidecar_path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+        finally:
+            if writer is not None:
+                writer.close()
+        return
+
+    header = True
+    for chunk in _iter_chunks(raw_data):
+        chunk.to_csv(sidecar_path, mode='w' if header else 'a', header=header, index=False, encoding='utf-8-sig')
+        header = False
+
+def write_excel_report(file_path, sheets, raw_data=None, raw_row_count=None,
+                       row_limit=RAW_DATA_ROW_LIMIT, sidecar_format=RAW_DATA_SIDECAR_FORMAT):
+    """
+    Excel 보고서를 행 단위 스트리밍으로 작성
+
+    Args:
+        file_path (str): 저장할 .xlsx 파일 경로
+        sheets (list): (시트 이름, DataFrame, 인덱스 포함 여부) 튜플 리스트
+        raw_data (DataFrame 또는 iterable): 원본 데이터 (정리된 청크 반복자 가능, None이면 시트 생략)
+        raw_row_count (int): 원본 데이터 행 수 (청크 반복자를 넘길 때 필수)
+        row_limit (int): 원본 데이터를 시트에 넣을 최대 행 수
+        sidecar_format (str): 기준을 넘을 때 사용할 별도 파일 형식 ('csv' 또는 'parquet')
+
+    Returns:
+        str: 원본 데이터 별도 파일 경로 (시트에 넣었으면 None)
+    """
+    wb = Workbook(write_only=True)
+    sidecar_path = None
+
+    # 1. 원본 데이터 (시트 또는 별도 파일)
+    if raw_data is not None:
+        if raw_row_count is None:
+            raw_row_count = len(raw_data)
+
+        ws = wb.create_sheet(RAW_DATA_SHEET)
+        if raw_row_count <= row_limit:
+            header_written = False
+            for chunk in _iter_chunks(raw_data):
+                if not header_written:
+                    ws.append([_header_cell(ws, column) for column in chunk.columns])
+                    header_written = True
+                for row in _iter_rows(chunk):
+                    ws.append(row)
+        else:
+            if sidecar_format == 'parquet' and pq is None:
+                print("⚠️  pyarrow가 없어 원본 데이터를 CSV로 저장합니다.")
+                sidecar_format = 'csv'
+            extension = 'parquet' if sidecar_format == 'parquet' else 'csv'
+            sidecar_path = f"{os.path.splitext(file_path)[0]}_{RAW_DATA_SHEET}.{extension}"
+            _write_sidecar(raw_data, sidecar_path, sidecar_format)
+            ws.append([f"원본 데이터가 {raw_row_count:,}행으로 많아 별도 파일로 저장했습니다: {os.path.basename(sidecar_path)}"])
+            print(f"📎 원본 데이터 {raw_row_count:,}행을 별도 파일로 저장: {sidecar_path}")
+
+    # 2. 요약 및 분석 시트
+    for sheet_name, frame, index in sheets:
+        _write_frame(wb.create_sheet(sheet_name), frame, index=index)
+
+    wb.save(file_path)
+    return sidecar_path
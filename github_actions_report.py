@@ -8,124 +8,49 @@ from datetime import datetime
 from docx import Document
 from docx.shared import Inches, Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-import matplotlib.pyplot as plt
-import matplotlib
-import seaborn as sns
-import numpy as np
 import os
+import sys
+from sales_data_loader import load_incremental_cube
+from sales_cube import SalesCube
+from sales_index import load_report_data, parse_report_filters, describe_filters, print_no_matching_rows
+from chart_renderer import chart_task, render_charts, add_chart_picture, chart_exists
+from docx_tables import add_dataframe_table, format_numbers
+from pipeline_metrics import start_metrics, finish_metrics, stage, instrumented
 import warnings
 warnings.filterwarnings('ignore')
 
-# GitHub Actions 환경에서 GUI 없이 차트 생성
-matplotlib.use('Agg')
+# Ubuntu 환경에서 사용 가능한 차트 폰트
+CHART_FONT_FAMILY = 'DejaVu Sans'
 
-# Ubuntu 환경에서 사용 가능한 폰트 설정
-plt.rcParams['font.family'] = 'DejaVu Sans'
-plt.rcParams['axes.unicode_minus'] = False
+# 차트 렌더 프로파일 (보고서가 아티팩트와 이메일로 전달되므로 용량을 줄인 'email' 사용)
+CHART_PROFILE = 'email'
 
-def load_and_clean_data(file_path):
-    """데이터 로드 및 전처리"""
-    print("=== 데이터 로드 중 ===")
-    
-    try:
-        df = pd.read_csv(file_path)
-        print(f"✅ 데이터 로드 완료: {len(df)}개")
-        
-        # 데이터 정리
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        df['ProductName'] = df['ProductName'].str.title()
-        df['Category'] = df['Category'].str.title()
-        df['Salesperson'] = df['Salesperson'].str.title()
-        
-        # 결측값 및 오류 데이터 제거
-        df = df.dropna(subset=['Date', 'ProductID', 'Quantity', 'UnitPrice'])
-        df = df[df['ProductID'] != 'P0000']
-        df = df[df['Quantity'] > 0]
-        df = df[df['UnitPrice'] > 0]
-        
-        # TotalPrice 재계산
-        df['TotalPrice'] = df['Quantity'] * df['UnitPrice']
-        
-        print(f"✅ 데이터 전처리 완료: {len(df)}개")
-        return df
-        
-    except Exception as e:
-        print(f"❌ 데이터 로드 실패: {e}")
-        return None
-
-def create_charts(df):
-    """GitHub Actions 환경용 차트 생성"""
+def create_charts(cube, in_memory=False):
+    """GitHub Actions 환경용 차트 생성 (영문 레이블, 차트별로 병렬 렌더링, in_memory이면 ChartImage 리스트 반환)"""
     print("📊 차트 생성 중...")
-    chart_files = []
     
     try:
-        # 1. 카테고리별 매출 파이차트
-        category_sales = df.groupby('Category')['TotalPrice'].sum().sort_values(ascending=False)
-        
-        plt.figure(figsize=(10, 8))
-        colors = plt.cm.Set3(np.linspace(0, 1, len(category_sales)))
-        wedges, texts, autotexts = plt.pie(category_sales.values, labels=category_sales.index, 
-                                          autopct='%1.1f%%', colors=colors, startangle=90)
-        plt.title('Category Sales Distribution', fontsize=16, fontweight='bold', pad=20)
-        
-        # 영어로 범례 생성 (한글 폰트 이슈 방지)
-        plt.legend(wedges, [f'{cat}: {val:,.0f}' for cat, val in category_sales.items()], 
-                  title="Sales by Category", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
-        
-        plt.tight_layout()
-        chart1_path = 'chart_category_pie.png'
-        plt.savefig(chart1_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        chart_files.append(chart1_path)
-        
-        # 2. 지역별 매출 막대차트
-        region_sales = df.groupby('Region')['TotalPrice'].sum().sort_values(ascending=False)
-        
-        plt.figure(figsize=(12, 8))
-        bars = plt.bar(region_sales.index, region_sales.values, 
-                      color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FCEA2B'])
-        plt.title('Sales by Region', fontsize=16, fontweight='bold', pad=20)
-        plt.xlabel('Region', fontsize=14)
-        plt.ylabel('Sales Amount', fontsize=14)
-        
-        # 값 표시
-        for bar, value in zip(bars, region_sales.values):
-            plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(region_sales.values) * 0.01, 
-                    f'{value:,.0f}', ha='center', va='bottom', fontsize=12, fontweight='bold')
-        
-        plt.xticks(rotation=45)
-        plt.grid(axis='y', alpha=0.3)
-        plt.tight_layout()
-        chart2_path = 'chart_region_bar.png'
-        plt.savefig(chart2_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        chart_files.append(chart2_path)
-        
-        # 3. 일별 매출 추이
-        daily_sales = df.groupby('Date')['TotalPrice'].sum().sort_index()
-        
-        plt.figure(figsize=(14, 8))
-        plt.plot(daily_sales.index, daily_sales.values, marker='o', linewidth=3, markersize=6, 
-                color='#2E86AB', markerfacecolor='#F24236')
-        plt.title('Daily Sales Trend', fontsize=16, fontweight='bold', pad=20)
-        plt.xlabel('Date', fontsize=14)
-        plt.ylabel('Sales Amount', fontsize=14)
-        
-        # 최고점 표시
-        max_idx = daily_sales.idxmax()
-        plt.annotate(f'Peak: {daily_sales[max_idx]:,.0f}', 
-                    xy=(max_idx, daily_sales[max_idx]), xytext=(20, 20),
-                    textcoords='offset points', ha='left',
-                    bbox=dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.8),
-                    arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0.2'))
+        tasks = [
+            # 1. 카테고리별 매출 파이차트 (영어로 범례 생성 - 한글 폰트 이슈 방지)
+            chart_task('pie', cube.sales_by('Category'), 'chart_category_pie.png',
+                       figsize=(10, 8), title='Category Sales Distribution', title_fontsize=16,
+                       legend_title='Sales by Category', legend_format='{label}: {value:,.0f}'),
+            # 2. 지역별 매출 막대차트
+            chart_task('bar', cube.sales_by('Region'), 'chart_region_bar.png',
+                       figsize=(12, 8), title='Sales by Region', title_fontsize=16,
+                       xlabel='Region', ylabel='Sales Amount', label_fontsize=14,
+                       color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FCEA2B'],
+                       value_format='{:,.0f}', value_fontsize=12, value_fontweight='bold'),
+            # 3. 일별 매출 추이
+            chart_task('line', cube.daily_totals(), 'chart_daily_trend.png',
+                       figsize=(14, 8), title='Daily Sales Trend', title_fontsize=16,
+                       xlabel='Date', ylabel='Sales Amount', label_fontsize=14,
+                       linewidth=3, markersize=6, markerfacecolor='#F24236',
+                       peak_format='Peak: {:,.0f}', peak_offset=(20, 20),
+                       peak_box_pad=0.5, peak_box_alpha=0.8, peak_arrow_rad=0.2)
+        ]
         
-        plt.xticks(rotation=45)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        chart3_path = 'chart_daily_trend.png'
-        plt.savefig(chart3_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        chart_files.append(chart3_path)
+        chart_files = render_charts(tasks, font_family=CHART_FONT_FAMILY, profile=CHART_PROFILE, in_memory=in_memory)
         
         print(f"✅ {len(chart_files)}개 차트 생성 완료")
         return chart_files
@@ -134,8 +59,9 @@ def create_charts(df):
         print(f"❌ 차트 생성 실패: {e}")
         return []
 
-def generate_word_report(df, chart_files):
-    """워드 보고서 생성 (GitHub Actions용)"""
+@instrumented('document')
+def generate_word_report(cube, chart_files, scope=None):
+    """워드 보고서 생성 (GitHub Actions용, scope는 보고서 대상 설명)"""
     print("📄 워드 보고서 생성 중...")
     
     try:
@@ -148,22 +74,19 @@ def generate_word_report(df, chart_files):
         # 생성 정보
         doc.add_paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}")
         doc.add_paragraph(f"Generated by: GitHub Actions")
+        if scope:
+            doc.add_paragraph(f"Scope: {scope}")
         doc.add_paragraph("")
         
         # 요약 통계
         doc.add_heading('📊 Summary Statistics', level=1)
         
-        summary_table = doc.add_table(rows=6, cols=2)
-        summary_table.style = 'Table Grid'
-        
-        summary_table.cell(0, 0).text = 'Metric'
-        summary_table.cell(0, 1).text = 'Value'
-        
-        total_sales = df['TotalPrice'].sum()
-        total_quantity = df['Quantity'].sum()
-        avg_order_value = df['TotalPrice'].mean()
-        unique_products = df['ProductID'].nunique()
-        date_range = f"{df['Date'].min().strftime('%Y-%m-%d')} ~ {df['Date'].max().strftime('%Y-%m-%d')}"
+        summary = cube.summary()
+        total_sales = summary['total_sales']
+        total_quantity = summary['total_quantity']
+        avg_order_value = summary['avg_order_value']
+        unique_products = summary['unique_products']
+        date_range = f"{summary['min_date'].strftime('%Y-%m-%d')} ~ {summary['max_date'].strftime('%Y-%m-%d')}"
         
         summary_data = [
             ['Analysis Period', date_range],
@@ -173,57 +96,45 @@ def generate_word_report(df, chart_files):
             ['Product Types', f"{unique_products} products"]
         ]
         
-        for i, (metric, value) in enumerate(summary_data, 1):
-            summary_table.cell(i, 0).text = metric
-            summary_table.cell(i, 1).text = value
+        add_dataframe_table(doc, pd.DataFrame(summary_data, columns=['Metric', 'Value']))
         
         doc.add_paragraph("")
         
         # 카테고리별 분석
         doc.add_heading('📊 Category Analysis', level=1)
         
-        category_sales = df.groupby('Category').agg({
-            'TotalPrice': 'sum',
-            'Quantity': 'sum',
-            'ProductID': 'nunique'
-        }).round(2)
+        category_sales = cube.category_sales()
         category_sales.columns = ['Total Sales', 'Total Quantity', 'Product Count']
         category_sales = category_sales.sort_values('Total Sales', ascending=False)
         
-        cat_table = doc.add_table(rows=len(category_sales)+1, cols=4)
-        cat_table.style = 'Table Grid'
-        
-        headers = ['Category', 'Total Sales ($)', 'Total Quantity', 'Product Count']
-        for i, header in enumerate(headers):
-            cat_table.cell(0, i).text = header
-        
-        for i, (category, row) in enumerate(category_sales.iterrows(), 1):
-            cat_table.cell(i, 0).text = str(category)
-            cat_table.cell(i, 1).text = f"{row['Total Sales']:,.0f}"
-            cat_table.cell(i, 2).text = f"{row['Total Quantity']:,.0f}"
-            cat_table.cell(i, 3).text = str(row['Product Count'])
+        add_dataframe_table(doc, pd.DataFrame({
+            'Category': category_sales.index,
+            'Total Sales ($)': format_numbers(category_sales['Total Sales']),
+            'Total Quantity': format_numbers(category_sales['Total Quantity']),
+            'Product Count': category_sales['Product Count'].astype('float64')
+        }))
         
         # 차트 삽입
-        if len(chart_files) > 0 and os.path.exists(chart_files[0]):
+        if len(chart_files) > 0 and chart_exists(chart_files[0]):
             doc.add_paragraph("")
             doc.add_paragraph("📊 Category Sales Distribution Chart", style='Heading 2')
-            doc.add_picture(chart_files[0], width=Inches(6))
+            add_chart_picture(doc, chart_files[0], Inches(6))
         
         # 지역별 분석
         doc.add_paragraph("")
         doc.add_heading('🌍 Regional Analysis', level=1)
         
-        region_sales = df.groupby('Region')['TotalPrice'].sum().sort_values(ascending=False)
+        region_sales = cube.sales_by('Region')
         
-        if len(chart_files) > 1 and os.path.exists(chart_files[1]):
+        if len(chart_files) > 1 and chart_exists(chart_files[1]):
             doc.add_paragraph("📊 Regional Sales Comparison", style='Heading 2')
-            doc.add_picture(chart_files[1], width=Inches(6))
+            add_chart_picture(doc, chart_files[1], Inches(6))
         
         # 일별 추이
         doc.add_paragraph("")
         doc.add_heading('📈 Daily Sales Trend', level=1)
         
-        daily_sales_data = df.groupby('Date')['TotalPrice'].sum()
+        daily_sales_data = cube.daily_totals()
         max_sales_day = daily_sales_data.idxmax()
         min_sales_day = daily_sales_data.idxmin()
         avg_daily_sales = daily_sales_data.mean()
@@ -233,10 +144,10 @@ def generate_word_report(df, chart_files):
         daily_stats.add_run(f"• Lowest Sales Day: {min_sales_day.strftime('%Y-%m-%d')} - ${daily_sales_data[min_sales_day]:,.0f}\n")
         daily_stats.add_run(f"• Average Daily Sales: ${avg_daily_sales:,.0f}")
         
-        if len(chart_files) > 2 and os.path.exists(chart_files[2]):
+        if len(chart_files) > 2 and chart_exists(chart_files[2]):
             doc.add_paragraph("")
             doc.add_paragraph("📊 Daily Sales Trend Chart", style='Heading 2')
-            doc.add_picture(chart_files[2], width=Inches(7))
+            add_chart_picture(doc, chart_files[2], Inches(7))
         
         # 결론
         doc.add_paragraph("")
@@ -253,7 +164,8 @@ def generate_word_report(df, chart_files):
         
         # 파일 저장
         report_filename = f'sales_analysis_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.docx'
-        doc.save(report_filename)
+        with stage('save'):
+            doc.save(report_filename)
         
         print(f"✅ 보고서 저장 완료: {report_filename}")
         return report_filename
@@ -262,23 +174,38 @@ def generate_word_report(df, chart_files):
         print(f"❌ 보고서 생성 실패: {e}")
         return None
 
-def main():
-    """GitHub Actions용 메인 함수"""
+def main(incremental=False, in_memory=False, filters=None):
+    """GitHub Actions용 메인 함수 (in_memory이면 차트 PNG 파일을 남기지 않고 보고서에 바로 삽입, filters는 보고서 대상 조건)"""
     print("🚀 GitHub Actions - Sales Report Generation")
     print("="*50)
     
+    # 단계별 실행 시간, CPU 시간, 최대 RSS, 행 수 측정 (워크플로우가 결과를 아티팩트와 요약에 게시)
+    metrics = start_metrics('github_actions_report')
+    
     try:
-        # 데이터 로드
-        df = load_and_clean_data('cicd_data.csv')
-        if df is None:
+        if incremental:
+            # 증분 모드: 저장된 누적 큐브에 마지막 처리 날짜 이후의 행만 추가
+            cube = load_incremental_cube('cicd_data.csv')
+            # 누적 큐브는 날짜 차원을 포함하므로 조건은 큐브에서 바로 적용
+            if cube is not None and filters:
+                cube = cube.filter(**filters)
+        else:
+            # 데이터 로드 후 집계 큐브 생성 (조건이 있으면 색인으로 해당 행만 선택)
+            df = load_report_data('cicd_data.csv', filters)
+            cube = SalesCube.from_dataframe(df) if df is not None else None
+        
+        if cube is None:
             print("❌ 데이터 로드 실패")
             exit(1)
+        if cube.empty:
+            print_no_matching_rows(filters)
+            exit(1)
         
         # 차트 생성
-        chart_files = create_charts(df)
+        chart_files = create_charts(cube, in_memory=in_memory)
         
         # 보고서 생성
-        report_file = generate_word_report(df, chart_files)
+        report_file = generate_word_report(cube, chart_files, scope=describe_filters(filters))
         
         if report_file:
             print(f"\n✅ 보고서 생성 성공!")
@@ -296,6 +223,16 @@ def main():
     except Exception as e:
         print(f"❌ 실행 중 오류: {e}")
         exit(1)
+    finally:
+        # 단계별 측정 결과 출력 및 저장 (실패한 실행도 워크플로우가 always()로 게시하므로 항상 저장)
+        finish_metrics()
+        print("\n" + metrics.format_table())
+        json_path, table_path = metrics.write()
+        print(f"\n📈 단계별 측정 결과 저장: {json_path}, {table_path}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # --incremental 옵션: 이전 실행 이후 추가된 날짜의 데이터만 집계
+    # --in-memory 옵션: 차트 PNG 파일을 저장하지 않음 (보고서 .docx만 생성)
+    # --start/--end/--region/--category/--salesperson 옵션: 보고서 대상 조건
+    main(incremental='--incremental' in sys.argv, in_memory='--in-memory' in sys.argv,
+         filters=parse_report_filters(sys.argv[1:]))
\ No newline at end of file
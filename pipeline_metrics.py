@@ -0,0 +1,283 @@
+"""
+파이프라인 단계별 측정 도구
+보고서 파이프라인의 각 단계(로드, 정리, 집계, 차트, 문서 작성, 저장, 이메일)마다
+실행 시간, CPU 시간(작업 프로세스 포함), 최대 RSS, 처리 행 수를 기록하고 JSON과 요약 표로 내보냅니다.
+
+측정을 시작하지 않은 상태에서는 stage()와 instrumented()가 아무 일도 하지 않으므로
+공용 모듈(sales_data_loader, sales_cube, chart_renderer)에 넣어 두어도 다른 스크립트에 영향이 없습니다.
+
+사용 예:
+    metrics = start_metrics('automated_sales_report')
+    with stage('load') as info:
+        df = read_sales_csv(path)
+        info['rows'] = len(df)
+    finish_metrics()
+    metrics.write('pipeline_metrics')   # pipeline_metrics.json, pipeline_metrics.md
+"""
+
+import functools
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# 리눅스/macOS에서만 프로세스 최대 RSS 측정 (현재 RSS를 읽을 수 없는 환경의 대체값)
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# 측정 결과 기본 파일 이름 (확장자 제외, .json과 .md로 저장)
+METRICS_OUTPUT_BASE = 'pipeline_metrics'
+
+# 단계 진행 중 RSS를 확인하는 간격(초)
+RSS_SAMPLE_SECONDS = 0.01
+
+_STATM_PATH = '/proc/self/statm'
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+def current_rss():
+    """현재 프로세스 RSS (바이트, /proc이 없으면 최대 RSS, 측정할 수 없으면 None)"""
+    try:
+        with open(_STATM_PATH, 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, 리눅스는 KB 단위
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+def _cpu_seconds():
+    """현재 프로세스와 종료된 자식 프로세스(차트 작업 프로세스 등)의 CPU 시간 합계"""
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+def _to_mb(value):
+    return None if value is None else round(value / (1024 * 1024), 1)
+
+class PipelineMetrics:
+    """
+    단계별 측정 결과 모음
+
+    단계는 중첩할 수 있으며(예: charts 안의 chart:category_pie), 중첩된 단계는 parent와 depth로 구분합니다.
+    단계가 진행되는 동안 백그라운드 스레드가 RSS를 주기적으로 확인하여 단계별 최대 RSS를 기록합니다.
+    """
+
+    def __init__(self, pipeline, sample_seconds=RSS_SAMPLE_SECONDS):
+        self.pipeline = pipeline
+        self.sample_seconds = sample_seconds
+        self.stages = []
+        self.started_at = datetime.now()
+        self._wall_started = time.perf_counter()
+        self._cpu_started = _cpu_seconds()
+        self._total_wall = None
+        self._total_cpu = None
+        self._peak_rss = current_rss()
+        self._active = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def _start_sampler(self):
+        """RSS 확인 스레드 시작 (첫 단계에서 한 번)"""
+        if self._sampler is None and self.sample_seconds:
+            self._sampler = threading.Thread(target=self._sample, name='metrics-rss', daemon=True)
+            self._sampler.start()
+
+    def _sample(self):
+        """진행 중인 단계들의 최대 RSS 갱신"""
+        while not self._stop.wait(self.sample_seconds):
+            self._update_peaks(current_rss())
+
+    def _update_peaks(self, rss):
+        if rss is None:
+            return
+        with self._lock:
+            self._peak_rss = max(self._peak_rss or 0, rss)
+            for record in self._active:
+                record['_peak_rss'] = max(record['_peak_rss'] or 0, rss)
+
+    def _stack(self):
+        """현재 스레드의 진행 중인 단계 스택"""
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """
+        단계 하나 측정 (with 블록 안에서 info['rows']로 처리 행 수 지정 가능)
+
+        Args:
+            name (str): 단계 이름
+            rows (int): 처리 행 수 (모르면 None)
+        """
+        stack = self._stack()
+        info = {'rows': rows}
+        record = {
+            'stage': name,
+            'parent': stack[-1]['stage'] if stack else None,
+            'depth': len(stack),
+            '_peak_rss': current_rss()
+        }
+        with self._lock:
+            # 부모 단계가 자식보다 먼저 나오도록 시작할 때 추가
+            self.stages.append(record)
+            self._active.append(record)
+        stack.append(record)
+        self._start_sampler()
+
+        wall_started = time.perf_counter()
+        cpu_started = _cpu_seconds()
+        try:
+            yield info
+        finally:
+            wall = time.perf_counter() - wall_started
+            cpu = _cpu_seconds() - cpu_started
+            self._update_peaks(current_rss())
+            stack.pop()
+            with self._lock:
+                self._active.remove(record)
+            record.update({
+                'rows': info.get('rows'),
+                'wall_seconds': round(wall, 4),
+                'cpu_seconds': round(cpu, 4),
+                'peak_rss_mb': _to_mb(record.pop('_peak_rss'))
+            })
+
+    def add(self, name, wall_seconds, cpu_seconds=None, peak_rss=None, rows=None):
+        """다른 프로세스에서 측정한 단계 추가 (예: 차트 작업 프로세스의 렌더링 시간)"""
+        stack = self._stack()
+        with self._lock:
+            self.stages.append({
+                'stage': name,
+                'parent': stack[-1]['stage'] if stack else None,
+                'depth': len(stack),
+                'rows': rows,
+                'wall_seconds': round(wall_seconds, 4),
+                'cpu_seconds': None if cpu_seconds is None else round(cpu_seconds, 4),
+                'peak_rss_mb': _to_mb(peak_rss)
+            })
+
+    def finish(self):
+        """측정 종료 (전체 시간 확정, RSS 확인 스레드 정지)"""
+        if self._total_wall is None:
+            self._total_wall = time.perf_counter() - self._wall_started
+            self._total_cpu = _cpu_seconds() - self._cpu_started
+            self._update_peaks(current_rss())
+            self._stop.set()
+            if self._sampler is not None:
+                self._sampler.join()
+        return self
+
+    @property
+    def total_seconds(self):
+        """전체 실행 시간 (종료 전이면 현재까지)"""
+        return self._total_wall if self._total_wall is not None else time.perf_counter() - self._wall_started
+
+    def to_dict(self):
+        """JSON으로 저장할 측정 결과"""
+        completed = [stage for stage in self.stages if 'wall_seconds' in stage]
+        return {
+            'pipeline': self.pipeline,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'total_wall_seconds': round(self.total_seconds, 4),
+            'total_cpu_seconds': None if self._total_cpu is None else round(self._total_cpu, 4),
+            'peak_rss_mb': _to_mb(self._peak_rss),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'stages': completed
+        }
+
+    def format_table(self):
+        """단계별 요약 표 (Markdown, 콘솔과 GitHub Actions 요약에 그대로 사용)"""
+        total = self.total_seconds
+        lines = [
+            f"### ⏱️ {self.pipeline} 단계별 측정 (전체 {total:.2f}초, 최대 RSS {_to_mb(self._peak_rss) or '-'}MB)",
+            '',
+            '| 단계 | 행 수 | 시간(초) | 비율 | CPU(초) | 최대 RSS(MB) |',
+            '|------|------:|--------:|-----:|--------:|-------------:|'
+        ]
+        for stage in self.to_dict()['stages']:
+            name = ('&nbsp;&nbsp;' * stage['depth'] + '↳ ' if stage['depth'] else '') + stage['stage']
+            rows = '-' if stage['rows'] is None else f"{stage['rows']:,}"
+            share = f"{stage['wall_seconds'] / total * 100:.1f}%" if total else '-'
+            cpu = '-' if stage['cpu_seconds'] is None else f"{stage['cpu_seconds']:.3f}"
+            rss = '-' if stage['peak_rss_mb'] is None else f"{stage['peak_rss_mb']:,.1f}"
+            lines.append(f"| {name} | {rows} | {stage['wall_seconds']:.3f} | {share} | {cpu} | {rss} |")
+        return '\n'.join(lines)
+
+    def write(self, output_base=METRICS_OUTPUT_BASE):
+        """
+        측정 결과를 JSON과 Markdown 요약 표로 저장
+
+        Args:
+            output_base (str): 확장자를 뺀 저장 경로
+
+        Returns:
+            tuple: (JSON 경로, Markdown 경로)
+        """
+        json_path = f"{output_base}.json"
+        table_path = f"{output_base}.md"
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        with open(table_path, 'w', encoding='utf-8') as f:
+            f.write(self.format_table() + '\n')
+        return json_path, table_path
+
+# 현재 진행 중인 측정 (start_metrics로 시작하기 전에는 None)
+_current = None
+
+def start_metrics(pipeline, sample_seconds=RSS_SAMPLE_SECONDS):
+    """프로세스 전체 측정 시작 (이후 stage()와 instrumented() 호출이 이 측정에 기록됨)"""
+    global _current
+    _current = PipelineMetrics(pipeline, sample_seconds)
+    return _current
+
+def finish_metrics():
+    """현재 측정을 종료하고 반환 (측정 중이 아니면 None)"""
+    global _current
+    metrics, _current = _current, None
+    return metrics.finish() if metrics is not None else None
+
+def current_metrics():
+    """현재 진행 중인 측정 (없으면 None)"""
+    return _current
+
+@contextmanager
+def stage(name, rows=None):
+    """현재 측정에 단계 하나 기록 (측정 중이 아니면 아무 일도 하지 않음)"""
+    if _current is None:
+        yield {'rows': rows}
+        return
+    with _current.stage(name, rows) as info:
+        yield info
+
+def instrumented(name, rows=None):
+    """
+    함수 호출을 단계로 기록하는 데코레이터
+
+    Args:
+        name (str): 단계 이름
+        rows (function): 반환값으로 처리 행 수를 계산하는 함수 (예: len)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current is None:
+                return func(*args, **kwargs)
+            with _current.stage(name) as info:
+                value = func(*args, **kwargs)
+                if rows is not None and value is not None:
+                    info['rows'] = rows(value)
+                return value
+        return wrapper
+    return decorator
@@ -0,0 +1,188 @@
+"""
+판매 보고서 통합 실행 도구
+하위 명령마다 필요한 모듈만 가져오므로 텍스트 요약(analyze)은 matplotlib, python-docx, openpyxl, smtplib 없이 시작합니다.
+word와 email도 python-docx는 문서를 만들 때, smtplib과 이메일 모듈은 전송할 때 가져오므로 시작 비용은 excel과 같습니다.
+하위 명령별 시작 시간 예산을 두고, 모듈을 가져오는 데 걸린 시간이 예산을 넘으면 경고합니다.
+
+사용 예:
+    python report_cli.py analyze            # 콘솔 요약만 출력
+    python report_cli.py excel [--stream]   # Excel 보고서 (simple_sales_report.py)
+    python report_cli.py word               # Word 보고서 (word_report_generator.py, 이메일 질문 없음)
+    python report_cli.py email [--in-memory] # 보고서 생성 후 이메일 전송 (automated_sales_report.py)
+    python report_cli.py --backend sql word  # 분석을 내장 SQL 데이터베이스(DuckDB 또는 SQLite)에서 실행
+    python report_cli.py --store sales_store word  # CSV 대신 월/지역별 분할 저장소(sales_store.py)에서 읽기
+    python report_cli.py --start 2025-09-15 --end 2025-09-21 --region North word  # 기간/차원 조건 (색인 조회)
+"""
+
+import time
+
+# 시작 시간은 다른 모듈을 가져오기 전부터 측정
+_STARTED = time.perf_counter()
+
+import argparse
+import importlib
+import sys
+
+# 보고서에 사용할 데이터 파일
+DATA_FILE = 'cicd_data.csv'
+
+# 하위 명령별 시작 시간 예산(초) - 명령 모듈을 가져오기까지의 시간
+STARTUP_BUDGETS = {
+    'analyze': 0.8,
+    'excel': 1.0,
+    'word': 1.0,
+    'email': 1.0
+}
+
+# 분석 백엔드 (sales_sql.ANALYTICS_BACKENDS와 같음, 시작 시간을 위해 모듈을 미리 가져오지 않음)
+ANALYTICS_BACKENDS = ['pandas', 'sql', 'duckdb', 'sqlite']
+
+# 시작 시간에 크게 영향을 주는 라이브러리 (불러왔는지 보고용)
+HEAVY_MODULES = ['pandas', 'pyarrow', 'openpyxl', 'matplotlib', 'numpy', 'PIL', 'docx', 'smtplib', 'duckdb']
+
+def _loaded_heavy_modules():
+    """지금까지 불러온 무거운 라이브러리 이름 리스트"""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+def _import_command(module_name, command, budget=None):
+    """명령 모듈을 가져오고 시작 시간을 예산과 비교하여 출력"""
+    module = importlib.import_module(module_name)
+    elapsed = time.perf_counter() - _STARTED
+    if budget is None:
+        budget = STARTUP_BUDGETS[command]
+    status = '✅' if elapsed <= budget else '⚠️ '
+    print(f"{status} 시작 시간: {elapsed:.2f}초 (예산 {budget:.2f}초) - "
+          f"불러온 라이브러리: {', '.join(_loaded_heavy_modules()) or '없음'}")
+    if elapsed > budget:
+        print(f"⚠️  '{command}' 명령의 시작 시간 예산을 {elapsed - budget:.2f}초 초과했습니다.")
+    return module
+
+def _open_cube(args, filters, streaming=False):
+    """명령줄 옵션(--store, --backend, 조건)에 맞는 데이터 원본과 분석 백엔드로 큐브 열기"""
+    from sales_cube import SalesCube
+    if args.store:
+        from sales_store import read_sales_store
+        from sales_index import select_rows
+        if args.backend != 'pandas':
+            print("⚠️  저장소 데이터는 pandas 백엔드로 분석합니다.")
+        # 기간과 지역은 파티션 단위로 걸러 읽고, 나머지 조건은 읽은 데이터에 적용
+        df = read_sales_store(args.store, filters.get('start'), filters.get('end'), filters.get('Region'))
+        return SalesCube.from_dataframe(select_rows(df, filters)) if df is not None else None
+
+    if args.backend != 'pandas':
+        from sales_sql import open_sales_cube
+        cube = open_sales_cube(DATA_FILE, args.backend)
+        return cube.filter(**filters) if cube is not None and filters else cube
+
+    if streaming:
+        # 스트리밍은 조건이 있어도 청크마다 적용하여 전체 데이터를 메모리에 올리지 않음
+        from functools import partial
+        from sales_data_loader import load_and_aggregate_streaming
+        from sales_index import select_rows
+        row_filter = partial(select_rows, filters=filters) if filters else None
+        return load_and_aggregate_streaming(DATA_FILE, row_filter=row_filter)
+
+    if filters:
+        from sales_index import load_report_data
+        df = load_report_data(DATA_FILE, filters)
+        return SalesCube.from_dataframe(df) if df is not None else None
+
+    from sales_sql import open_sales_cube
+    return open_sales_cube(DATA_FILE, 'pandas')
+
+def _has_rows(cube, filters):
+    """큐브를 열었고 행이 있는지 확인 (로드 실패와 조건에 맞는 행 없음을 구분해 출력)"""
+    if cube is None:
+        print("❌ 데이터 로드에 실패했습니다.")
+        return False
+    if cube.empty:
+        from sales_index import print_no_matching_rows
+        print_no_matching_rows(filters)
+        return False
+    return True
+
+def _filters(args):
+    """명령줄의 조건 옵션을 조건 딕셔너리로 변환"""
+    from sales_index import filters_from_args
+    return filters_from_args(args)
+
+def run_analyze(args):
+    """콘솔 요약만 출력 (Excel/Word 파일 생성 없음)"""
+    report = _import_command('simple_sales_report', 'analyze', args.budget)
+    filters = _filters(args)
+    cube = _open_cube(args, filters, streaming=args.stream)
+
+    if not _has_rows(cube, filters):
+        return False
+
+    report.generate_summary_statistics(cube)
+    report.analyze_by_category(cube)
+    report.analyze_by_product(cube)
+    report.analyze_by_region(cube)
+    report.analyze_by_salesperson(cube)
+    report.analyze_daily_trends(cube)
+    return True
+
+def run_excel(args):
+    """Excel 보고서 생성 (simple_sales_report.main)"""
+    report = _import_command('simple_sales_report', 'excel', args.budget)
+    report.main(streaming=args.stream, backend=args.backend, store_dir=args.store, filters=_filters(args))
+    return True
+
+def run_word(args):
+    """Word 보고서 생성 (이메일 전송 질문 없이 파일만 저장)"""
+    report = _import_command('word_report_generator', 'word', args.budget)
+    filters = _filters(args)
+    cube = _open_cube(args, filters)
+    if not _has_rows(cube, filters):
+        return False
+    from sales_index import describe_filters
+    return report.generate_word_report(cube, scope=describe_filters(filters))
+
+def run_email(args):
+    """보고서 생성 후 이메일 전송 (automated_sales_report.main)"""
+    report = _import_command('automated_sales_report', 'email', args.budget)
+    report.main(in_memory=args.in_memory, filters=_filters(args))
+    return True
+
+def build_parser():
+    """명령줄 인자 파서 생성"""
+    parser = argparse.ArgumentParser(description='판매 데이터 분석 및 보고서 생성')
+    parser.add_argument('--budget', type=float, default=None,
+                        help='시작 시간 예산(초, 기본값: 하위 명령별 STARTUP_BUDGETS)')
+    parser.add_argument('--backend', choices=ANALYTICS_BACKENDS, default='pandas',
+                        help="분석 백엔드 (pandas: 메모리 집계, sql: DuckDB가 있으면 DuckDB 아니면 SQLite)")
+    parser.add_argument('--store', default=None,
+                        help='CSV 대신 읽을 월/지역별 분할 저장소 폴더 (sales_store.py append로 생성)')
+    # 보고서 대상 조건 (sales_index.add_filter_arguments와 같은 옵션, 시작 시간을 위해 여기서 정의)
+    parser.add_argument('--start', help='시작 날짜 (YYYY-MM-DD, 포함)')
+    parser.add_argument('--end', help='종료 날짜 (YYYY-MM-DD, 포함)')
+    parser.add_argument('--region', action='append', help='지역 (여러 번 지정 가능)')
+    parser.add_argument('--category', action='append', help='카테고리 (여러 번 지정 가능)')
+    parser.add_argument('--salesperson', action='append', help='영업사원 (여러 번 지정 가능)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    analyze = commands.add_parser('analyze', help='콘솔 요약만 출력')
+    analyze.add_argument('--stream', action='store_true', help='대용량 CSV를 청크 단위로 처리')
+    analyze.set_defaults(handler=run_analyze)
+
+    excel = commands.add_parser('excel', help='Excel 보고서 생성')
+    excel.add_argument('--stream', action='store_true', help='대용량 CSV를 청크 단위로 처리')
+    excel.set_defaults(handler=run_excel)
+
+    word = commands.add_parser('word', help='Word 보고서 생성')
+    word.set_defaults(handler=run_word)
+
+    email = commands.add_parser('email', help='보고서 생성 후 이메일 전송')
+    email.add_argument('--in-memory', action='store_true', help='차트와 보고서를 파일로 남기지 않고 바로 전송')
+    email.set_defaults(handler=run_email)
+
+    return parser
+
+def main(argv=None):
+    """메인 함수"""
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,251 @@
+"""
+개인별 보고서 분배 (fan-out)
+전체 데이터로 집계 큐브와 보고서 골격을 한 번만 만들고, 받는 사람마다 담당 지역/영업사원 조건으로 큐브를 잘라
+개인별 Word 보고서를 프로세스 풀에서 동시에 만듭니다.
+같은 조건의 받는 사람들은 보고서 하나를 함께 받으며, 완성된 보고서는 바로 이메일 발송기에 넘겨 나머지 보고서와 동시에 전송합니다.
+"""
+
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from sales_data_loader import load_and_clean_data
+from sales_cube import SalesCube
+from report_template import get_template_path
+from smtp_delivery import build_report_messages, get_pool, DEFAULT_GROUP_SIZE
+from email_dispatch import EmailDispatcher, print_dispatch_report
+import word_report_generator as word_report
+
+# 개인별 보고서와 차트 저장 폴더
+FANOUT_OUTPUT_DIR = 'personalized_reports'
+
+# 받는 사람별 보고서 조건 (email 외의 키는 큐브 차원 이름, 값이 리스트이면 여러 값 포함)
+FANOUT_RECIPIENTS = [
+    {'email': 'north.manager@company.com', 'Region': 'North'},
+    {'email': 'south.manager@company.com', 'Region': 'South'},
+    {'email': 'east.manager@company.com', 'Region': 'East'},
+    {'email': 'west.manager@company.com', 'Region': 'West'},
+    {'email': 'john.doe@company.com', 'Salesperson': 'John Doe'},
+    {'email': 'jane.smith@company.com', 'Salesperson': 'Jane Smith'},
+    {'email': 'sue.kim@company.com', 'Salesperson': 'Sue Kim'}
+]
+
+# 보고서에 표시할 차원 이름
+DIMENSION_LABELS = {
+    'Region': '지역',
+    'Salesperson': '영업사원',
+    'Category': '카테고리',
+    'ProductName': '제품'
+}
+
+def _recipient_conditions(recipient):
+    """받는 사람 설정에서 큐브 조건만 추출"""
+    return {dimension: value for dimension, value in recipient.items() if dimension != 'email'}
+
+def _scope_label(conditions):
+    """보고서 대상 설명 (예: '지역: North')"""
+    parts = []
+    for dimension, value in conditions.items():
+        text = ', '.join(map(str, value)) if isinstance(value, (list, tuple, set)) else str(value)
+        parts.append(f"{DIMENSION_LABELS.get(dimension, dimension)}: {text}")
+    return ' / '.join(parts) if parts else '전체'
+
+def _scope_slug(conditions):
+    """파일 이름용 대상 이름 (예: 'Region-North')"""
+    parts = []
+    for dimension, value in sorted(conditions.items()):
+        text = '+'.join(map(str, value)) if isinstance(value, (list, tuple, set)) else str(value)
+        parts.append(f"{dimension}-{text}")
+    return re.sub(r'[^\w+-]+', '_', '_'.join(parts)) or 'all'
+
+def plan_fanout(cube, recipients):
+    """
+    같은 조건의 받는 사람을 묶고 조건별 큐브 조각 생성
+
+    Args:
+        cube (SalesCube): 전체 판매 집계 큐브
+        recipients (list): 받는 사람별 설정 (email과 큐브 조건)
+
+    Returns:
+        list: 보고서 작업 딕셔너리 리스트 (conditions, recipients, scope, slug, data)
+    """
+    groups = {}
+    for recipient in recipients:
+        conditions = _recipient_conditions(recipient)
+        key = _scope_slug(conditions)
+        group = groups.setdefault(key, {'conditions': conditions, 'recipients': []})
+        group['recipients'].append(recipient['email'])
+
+    jobs = []
+    for slug, group in groups.items():
+        # 큐브는 차원 조합별 합계이므로 조건으로 자르는 비용은 원본 행 수와 무관
+        sliced = cube.filter(**group['conditions'])
+        scope = _scope_label(group['conditions'])
+        if sliced.empty:
+            print(f"⚠️  '{scope}' 조건에 해당하는 데이터가 없어 건너뜁니다: {', '.join(group['recipients'])}")
+            continue
+        jobs.append({
+            'conditions': group['conditions'],
+            'recipients': group['recipients'],
+            'scope': scope,
+            'slug': slug,
+            'data': sliced.data
+        })
+    return jobs
+
+def render_personalized_report(job, template_path, output_dir=FANOUT_OUTPUT_DIR):
+    """큐브 조각 하나로 Word 보고서를 만들어 저장 (작업 프로세스에서 실행, 차트는 메모리에서만 렌더링)"""
+    cube = SalesCube(job['data'])
+    # 작업 프로세스 안에서는 차트를 순서대로 렌더링 (보고서 단위로 이미 병렬 처리 중)
+    report_data = word_report.render_word_report(cube, template_path, scope=job['scope'], parallel=False)
+    report_path = os.path.join(output_dir, f"sales_report_{job['slug']}.docx")
+    with open(report_path, 'wb') as f:
+        f.write(report_data)
+    return report_path
+
+def generate_personalized_reports(cube, recipients, output_dir=FANOUT_OUTPUT_DIR, max_workers=None,
+                                  parallel=True, on_report=None):
+    """
+    받는 사람별 개인 보고서를 프로세스 풀에서 동시에 생성
+
+    Args:
+        cube (SalesCube): 전체 판매 집계 큐브 (한 번만 계산)
+        recipients (list): 받는 사람별 설정 (email과 큐브 조건)
+        output_dir (str): 보고서 저장 폴더
+        max_workers (int): 최대 작업 프로세스 수 (기본값: 보고서 수와 CPU 수 중 작은 값)
+        parallel (bool): False이면 현재 프로세스에서 순서대로 생성
+        on_report (function): 보고서가 하나 완성될 때마다 (작업, 파일 경로)로 호출 (예: 이메일 제출)
+
+    Returns:
+        list: 완성된 (작업, 파일 경로) 튜플 리스트 (완성 순서)
+    """
+    print("="*50)
+    print("📤 개인별 보고서 생성 중...")
+    print("="*50)
+
+    jobs = plan_fanout(cube, recipients)
+    if not jobs:
+        print("❌ 생성할 보고서가 없습니다.")
+        return []
+
+    os.makedirs(output_dir, exist_ok=True)
+    # 보고서 골격은 작업 프로세스마다 만들지 않도록 미리 한 번 준비
+    template_path = get_template_path('sales_analysis_report', word_report.build_report_skeleton)
+    print(f"📋 받는 사람 {len(recipients)}명 → 보고서 {len(jobs)}개")
+
+    completed = []
+
+    def finish(job, report_path):
+        completed.append((job, report_path))
+        print(f"✅ [{len(completed)}/{len(jobs)}] {job['scope']}: {report_path}")
+        if on_report is not None:
+            on_report(job, report_path)
+
+    if max_workers is None:
+        max_workers = min(len(jobs), os.cpu_count() or 1)
+
+    if parallel and max_workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(render_personalized_report, job, template_path, output_dir): job
+                    for job in jobs
+                }
+                for future in as_completed(futures):
+                    job = futures[future]
+                    try:
+                        finish(job, future.result())
+                    except Exception as e:
+                        print(f"❌ '{job['scope']}' 보고서 생성 중 오류 발생: {e}")
+            return completed
+        except (OSError, NotImplementedError) as e:
+            # 프로세스 생성이 제한된 환경에서는 순차 생성으로 대체
+            print(f"⚠️  병렬 생성을 사용할 수 없어 순차 생성합니다: {e}")
+            done = {id(job) for job, _ in completed}
+            jobs = [job for job in jobs if id(job) not in done]
+
+    for job in jobs:
+        try:
+            finish(job, render_personalized_report(job, template_path, output_dir))
+        except Exception as e:
+            print(f"❌ '{job['scope']}' 보고서 생성 중 오류 발생: {e}")
+    return completed
+
+def build_personalized_messages(job, report_path, sender_email, group_size=DEFAULT_GROUP_SIZE):
+    """개인별 보고서 이메일 메시지 생성"""
+    subject = f"판매 데이터 분석 보고서 ({job['scope']}) - {datetime.now().strftime('%Y년 %m월 %d일')}"
+    body = f"""
+안녕하세요,
+
+첨부된 파일은 {datetime.now().strftime('%Y년 %m월 %d일')}에 생성된 {job['scope']} 판매 데이터 분석 보고서입니다.
+담당 범위의 매출 요약, 카테고리/제품별 분석, 일별 매출 추이가 포함되어 있습니다.
+
+감사합니다.
+
+---
+⚡ 자동화 시스템으로 생성된 개인별 보고서
+🕒 생성 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+"""
+    return build_report_messages(sender_email, job['recipients'], subject, body,
+                                 attachment_path=report_path, group_size=group_size)
+
+def send_personalized_reports(cube, recipients, email_config, output_dir=FANOUT_OUTPUT_DIR, max_workers=None):
+    """
+    개인별 보고서를 생성하면서 완성되는 대로 이메일 전송
+
+    Args:
+        cube (SalesCube): 전체 판매 집계 큐브
+        recipients (list): 받는 사람별 설정 (email과 큐브 조건)
+        email_config (dict): 이메일 설정 (automated_sales_report.EMAIL_CONFIG 형식)
+        output_dir (str): 보고서 저장 폴더
+        max_workers (int): 최대 작업 프로세스 수
+
+    Returns:
+        bool: 모든 보고서 생성과 전송 성공 여부
+    """
+    pool = get_pool(email_config['smtp_server'], email_config['smtp_port'],
+                    email_config['sender_email'], email_config['sender_password'])
+    dispatcher = EmailDispatcher(pool, concurrency=email_config.get('concurrency')).warm_up()
+
+    def submit(job, report_path):
+        dispatcher.submit(build_personalized_messages(
+            job, report_path, email_config['sender_email'],
+            group_size=email_config.get('group_size', DEFAULT_GROUP_SIZE)
+        ))
+
+    completed = generate_personalized_reports(cube, recipients, output_dir, max_workers, on_report=submit)
+    results = dispatcher.finish()
+    print_dispatch_report(results)
+
+    # 조건에 맞는 데이터가 없거나 생성에 실패해 보고서를 받지 못한 사람이 있으면 실패
+    covered = {email for job, _ in completed for email in job['recipients']}
+    all_covered = all(recipient['email'] in covered for recipient in recipients)
+    return all_covered and all(result['success'] and not result['refused'] for result in results)
+
+def main():
+    """메인 함수 (--send를 주면 automated_sales_report.EMAIL_CONFIG로 이메일 전송)"""
+    print("🚀 개인별 판매 보고서 생성을 시작합니다...\n")
+
+    try:
+        df = load_and_clean_data('cicd_data.csv')
+        if df is None:
+            print("❌ 데이터 로드에 실패했습니다.")
+            return
+
+        # 집계 큐브는 한 번만 만들고 받는 사람별로 잘라서 사용
+        cube = SalesCube.from_dataframe(df)
+
+        if '--send' in sys.argv[1:]:
+            from automated_sales_report import EMAIL_CONFIG
+            success = send_personalized_reports(cube, FANOUT_RECIPIENTS, EMAIL_CONFIG)
+            print(f"\n📧 개인별 보고서 전송: {'성공' if success else '일부 실패'}")
+        else:
+            completed = generate_personalized_reports(cube, FANOUT_RECIPIENTS)
+            print(f"\n📁 개인별 보고서 {len(completed)}개가 '{FANOUT_OUTPUT_DIR}' 폴더에 저장되었습니다.")
+
+    except Exception as e:
+        print(f"❌ 개인별 보고서 생성 중 오류가 발생했습니다: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+상주형 보고서 서버
+pandas, matplotlib, python-docx 가져오기와 차트 폰트 탐색을 서버 시작 때 한 번만 하고,
+정리된 데이터와 집계 큐브를 메모리에 유지하여 요청마다 보고서 계산 비용만 들도록 합니다.
+
+사용 예:
+    python report_server.py                      # http://127.0.0.1:8765 에서 대기
+    python report_server.py --host 0.0.0.0 --port 9000
+    curl -o report.docx http://127.0.0.1:8765/report
+    curl -o north.docx "http://127.0.0.1:8765/report?Region=North"
+    curl -o sept.docx "http://127.0.0.1:8765/report?start=2025-09-01&end=2025-09-30"
+    curl "http://127.0.0.1:8765/report?save=1"   # sales_analysis_report.docx로 저장 (word_report_generator.main과 같은 파일)
+    curl http://127.0.0.1:8765/health
+    curl -X POST http://127.0.0.1:8765/reload    # 데이터 캐시 비우기
+"""
+
+import time
+
+# 서버 시작 시간 측정은 무거운 라이브러리를 가져오기 전부터 시작
+_IMPORT_STARTED = time.perf_counter()
+
+import argparse
+import json
+import os
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import pandas as pd
+import matplotlib
+from matplotlib import font_manager
+from sales_data_loader import load_and_clean_data
+from sales_cube import SalesCube
+from sales_index import describe_filters, normalize_filters
+from chart_renderer import DEFAULT_FONT_FAMILY, _init_worker
+from report_template import get_template_path
+from report_fanout import DIMENSION_LABELS
+import word_report_generator as word_report
+
+# 서버 주소 (외부에 노출하지 않도록 기본값은 로컬 전용)
+REPORT_SERVER_HOST = '127.0.0.1'
+REPORT_SERVER_PORT = 8765
+
+# 보고서에 사용할 데이터 파일
+REPORT_DATA_FILE = 'cicd_data.csv'
+
+# ?save=1 요청 시 저장할 파일 이름 (word_report_generator.main과 같은 파일)
+REPORT_SAVE_PATH = 'sales_analysis_report.docx'
+
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+# 날짜 범위 조건 (차원이 아니므로 DIMENSION_LABELS와 따로 처리)
+DATE_BOUNDS = ('start', 'end')
+
+def _file_signature(file_path):
+    """데이터 파일 변경 확인용 (수정 시각, 크기)"""
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+class ReportService:
+    """
+    가져온 라이브러리, 폰트, 정리된 데이터를 유지하며 보고서를 만드는 서비스
+
+    데이터 파일이 바뀌면 다음 요청에서 자동으로 다시 읽습니다.
+    """
+
+    def __init__(self, data_file=REPORT_DATA_FILE, font_family=DEFAULT_FONT_FAMILY):
+        self.data_file = data_file
+        self.font_family = font_family
+        self.started_at = time.time()
+        self.reports_served = 0
+        self._cube = None
+        self._signature = None
+        self._template_path = None
+        # 데이터 다시 읽기와 렌더링(matplotlib 전역 설정 사용)은 한 번에 하나씩
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        """폰트 탐색, 보고서 골격, 데이터 로드를 미리 수행"""
+        _init_worker(self.font_family)
+        # 폰트 탐색 결과는 matplotlib 내부에 캐시되므로 이후 차트 렌더링에서는 다시 찾지 않음
+        font_path = font_manager.findfont(font_manager.FontProperties(family=matplotlib.rcParams['font.family']))
+        print(f"🔤 차트 폰트: {os.path.basename(font_path)}")
+        with self._lock:
+            self._template_path = get_template_path('sales_analysis_report', word_report.build_report_skeleton)
+            self._load_cube()
+        return self
+
+    def _load_cube(self):
+        """데이터 파일이 바뀌었거나 아직 읽지 않았으면 다시 읽어 큐브 생성 (잠금 안에서 호출)"""
+        signature = _file_signature(self.data_file)
+        if self._cube is not None and signature == self._signature:
+            return self._cube
+
+        df = load_and_clean_data(self.data_file)
+        if df is None:
+            raise RuntimeError(f"데이터를 읽을 수 없습니다: {self.data_file}")
+        self._cube = SalesCube.from_dataframe(df)
+        self._signature = signature
+        print(f"📦 데이터 캐시 갱신: {self.data_file} ({self._cube.row_count}건)")
+        return self._cube
+
+    def reload(self):
+        """캐시된 데이터를 비워 다음 요청에서 다시 읽도록 함"""
+        with self._lock:
+            self._cube = None
+            self._signature = None
+
+    def render(self, conditions=None):
+        """
+        보고서를 만들어 .docx 바이트로 반환
+
+        Args:
+            conditions (dict): 큐브 조건 (예: {'Region': ['North'], 'start': Timestamp}, 값이 리스트이면 여러 값 포함)
+
+        Returns:
+            tuple: (.docx 바이트, 보고서 대상 설명 또는 None)
+        """
+        with self._lock:
+            cube = self._load_cube()
+            scope = None
+            if conditions:
+                cube = cube.filter(**conditions)
+                period = {bound: conditions[bound] for bound in DATE_BOUNDS if bound in conditions}
+                parts = [describe_filters(period)] if period else []
+                parts += [f"{DIMENSION_LABELS.get(dimension, dimension)}: {', '.join(values)}"
+                          for dimension, values in conditions.items() if dimension not in period]
+                scope = ' / '.join(parts)
+                if cube.empty:
+                    raise LookupError(f"'{scope}' 조건에 해당하는 데이터가 없습니다.")
+            # 서버 프로세스는 이미 준비되어 있으므로 작업 프로세스를 새로 띄우지 않고 순서대로 렌더링
+            data = word_report.render_word_report(cube, self._template_path, scope=scope, parallel=False)
+            self.reports_served += 1
+        return data, scope
+
+    def status(self):
+        """서버 상태 딕셔너리"""
+        return {
+            'data_file': self.data_file,
+            'loaded': self._cube is not None,
+            'rows': self._cube.row_count if self._cube is not None else 0,
+            'reports_served': self.reports_served,
+            'uptime_seconds': round(time.time() - self.started_at, 1)
+        }
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    """보고서 서버 요청 처리 (GET /report, GET /health, POST /reload)"""
+
+    service = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/health':
+            self._send_json(200, self.service.status())
+        elif url.path == '/report':
+            self._handle_report(parse_qs(url.query))
+        else:
+            self._send_json(404, {'error': f'알 수 없는 경로: {url.path}'})
+
+    def do_POST(self):
+        if urlsplit(self.path).path == '/reload':
+            self.service.reload()
+            self._send_json(200, {'reloaded': True})
+        else:
+            self._send_json(404, {'error': f'알 수 없는 경로: {self.path}'})
+
+    def _handle_report(self, query):
+        """보고서 생성 요청 (큐브 차원 이름과 start/end 쿼리 값으로 범위 지정, save=1이면 파일로 저장)"""
+        save = query.pop('save', ['0'])[0] in ('1', 'true', 'yes')
+        # 날짜 범위는 명령줄 --start/--end와 같이 Timestamp로 해석
+        conditions = {}
+        try:
+            for bound in DATE_BOUNDS:
+                if bound in query:
+                    conditions[bound] = pd.Timestamp(query.pop(bound)[0])
+        except ValueError as e:
+            self._send_json(400, {'error': f"날짜 형식 오류: {e}"})
+            return
+        unknown = [name for name in query if name not in DIMENSION_LABELS]
+        if unknown:
+            self._send_json(400, {'error': f"지원하지 않는 조건: {', '.join(unknown)}",
+                                  'dimensions': list(DIMENSION_LABELS) + list(DATE_BOUNDS)})
+            return
+        conditions.update(query)
+
+        started = time.perf_counter()
+        try:
+            data, scope = self.service.render(normalize_filters(conditions))
+        except LookupError as e:
+            self._send_json(404, {'error': str(e)})
+            return
+        except Exception as e:
+            print(f"❌ 보고서 생성 중 오류 발생: {e}")
+            self._send_json(500, {'error': str(e)})
+            return
+        seconds = time.perf_counter() - started
+
+        if save:
+            with open(REPORT_SAVE_PATH, 'wb') as f:
+                f.write(data)
+            self._send_json(200, {'path': REPORT_SAVE_PATH, 'bytes': len(data), 'scope': scope,
+                                  'seconds': round(seconds, 3)})
+            return
+
+        filename = f'sales_analysis_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.docx'
+        self.send_response(200)
+        self.send_header('Content-Type', DOCX_CONTENT_TYPE)
+        self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('X-Report-Seconds', f'{seconds:.3f}')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} - {format % args}")
+
+def create_server(service, host=REPORT_SERVER_HOST, port=REPORT_SERVER_PORT):
+    """
+    보고서 서비스를 감싼 HTTP 서버 생성
+
+    Args:
+        service (ReportService): 준비된 보고서 서비스
+        host (str): 대기할 주소
+        port (int): 대기할 포트 (0이면 빈 포트 자동 선택)
+
+    Returns:
+        ThreadingHTTPServer: serve_forever()로 실행할 서버
+    """
+    handler = type('BoundReportRequestHandler', (ReportRequestHandler,), {'service': service})
+    return ThreadingHTTPServer((host, port), handler)
+
+def build_parser():
+    """명령줄 인자 파서 생성"""
+    parser = argparse.ArgumentParser(description='상주형 Word 보고서 서버')
+    parser.add_argument('--host', default=REPORT_SERVER_HOST,
+                        help=f'대기할 주소 (기본값: {REPORT_SERVER_HOST}, 외부 노출 시 주의)')
+    parser.add_argument('--port', type=int, default=REPORT_SERVER_PORT,
+                        help=f'대기할 포트 (기본값: {REPORT_SERVER_PORT}, 0이면 빈 포트 자동 선택)')
+    return parser
+
+def main(argv=None):
+    """메인 함수 (--host, --port로 대기 주소 지정)"""
+    args = build_parser().parse_args(argv)
+
+    print("🚀 보고서 서버를 준비합니다...\n")
+    try:
+        service = ReportService().warm_up()
+        server = create_server(service, host=args.host, port=args.port)
+    except Exception as e:
+        print(f"❌ 보고서 서버 준비 중 오류 발생: {e}")
+        return
+
+    print(f"\n⏱️  준비 시간: {time.perf_counter() - _IMPORT_STARTED:.2f}초 (라이브러리, 폰트, 데이터)")
+    print(f"✅ 보고서 서버 실행 중: http://{server.server_address[0]}:{server.server_address[1]}/report")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 보고서 서버를 종료합니다.")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Word 보고서 템플릿 도구
+제목, 머리글, 고정 문구가 들어 있는 보고서 골격(.docx)을 한 번 만들어 캐시에 저장하고,
+실행할 때마다 골격을 불러와 자리표시자({{이름}})에 숫자, 표, 차트만 채워 넣습니다.
+
+자리표시자 종류:
+- {{이름}}: 문단 안의 텍스트 (values의 값으로 치환)
+- {{table:이름}}: 문단 전체가 표로 교체 (tables의 DataFrame)
+- {{chart:이름}}: 문단 전체가 차트 제목과 이미지로 교체 (charts의 (파일 또는 ChartImage, 너비, 제목))
+"""
+
+import hashlib
+import inspect
+import io
+import os
+import re
+from docx_tables import add_dataframe_table
+from chart_renderer import add_chart_picture, chart_exists
+
+# 생성된 보고서 골격 저장 폴더
+TEMPLATE_DIR = os.path.join('.cache', 'templates')
+
+# 문단 안의 텍스트 자리표시자
+TEXT_PLACEHOLDER = re.compile(r'\{\{(\w+)\}\}')
+
+# 문단 전체를 교체하는 표/차트 자리표시자
+BLOCK_PLACEHOLDER = re.compile(r'^\{\{(table|chart):(\w+)\}\}$')
+
+# 프로세스 안에서 한 번 읽은 템플릿 파일 내용 (경로 → (수정 시각, 내용))
+_template_cache = {}
+
+def get_template_path(name, build_skeleton, template_dir=TEMPLATE_DIR):
+    """
+    보고서 골격 파일 경로 반환 (없으면 build_skeleton으로 만들어 저장)
+
+    Args:
+        name (str): 템플릿 이름
+        build_skeleton (function): Document를 받아 골격을 작성하는 함수
+        template_dir (str): 골격 파일 저장 폴더
+
+    Returns:
+        str: 골격 .docx 파일 경로
+    """
+    # 골격 작성 함수의 소스 해시를 파일 이름에 넣어 골격이 바뀌면 새로 만들도록 함
+    source_hash = hashlib.sha256(inspect.getsource(build_skeleton).encode('utf-8')).hexdigest()[:16]
+    template_path = os.path.join(template_dir, f"{name}_{source_hash}.docx")
+
+    if not os.path.exists(template_path):
+        from docx import Document
+        doc = Document()
+        build_skeleton(doc)
+        os.makedirs(template_dir, exist_ok=True)
+        # 다른 프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{template_path}.{os.getpid()}.tmp"
+        doc.save(tmp_path)
+        os.replace(tmp_path, template_path)
+        print(f"📐 보고서 골격 생성: {template_path}")
+
+    return template_path
+
+def load_template(template_path):
+    """템플릿 파일로 새 문서 생성 (파일 내용은 프로세스당 한 번만 읽음)"""
+    from docx import Document
+    mtime = os.path.getmtime(template_path)
+    cached = _template_cache.get(template_path)
+    if cached is None or cached[0] != mtime:
+        with open(template_path, 'rb') as f:
+            cached = (mtime, f.read())
+        _template_cache[template_path] = cached
+    return Document(io.BytesIO(cached[1]))
+
+def _replace_text(paragraph, values):
+    """문단의 텍스트 자리표시자 치환 (run 단위로 치환하여 서식 유지)"""
+    def substitute(text):
+        return TEXT_PLACEHOLDER.sub(lambda match: str(values[match.group(1)]), text)
+
+    for run in paragraph.runs:
+        if '{{' in run.text:
+            run.text = substitute(run.text)
+
+    # Word에서 편집한 템플릿은 자리표시자가 여러 run으로 나뉠 수 있으므로 문단 단위로 다시 확인
+    if TEXT_PLACEHOLDER.search(paragraph.text):
+        text = substitute(paragraph.text)
+        runs = paragraph.runs
+        runs[0].text = text
+        for run in runs[1:]:
+            run._r.getparent().remove(run._r)
+
+def _replace_block(doc, paragraph, kind, name, tables, charts):
+    """표/차트 자리표시자 문단 교체"""
+    if kind == 'table':
+        table = add_dataframe_table(doc, tables[name])
+        paragraph._p.addprevious(table._tbl)
+        paragraph._p.getparent().remove(paragraph._p)
+        return
+
+    chart_file, width, caption = charts[name]
+    if not chart_exists(chart_file):
+        # 차트가 없으면 제목 없이 자리표시자만 제거
+        paragraph._p.getparent().remove(paragraph._p)
+        return
+
+    paragraph.insert_paragraph_before("")
+    paragraph.insert_paragraph_before(caption, style='Heading 2')
+    paragraph.clear()
+    add_chart_picture(doc, chart_file, width, run=paragraph.add_run())
+
+def fill_template(doc, values=None, tables=None, charts=None):
+    """
+    템플릿 문서의 자리표시자를 실제 데이터로 채움
+
+    Args:
+        doc (Document): load_template()으로 불러온 문서
+        values (dict): 텍스트 자리표시자 이름 → 값
+        tables (dict): 표 자리표시자 이름 → DataFrame (컬럼 이름이 머리글)
+        charts (dict): 차트 자리표시자 이름 → (차트 파일 경로 또는 ChartImage, 이미지 너비, 차트 제목)
+
+    Returns:
+        Document: 채워진 문서
+    """
+    values = values or {}
+    tables = tables or {}
+    charts = charts or {}
+
+    for paragraph in list(doc.paragraphs):
+        if '{{' not in paragraph.text:
+            continue
+        block = BLOCK_PLACEHOLDER.match(paragraph.text.strip())
+        if block:
+            _replace_block(doc, paragraph, block.group(1), block.group(2), tables, charts)
+        else:
+            _replace_text(paragraph, values)
+
+    return doc
@@ -0,0 +1,178 @@
+"""
+판매 데이터 집계 큐브
+Date × Category × Region × Product × Salesperson 조합별 합계를 한 번의 groupby로 계산하고,
+분석 표와 차트는 모두 이 큐브를 다시 묶어(roll-up) 만듭니다.
+큐브 크기는 원본 행 수가 아니라 실제로 등장한 차원 조합 수에 비례합니다.
+집계와 분석 함수는 pipeline_metrics 측정 중일 때 단계별로 기록됩니다.
+"""
+
+import os
+import pandas as pd
+from pipeline_metrics import stage, instrumented
+
+# 큐브 차원 (ProductName은 ProductID별 표시용으로 함께 보관)
+CUBE_DIMENSIONS = ['Date', 'Category', 'Region', 'ProductID', 'ProductName', 'Salesperson']
+
+# 큐브 측정값
+CUBE_MEASURES = ['TotalPrice', 'Quantity', 'OrderCount']
+
+def _match_key(value):
+    """차원 값 비교용 키 (공백 정리, 소문자)"""
+    return ' '.join(str(value).split()).lower()
+
+def match_values(available, requested):
+    """
+    요청한 차원 값을 데이터에 있는 표기로 맞춤 (대소문자와 공백 차이 무시)
+
+    Args:
+        available: 데이터에 있는 값 목록 (카테고리, 고유값 등)
+        requested (list): 조건으로 받은 값 목록
+
+    Returns:
+        list: 데이터 표기로 바꾼 값 목록 (일치하는 값이 없으면 요청한 값 그대로 두어 0건이 됨)
+    """
+    known = {_match_key(value): value for value in available if not pd.isna(value)}
+    return [known.get(_match_key(value), value) for value in requested]
+
+def _known_values(series):
+    """컬럼에 있는 값 목록 (category이면 카테고리 목록)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.categories
+    return series.dropna().unique()
+
+def _aggregate(df):
+    """정리된 판매 데이터를 차원 조합별 합계로 집계 (결측 차원도 합계에 포함)"""
+    grouped = df.groupby(CUBE_DIMENSIONS, observed=True, dropna=False)
+    cube = grouped[['TotalPrice', 'Quantity']].sum()
+    cube['OrderCount'] = grouped.size()
+    return cube.reset_index()
+
+class SalesCube:
+    """다차원 판매 집계 결과와 roll-up 함수 모음"""
+
+    def __init__(self, data=None):
+        if data is None:
+            data = pd.DataFrame(columns=CUBE_DIMENSIONS + CUBE_MEASURES)
+        self.data = data
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """정리된 판매 데이터로 큐브 생성"""
+        with stage('aggregate', rows=len(df)):
+            return cls(_aggregate(df))
+
+    def update(self, chunk):
+        """정리된 청크 하나를 큐브에 합산 (스트리밍 처리용)"""
+        if chunk.empty:
+            return
+        partial = _aggregate(chunk)
+        if self.data.empty:
+            self.data = partial
+            return
+        # 청크마다 category 값 목록이 다를 수 있으므로 이어붙인 뒤 재집계
+        merged = pd.concat([self.data, partial], ignore_index=True)
+        self.data = merged.groupby(CUBE_DIMENSIONS, observed=True, dropna=False)[CUBE_MEASURES].sum().reset_index()
+
+    def save(self, path):
+        """큐브를 파일로 저장 (다른 프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        self.data.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """저장된 큐브 불러오기"""
+        return cls(pd.read_pickle(path))
+
+    def filter(self, **conditions):
+        """차원 값과 날짜 범위(start, end 포함)로 큐브 일부만 선택 (예: cube.filter(Region='north', start='2025-09-01'), 대소문자 무시)"""
+        mask = pd.Series(True, index=self.data.index)
+        for column, value in conditions.items():
+            if column == 'start':
+                mask &= self.data['Date'] >= pd.Timestamp(value)
+            elif column == 'end':
+                mask &= self.data['Date'] <= pd.Timestamp(value)
+            else:
+                values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+                if column != 'Date':
+                    values = match_values(_known_values(self.data[column]), values)
+                mask &= self.data[column].isin(values)
+        return SalesCube(self.data[mask].reset_index(drop=True))
+
+    @property
+    def row_count(self):
+        """큐브에 반영된 원본 거래 건수"""
+        return int(self.data['OrderCount'].sum())
+
+    @property
+    def empty(self):
+        return self.row_count == 0
+
+    def rollup(self, dimensions):
+        """지정한 차원으로 다시 묶은 합계 (결측 차원 값은 제외)"""
+        return self.data.groupby(dimensions, observed=True)[CUBE_MEASURES].sum()
+
+    @instrumented('rollup:sales_by', rows=len)
+    def sales_by(self, dimension):
+        """차원별 매출액 Series (매출액 내림차순, 차트용)"""
+        return self.rollup(dimension)['TotalPrice'].sort_values(ascending=False)
+
+    @instrumented('rollup:daily_totals', rows=len)
+    def daily_totals(self):
+        """일별 매출액 Series (날짜순, 차트용)"""
+        return self.rollup('Date')['TotalPrice'].sort_index()
+
+    @instrumented('rollup:summary')
+    def summary(self):
+        """요약 통계 딕셔너리 반환"""
+        total_sales = self.data['TotalPrice'].sum()
+        row_count = self.row_count
+        return {
+            'row_count': row_count,
+            'total_sales': total_sales,
+            'total_quantity': int(self.data['Quantity'].sum()),
+            'avg_order_value': total_sales / row_count if row_count else 0.0,
+            'unique_products': self.data['ProductID'].nunique(),
+            'min_date': self.data['Date'].min(),
+            'max_date': self.data['Date'].max()
+        }
+
+    @instrumented('rollup:category_sales', rows=len)
+    def category_sales(self):
+        """카테고리별 분석 (총 매출액, 총 수량, 제품 종류 수)"""
+        category_sales = self.rollup('Category')[['TotalPrice', 'Quantity']]
+        category_sales['ProductID'] = self.data.groupby('Category', observed=True)['ProductID'].nunique()
+        category_sales = category_sales.round(2)
+        category_sales.columns = ['총 매출액', '총 수량', '제품 종류 수']
+        return category_sales.sort_values('총 매출액', ascending=False)
+
+    @instrumented('rollup:product_sales', rows=len)
+    def product_sales(self, top_n=10):
+        """제품별 분석 (매출액 상위 top_n개, None이면 전체)"""
+        product_sales = self.rollup(['ProductID', 'ProductName'])[['TotalPrice', 'Quantity']].round(2)
+        product_sales.columns = ['총 매출액', '총 수량']
+        product_sales = product_sales.sort_values('총 매출액', ascending=False)
+        return product_sales if top_n is None else product_sales.head(top_n)
+
+    @instrumented('rollup:region_sales', rows=len)
+    def region_sales(self):
+        """지역별 분석 (총 매출액, 총 수량)"""
+        region_sales = self.rollup('Region')[['TotalPrice', 'Quantity']].round(2)
+        region_sales.columns = ['총 매출액', '총 수량']
+        return region_sales.sort_values('총 매출액', ascending=False)
+
+    @instrumented('rollup:salesperson_sales', rows=len)
+    def salesperson_sales(self):
+        """영업사원별 분석 (총 매출액, 총 수량, 거래 횟수 - 빈 값 제외)"""
+        data = self.data[self.data['Salesperson'].notna() & (self.data['Salesperson'] != '')]
+        salesperson_sales = data.groupby('Salesperson', observed=True)[CUBE_MEASURES].sum().round(2)
+        salesperson_sales.columns = ['총 매출액', '총 수량', '거래 횟수']
+        return salesperson_sales.sort_values('총 매출액', ascending=False)
+
+    @instrumented('rollup:daily_sales', rows=len)
+    def daily_sales(self):
+        """일별 분석 (일별 매출액, 일별 수량)"""
+        daily_sales = self.rollup('Date')[['TotalPrice', 'Quantity']].sort_index().round(2)
+        daily_sales.columns = ['일별 매출액', '일별 수량']
+        return daily_sales
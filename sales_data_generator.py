@@ -0,0 +1,205 @@
+"""
+합성 판매 데이터 생성기
+cicd_data.csv와 같은 스키마(Date,ProductID,ProductName,Category,Quantity,UnitPrice,TotalPrice,Region,Salesperson)로
+10^3행부터 10^8행까지의 데이터를 청크 단위로 생성하여 CSV에 씁니다.
+같은 설정과 시드로 만들면 항상 같은 파일이 생성되며, 제품/카테고리/지역/영업사원 수와
+전처리에서 제거되거나 정리되어야 하는 오류 행의 비율을 조절할 수 있습니다.
+
+사용 예:
+    python sales_data_generator.py 1000000 big_sales.csv --dirty-ratio 0.02
+"""
+
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+# 한 번에 생성하여 기록할 행 수
+GENERATOR_CHUNK_ROWS = 1_000_000
+
+# 기본 생성 설정
+DEFAULT_GENERATOR_SETTINGS = {
+    'products': 50,
+    'categories': 5,
+    'regions': 4,
+    'salespeople': 20,
+    'days': 365,
+    'start_date': '2025-01-01',
+    'dirty_ratio': 0.02,
+    'seed': 0
+}
+
+CSV_COLUMNS = ['Date', 'ProductID', 'ProductName', 'Category', 'Quantity', 'UnitPrice', 'TotalPrice', 'Region', 'Salesperson']
+
+# 이름 조합용 단어 (개수를 넘으면 번호를 붙여 확장)
+PRODUCT_ADJECTIVES = ['Alpha', 'Beta', 'Gamma', 'Delta', 'Epsilon', 'Zeta', 'Orion', 'Nova', 'Astra', 'Charlie']
+PRODUCT_NOUNS = ['Widget', 'Gadget', 'Gear', 'Device', 'Shirt', 'Tool', 'T-shirt', 'Blender', 'Cookware', 'Sensor']
+CATEGORY_NAMES = ['Electronics', 'Apparel', 'Home Goods', 'Kitchen', 'Sports', 'Books', 'Toys', 'Beauty']
+REGION_NAMES = ['North', 'South', 'East', 'West']
+FIRST_NAMES = ['John', 'Jane', 'Sue', 'Leo', 'Grace', 'Peter', 'Nina', 'Mark', 'Amy', 'Chris']
+LAST_NAMES = ['Doe', 'Smith', 'Kim', 'Martin', 'Lee', 'Jones', 'Chen', 'Park', 'Brown', 'Wilson']
+
+# 오류 행 종류 (clean_sales_data가 정리하거나 제거하는 경우)
+DIRTY_KINDS = ['lowercase', 'missing_quantity', 'bad_date', 'invalid_product', 'zero_price']
+
+def _names(words_a, words_b, count):
+    """두 단어 목록을 조합한 고유 이름 count개 (조합이 모자라면 번호를 붙임)"""
+    names = [f"{a} {b}" for b in words_b for a in words_a]
+    return [names[i % len(names)] + (f" {i // len(names) + 1}" if i >= len(names) else '') for i in range(count)]
+
+def _labels(base, count, prefix):
+    """기본 이름 목록을 count개로 확장 (모자라면 '접두어 번호')"""
+    return [base[i] if i < len(base) else f"{prefix} {i + 1}" for i in range(count)]
+
+def build_catalog(settings):
+    """
+    설정으로 제품/영업사원 목록 생성 (시드가 같으면 같은 목록)
+
+    Returns:
+        dict: 제품 ID, 이름, 카테고리, 단가와 영업사원 이름, 담당 지역 배열
+    """
+    rng = np.random.default_rng([settings['seed'], 0])
+    products = settings['products']
+    categories = _labels(CATEGORY_NAMES, settings['categories'], 'Category')
+    regions = _labels(REGION_NAMES, settings['regions'], 'Region')
+
+    return {
+        'product_ids': np.array([f"P{1001 + i}" for i in range(products)], dtype=object),
+        'product_names': np.array(_names(PRODUCT_ADJECTIVES, PRODUCT_NOUNS, products), dtype=object),
+        'product_categories': np.array([categories[i % len(categories)] for i in range(products)], dtype=object),
+        'unit_prices': np.round(rng.lognormal(mean=4.0, sigma=0.8, size=products), 2),
+        'salespeople': np.array(_names(FIRST_NAMES, LAST_NAMES, settings['salespeople']), dtype=object),
+        'salesperson_regions': np.array([regions[i % len(regions)] for i in range(settings['salespeople'])], dtype=object)
+    }
+
+def generate_chunk(catalog, settings, start_row, rows, total_rows, chunk_index):
+    """
+    합성 판매 데이터 청크 하나 생성
+
+    Args:
+        catalog (dict): build_catalog() 결과
+        settings (dict): 생성 설정
+        start_row (int): 청크의 첫 행 번호 (날짜를 파일 전체에서 오름차순으로 배치)
+        rows (int): 청크 행 수
+        total_rows (int): 파일 전체 행 수
+        chunk_index (int): 청크 번호 (청크별 난수 시드)
+
+    Returns:
+        DataFrame: CSV_COLUMNS 순서의 청크
+    """
+    rng = np.random.default_rng([settings['seed'], 1, chunk_index])
+
+    # 날짜는 행 번호에 비례하도록 배치하여 실제 데이터처럼 날짜순 정렬 유지
+    row_numbers = np.arange(start_row, start_row + rows, dtype=np.int64)
+    day_offsets = row_numbers * settings['days'] // max(total_rows, 1)
+    dates = (np.datetime64(settings['start_date']) + day_offsets.astype('timedelta64[D]')).astype(str).astype(object)
+
+    product_codes = rng.integers(0, len(catalog['product_ids']), rows)
+    salesperson_codes = rng.integers(0, len(catalog['salespeople']), rows)
+    quantity = rng.integers(1, 100, rows)
+    unit_price = catalog['unit_prices'][product_codes]
+
+    chunk = pd.DataFrame({
+        'Date': dates,
+        'ProductID': catalog['product_ids'][product_codes],
+        'ProductName': catalog['product_names'][product_codes],
+        'Category': catalog['product_categories'][product_codes],
+        'Quantity': pd.array(quantity, dtype='Int32'),
+        'UnitPrice': unit_price,
+        'TotalPrice': np.round(quantity * unit_price, 2),
+        'Region': catalog['salesperson_regions'][salesperson_codes],
+        'Salesperson': catalog['salespeople'][salesperson_codes]
+    })
+
+    # 오류 행 삽입 (종류별로 고르게)
+    dirty = np.flatnonzero(rng.random(rows) < settings['dirty_ratio'])
+    if len(dirty):
+        kinds = rng.integers(0, len(DIRTY_KINDS), len(dirty))
+        for kind_index, kind in enumerate(DIRTY_KINDS):
+            positions = dirty[kinds == kind_index]
+            if not len(positions):
+                continue
+            if kind == 'lowercase':
+                for column in ['ProductName', 'Category', 'Salesperson']:
+                    chunk.loc[positions, column] = chunk.loc[positions, column].str.lower()
+            elif kind == 'missing_quantity':
+                chunk.loc[positions, ['Quantity', 'TotalPrice']] = pd.NA
+            elif kind == 'bad_date':
+                chunk.loc[positions, 'Date'] = '2.00E+05'
+            elif kind == 'invalid_product':
+                chunk.loc[positions, ['ProductID', 'ProductName', 'Category', 'Region', 'Salesperson']] = \
+                    ['P0000', 'Invalid Product', None, 'Unknown', None]
+                chunk.loc[positions, ['Quantity', 'UnitPrice', 'TotalPrice']] = 0
+            elif kind == 'zero_price':
+                chunk.loc[positions, ['UnitPrice', 'TotalPrice']] = 0
+
+    return chunk
+
+def iter_sales_chunks(rows, chunk_rows=GENERATOR_CHUNK_ROWS, **settings):
+    """합성 판매 데이터를 청크 단위로 생성 (settings는 DEFAULT_GENERATOR_SETTINGS 키로 덮어씀)"""
+    settings = dict(DEFAULT_GENERATOR_SETTINGS, **settings)
+    catalog = build_catalog(settings)
+    for chunk_index, start_row in enumerate(range(0, rows, chunk_rows)):
+        yield generate_chunk(catalog, settings, start_row, min(chunk_rows, rows - start_row), rows, chunk_index)
+
+def generate_sales_data(rows, **settings):
+    """합성 판매 데이터를 DataFrame 하나로 생성 (작은 데이터용)"""
+    return pd.concat(list(iter_sales_chunks(rows, **settings)), ignore_index=True)
+
+def write_sales_csv(file_path, rows, chunk_rows=GENERATOR_CHUNK_ROWS, **settings):
+    """
+    합성 판매 데이터를 CSV 파일로 저장 (청크 단위로 기록하여 메모리 사용량 고정)
+
+    Args:
+        file_path (str): 저장할 CSV 경로
+        rows (int): 생성할 행 수
+        chunk_rows (int): 한 번에 생성할 행 수 (같은 시드라도 청크 크기가 다르면 다른 데이터)
+        **settings: DEFAULT_GENERATOR_SETTINGS 키 (products, categories, regions, salespeople, days,
+                    start_date, dirty_ratio, seed)
+
+    Returns:
+        str: 저장한 파일 경로
+    """
+    os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+    # 생성 도중 중단되어도 불완전한 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    header = True
+    for chunk in iter_sales_chunks(rows, chunk_rows, **settings):
+        chunk.to_csv(tmp_path, mode='w' if header else 'a', header=header, index=False)
+        header = False
+    os.replace(tmp_path, file_path)
+    return file_path
+
+def add_generator_arguments(parser):
+    """생성 설정 명령줄 인자 추가 (벤치마크와 공용)"""
+    defaults = DEFAULT_GENERATOR_SETTINGS
+    parser.add_argument('--products', type=int, default=defaults['products'], help='제품 수')
+    parser.add_argument('--categories', type=int, default=defaults['categories'], help='카테고리 수')
+    parser.add_argument('--regions', type=int, default=defaults['regions'], help='지역 수')
+    parser.add_argument('--salespeople', type=int, default=defaults['salespeople'], help='영업사원 수')
+    parser.add_argument('--days', type=int, default=defaults['days'], help='기간 (일)')
+    parser.add_argument('--start-date', default=defaults['start_date'], help='시작 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--dirty-ratio', type=float, default=defaults['dirty_ratio'], help='오류 행 비율 (0~1)')
+    parser.add_argument('--seed', type=int, default=defaults['seed'], help='난수 시드')
+
+def generator_settings(args):
+    """명령줄 인자에서 생성 설정 딕셔너리 추출"""
+    return {key: getattr(args, key) for key in DEFAULT_GENERATOR_SETTINGS}
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='합성 판매 데이터 CSV 생성')
+    parser.add_argument('rows', type=int, help='생성할 행 수')
+    parser.add_argument('output', help='저장할 CSV 경로')
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    print(f"🧪 합성 판매 데이터 {args.rows:,}행 생성 중...")
+    try:
+        write_sales_csv(args.output, args.rows, **generator_settings(args))
+        print(f"✅ 저장 완료: {args.output} ({os.path.getsize(args.output) / (1024 * 1024):,.1f}MB)")
+    except Exception as e:
+        print(f"❌ 데이터 생성 중 오류 발생: {e}")
+
+if __name__ == "__main__":
+    main()
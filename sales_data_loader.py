@@ -0,0 +1,521 @@
+"""
+판매 데이터 공통 로더
+모든 보고서 스크립트가 사용하는 CSV 로드 및 전처리 모듈입니다.
+명시적인 dtype 스키마로 CSV를 읽어 파싱 시간과 메모리를 줄이고,
+정리된 데이터는 원본 파일 해시 기준으로 Feather 캐시에 저장하여 재사용합니다.
+대용량 CSV는 청크 단위로 읽어 집계 큐브(SalesCube)에 누적합니다.
+정리 단계는 모든 검증 규칙을 한 번에 평가하여 제거된 행을 사유 코드와 함께 격리 파일에 남깁니다.
+각 단계(캐시 읽기, CSV 읽기, 정리, 청크 집계)는 pipeline_metrics 측정 중일 때 단계별로 기록됩니다.
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from sales_cube import SalesCube
+from pipeline_metrics import stage
+
+# pyarrow가 설치된 경우에만 Feather 캐시 사용
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+# 한 번에 읽어들일 행 수 (청크 크기)
+DEFAULT_CHUNK_SIZE = 500_000
+
+# CSV 컬럼별 dtype 스키마
+# - 반복되는 문자열은 category로 저장하여 메모리 절약
+# - Quantity는 결측값이나 소수(2.5 등)가 있을 수 있으므로 float64로 읽고, 검증에서 그런 행을 제거한 뒤 int32로 변환
+SALES_DTYPES = {
+    'ProductID': 'category',
+    'ProductName': 'category',
+    'Category': 'category',
+    'Quantity': 'float64',
+    'UnitPrice': 'float32',
+    'TotalPrice': 'float64',
+    'Region': 'category',
+    'Salesperson': 'category'
+}
+
+# 날짜 형식 (형식을 지정하면 행마다 형식을 추론하지 않음)
+DATE_FORMAT = '%Y-%m-%d'
+
+# 앞뒤/중복 공백 정리 대상 컬럼 (문자열 category 컬럼 전체)
+TEXT_COLUMNS = ['ProductID', 'ProductName', 'Category', 'Region', 'Salesperson']
+
+# 대소문자 정리 대상 컬럼
+TITLE_CASE_COLUMNS = ['ProductName', 'Category', 'Salesperson']
+
+# 컬럼별 별칭 → 표준 이름 (별칭은 공백 정리 후 소문자로 비교)
+# 예: {'Category': {'home & garden': 'Home Goods'}, 'Region': {'n': 'North'}}
+# (별칭과 대소문자 정리 대상은 cleaning_rules_key()에 포함되므로 바꾸면 캐시가 자동으로 무효화됨)
+TEXT_ALIASES = {}
+
+# 검증 규칙 (이름, 설명) - 목록 순서대로 사유 코드의 비트(1, 2, 4, ...)가 배정됨
+# (사유 코드는 uint8이므로 최대 8개, 기존 코드 값이 바뀌지 않도록 새 규칙은 끝에 추가)
+VALIDATION_RULES = [
+    ('missing_date', '날짜 없음 또는 형식 오류'),
+    ('missing_product_id', '제품 ID 없음'),
+    ('invalid_product_id', '잘못된 제품 ID (P0000)'),
+    ('missing_quantity', '수량 없음'),
+    ('non_positive_quantity', '수량 0 이하'),
+    ('missing_unit_price', '단가 없음'),
+    ('non_positive_unit_price', '단가 0 이하'),
+    ('non_integer_quantity', '수량이 정수가 아님')
+]
+
+# 제거된 행과 제거 사유를 저장할 격리 파일
+QUARANTINE_PATH = 'rejected_sales_rows.csv'
+
+# 전처리 규칙 버전 (clean_sales_data의 규칙을 바꾸면 올려서 기존 캐시를 무효화, 설정값 변경은 cleaning_rules_key()가 반영)
+CLEANING_RULES_VERSION = 3
+
+# 정리된 데이터 캐시 저장 폴더
+CACHE_DIR = os.path.join('.cache', 'sales_data')
+
+# 증분 집계 상태(누적 큐브와 마지막 처리 날짜) 저장 폴더
+STATE_DIR = os.path.join('.cache', 'sales_state')
+
+def read_sales_csv(file_path, **kwargs):
+    """dtype 스키마를 적용하여 판매 데이터 CSV 읽기 (chunksize 등 read_csv 옵션 전달 가능)"""
+    return pd.read_csv(file_path, dtype=SALES_DTYPES, encoding='utf-8', **kwargs)
+
+def normalize_text_values(values, title_case=False, aliases=None):
+    """
+    문자열 값 목록 정리 (앞뒤 공백 제거, 중복 공백 축소, 대소문자 정리, 별칭 치환)
+
+    Args:
+        values (Index): 정리할 고유 문자열 값
+        title_case (bool): title()로 대소문자 정리 여부
+        aliases (dict): 별칭(공백 정리 후 소문자) → 표준 이름
+
+    Returns:
+        Index: values와 같은 순서의 정리된 값 (빈 문자열은 결측값)
+    """
+    normalized = values.str.strip().str.replace(r'\s+', ' ', regex=True)
+    if title_case:
+        normalized = normalized.str.title()
+    if aliases:
+        canonical = normalized.str.lower().map(aliases)
+        normalized = normalized.where(canonical.isna(), canonical)
+    return normalized.where(normalized != '')
+
+def _normalize_categories(series, title_case=False, aliases=None):
+    """
+    category 컬럼의 고유값만 정리한 뒤 코드를 다시 매핑 (행 단위 문자열 연산 회피)
+
+    같은 값으로 정리되는 변형(대소문자, 공백, 별칭)은 하나의 카테고리로 합쳐지므로
+    정리 비용은 행 수가 아니라 고유값 수에 비례합니다.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    normalized = normalize_text_values(series.cat.categories, title_case, aliases)
+
+    # 정리된 고유값 사전 (factorize는 결측값을 -1로 표시)
+    code_map, categories = pd.factorize(normalized)
+    codes = series.cat.codes.to_numpy()
+    # 원래 결측값(-1)은 그대로 -1 유지
+    new_codes = np.where(codes >= 0, code_map[codes], -1)
+    return pd.Series(pd.Categorical.from_codes(new_codes, categories=categories),
+                     index=series.index, name=series.name)
+
+def validate_sales_data(df, dates):
+    """
+    모든 검증 규칙을 한 번에 평가하여 행별 사유 코드 비트마스크 생성
+
+    Args:
+        df (DataFrame): 문자열 정리까지 마친 판매 데이터
+        dates (Series): 변환된 날짜 (형식 오류는 NaT)
+
+    Returns:
+        ndarray: 행별 사유 코드 (0이면 정상, VALIDATION_RULES 순서의 비트 조합)
+    """
+    quantity = df['Quantity']
+    unit_price = df['UnitPrice']
+    checks = {
+        'missing_date': dates.isna(),
+        'missing_product_id': df['ProductID'].isna(),
+        'invalid_product_id': df['ProductID'] == 'P0000',
+        'missing_quantity': quantity.isna(),
+        'non_positive_quantity': (quantity <= 0).fillna(False),
+        'missing_unit_price': unit_price.isna(),
+        'non_positive_unit_price': unit_price <= 0,
+        'non_integer_quantity': quantity.notna() & (quantity % 1 != 0)
+    }
+    reasons = np.zeros(len(df), dtype=np.uint8)
+    for bit, (name, _) in enumerate(VALIDATION_RULES):
+        reasons |= checks[name].to_numpy(dtype=bool).astype(np.uint8) << bit
+    return reasons
+
+def describe_reasons(codes):
+    """사유 코드 배열을 규칙 이름 문자열('missing_quantity|non_positive_unit_price')로 변환 (고유 코드 단위)"""
+    labels = {
+        code: '|'.join(name for bit, (name, _) in enumerate(VALIDATION_RULES) if code >> bit & 1)
+        for code in np.unique(codes).tolist()
+    }
+    return pd.Series(codes).map(labels).to_numpy()
+
+class ValidationReport:
+    """
+    검증 결과 누적 (규칙별 위반 건수와 제거된 행의 격리 파일)
+
+    청크 단위로 여러 번 add()해도 격리 파일 하나에 이어서 기록합니다.
+    한 행이 여러 규칙을 위반하면 각 규칙의 건수에 모두 포함됩니다.
+    """
+
+    def __init__(self, quarantine_path=QUARANTINE_PATH):
+        self.quarantine_path = quarantine_path
+        self.checked = 0
+        self.rejected = 0
+        self.rule_counts = {name: 0 for name, _ in VALIDATION_RULES}
+        self._quarantine_started = False
+
+    def add(self, df, reasons):
+        """검증한 데이터와 사유 코드를 기록 (제거된 행은 격리 파일에 추가)"""
+        self.checked += len(df)
+        rejected = reasons != 0
+        rejected_count = int(np.count_nonzero(rejected))
+        if not rejected_count:
+            return
+        self.rejected += rejected_count
+        for bit, (name, _) in enumerate(VALIDATION_RULES):
+            self.rule_counts[name] += int(np.count_nonzero(reasons & (1 << bit)))
+
+        if self.quarantine_path:
+            codes = reasons[rejected]
+            quarantine = df[rejected].assign(RejectCode=codes, RejectReasons=describe_reasons(codes))
+            quarantine.to_csv(self.quarantine_path, mode='a' if self._quarantine_started else 'w',
+                              header=not self._quarantine_started, index=False, encoding='utf-8')
+            self._quarantine_started = True
+
+    def finish(self):
+        """검증 종료 (제거된 행이 없으면 이전 실행의 격리 파일 삭제)"""
+        if self.quarantine_path and not self._quarantine_started and os.path.exists(self.quarantine_path):
+            os.remove(self.quarantine_path)
+        return self
+
+    def to_dict(self):
+        return {'checked': self.checked, 'rejected': self.rejected, 'rule_counts': dict(self.rule_counts)}
+
+    def print_summary(self):
+        """규칙별 위반 건수 출력"""
+        print_validation_summary(self.to_dict(), self.quarantine_path if self._quarantine_started else None)
+
+def print_validation_summary(summary, quarantine_path=None):
+    """검증 요약(ValidationReport.to_dict() 형식) 출력"""
+    print(f"🔎 데이터 검증: {summary['checked']:,}행 중 {summary['rejected']:,}행 제거")
+    descriptions = dict(VALIDATION_RULES)
+    for name, count in summary['rule_counts'].items():
+        if count:
+            print(f"   - {descriptions.get(name, name)}: {count:,}행")
+    if quarantine_path:
+        print(f"🗂️  제거된 행 격리 파일: {quarantine_path}")
+
+def clean_sales_data(df, validation=None):
+    """
+    판매 데이터 전처리 (날짜 변환, 문자열 정리, 오류 데이터 제거, TotalPrice 재계산)
+
+    Args:
+        df (DataFrame): read_sales_csv()로 읽은 원본 데이터 (변경하지 않음)
+        validation (ValidationReport): 규칙별 건수와 제거된 행을 기록할 검증 결과 (None이면 기록 안 함)
+
+    Returns:
+        DataFrame: 정리된 데이터
+    """
+    # 얕은 복사본에서 문자열 컬럼만 새 배열로 교체하므로 호출한 쪽의 DataFrame은 그대로 유지
+    df = df.copy(deep=False)
+
+    # 1. 날짜 변환 (격리 파일에 원래 날짜 문자열이 남도록 검증 후에 컬럼 교체)
+    dates = pd.to_datetime(df['Date'], format=DATE_FORMAT, errors='coerce')
+
+    # 2. 문자열 컬럼 공백/별칭 정리와 제품명, 카테고리, 영업사원 대소문자 정리 (고유값 단위)
+    for column in TEXT_COLUMNS:
+        df[column] = _normalize_categories(df[column], column in TITLE_CASE_COLUMNS, TEXT_ALIASES.get(column))
+
+    # 3. 모든 검증 규칙을 한 번에 평가하고, 정상 행만 한 번에 선택
+    reasons = validate_sales_data(df, dates)
+    if validation is not None:
+        validation.add(df, reasons)
+    valid = reasons == 0
+    df = df[valid].copy()
+    df['Date'] = dates[valid]
+
+    # 4. 정리 후 dtype 확정 및 제거된 행의 카테고리 정리
+    df = df.astype({'Quantity': 'int32'})
+    for column in df.select_dtypes('category').columns:
+        df[column] = df[column].cat.remove_unused_categories()
+
+    # 5. TotalPrice 재계산 (float32 단가를 센트 단위로 반올림하여 정밀도 보정)
+    df['TotalPrice'] = df['Quantity'] * df['UnitPrice'].astype('float64').round(2)
+
+    return df
+
+def file_content_hash(file_path, block_size=1024 * 1024):
+    """파일 내용의 SHA-256 해시 계산 (블록 단위로 읽어 메모리 사용 최소화)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cleaning_rules_key():
+    """
+    전처리 규칙 식별자 (규칙 버전 + 별칭/대소문자 정리 설정 해시)
+
+    캐시, 색인, 데이터베이스, 누적 상태를 구분하는 데 사용하므로
+    TEXT_ALIASES나 TITLE_CASE_COLUMNS만 바꿔도 이전 결과를 다시 쓰지 않습니다.
+
+    Returns:
+        str: 예) 'v3_1a2b3c4d'
+    """
+    settings = json.dumps([TITLE_CASE_COLUMNS, TEXT_ALIASES], sort_keys=True, ensure_ascii=False)
+    return f"v{CLEANING_RULES_VERSION}_{hashlib.sha256(settings.encode('utf-8')).hexdigest()[:8]}"
+
+def get_cache_path(file_path, cache_dir=CACHE_DIR):
+    """원본 파일 해시와 전처리 규칙 식별자로 캐시 파일 경로 생성"""
+    source_hash = file_content_hash(file_path)
+    return os.path.join(cache_dir, f"{source_hash[:32]}_{cleaning_rules_key()}.feather")
+
+def read_cached_data(cache_path):
+    """Feather 캐시를 메모리 맵으로 읽기 (캐시가 없거나 손상된 경우 None)"""
+    if feather is None or not os.path.exists(cache_path):
+        return None
+    try:
+        return feather.read_table(cache_path, memory_map=True).to_pandas()
+    except Exception as e:
+        print(f"⚠️  캐시를 읽을 수 없어 CSV를 다시 읽습니다: {e}")
+        return None
+
+def write_cached_data(df, cache_path):
+    """정리된 데이터를 Feather 캐시로 저장 (메모리 맵이 가능하도록 비압축)"""
+    if feather is None:
+        return False
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # 다른 프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        feather.write_feather(df.reset_index(drop=True), tmp_path, compression='uncompressed')
+        os.replace(tmp_path, cache_path)
+        return True
+    except Exception as e:
+        print(f"⚠️  캐시 저장 실패 (보고서 생성에는 영향 없음): {e}")
+        return False
+
+def _validation_summary_path(cache_path):
+    """캐시 파일과 함께 저장하는 검증 요약 경로"""
+    return os.path.splitext(cache_path)[0] + '.validation.json'
+
+def _write_cached_validation(cache_path, validation):
+    """캐시와 함께 검증 요약 저장 (캐시에서 읽을 때도 제거 사유를 보여주기 위함)"""
+    try:
+        with open(_validation_summary_path(cache_path), 'w', encoding='utf-8') as f:
+            json.dump(dict(validation.to_dict(), quarantine_path=validation.quarantine_path
+                           if validation.rejected else None), f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"⚠️  검증 요약 저장 실패 (보고서 생성에는 영향 없음): {e}")
+
+def _print_cached_validation(cache_path):
+    """캐시를 만들 때 저장한 검증 요약 출력 (없으면 생략)"""
+    try:
+        with open(_validation_summary_path(cache_path), 'r', encoding='utf-8') as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        return
+    print_validation_summary(summary, summary.get('quarantine_path'))
+
+def load_and_clean_data(file_path, use_cache=True, quarantine_path=QUARANTINE_PATH):
+    """
+    CSV 데이터 로드 및 전처리
+
+    Args:
+        file_path (str): CSV 파일 경로
+        use_cache (bool): 정리된 데이터 캐시 사용 여부 (pyarrow 필요)
+        quarantine_path (str): 제거된 행을 사유와 함께 저장할 CSV 경로 (None이면 저장 안 함)
+
+    Returns:
+        DataFrame: 정리된 판매 데이터 (실패 시 None)
+    """
+    print("=== 데이터 로드 중 ===")
+
+    try:
+        cache_path = None
+        if use_cache and feather is not None:
+            with stage('load_cache') as info:
+                cache_path = get_cache_path(file_path)
+                df = read_cached_data(cache_path)
+                info['rows'] = len(df) if df is not None else None
+            if df is not None:
+                print(f"⚡ 캐시에서 정리된 데이터 로드: {cache_path}")
+                print(f"📊 정리 후 데이터 개수: {len(df)}개")
+                _print_cached_validation(cache_path)
+                print()
+                return df
+
+        with stage('load') as info:
+            df = read_sales_csv(file_path)
+            info['rows'] = len(df)
+        print(f"✅ 데이터 로드 완료: {file_path}")
+        print(f"📊 원본 데이터 개수: {len(df)}개")
+
+        original_count = len(df)
+        validation = ValidationReport(quarantine_path)
+        with stage('clean', rows=original_count):
+            df = clean_sales_data(df, validation)
+        validation.finish()
+
+        print(f"📊 정리 후 데이터 개수: {len(df)}개")
+        print(f"🗑️  제거된 데이터: {original_count - len(df)}개")
+        validation.print_summary()
+        print()
+
+        with stage('cache_write', rows=len(df)):
+            cached = cache_path is not None and write_cached_data(df, cache_path)
+            if cached:
+                _write_cached_validation(cache_path, validation)
+        if cached:
+            print(f"💾 정리된 데이터 캐시 저장: {cache_path}")
+            print()
+        return df
+
+    except FileNotFoundError:
+        print(f"❌ 파일을 찾을 수 없습니다: {file_path}")
+        return None
+    except Exception as e:
+        print(f"❌ 데이터 로드 중 오류 발생: {e}")
+        return None
+
+def iter_clean_chunks(file_path, chunksize=DEFAULT_CHUNK_SIZE, row_filter=None):
+    """CSV 파일을 청크 단위로 읽어 정리된 DataFrame을 하나씩 반환 (row_filter가 있으면 청크마다 행 선택)"""
+    for chunk in read_sales_csv(file_path, chunksize=chunksize):
+        chunk = clean_sales_data(chunk)
+        yield row_filter(chunk) if row_filter is not None else chunk
+
+def load_and_aggregate_streaming(file_path, chunksize=DEFAULT_CHUNK_SIZE, quarantine_path=QUARANTINE_PATH, row_filter=None):
+    """
+    CSV를 청크 단위로 읽어 정리하면서 집계 큐브만 유지
+
+    Args:
+        file_path (str): CSV 파일 경로
+        chunksize (int): 한 번에 읽을 행 수
+        quarantine_path (str): 제거된 행을 사유와 함께 저장할 CSV 경로 (None이면 저장 안 함)
+        row_filter (callable): 정리된 청크에서 집계할 행만 골라 반환하는 함수 (None이면 전체 집계)
+
+    Returns:
+        SalesCube: 누적 집계 큐브 (실패 시 None)
+    """
+    print("=== 스트리밍 모드로 데이터 로드 중 ===")
+    print(f"청크 크기: {chunksize:,}행")
+
+    cube = SalesCube()
+    raw_count = 0
+    validation = ValidationReport(quarantine_path)
+
+    try:
+        with stage('load_clean_aggregate') as info:
+            for i, chunk in enumerate(read_sales_csv(file_path, chunksize=chunksize), 1):
+                raw_count += len(chunk)
+                cleaned = clean_sales_data(chunk, validation)
+                cube.update(row_filter(cleaned) if row_filter is not None else cleaned)
+                print(f"  청크 {i}: {len(chunk):,}행 처리 (누적 {raw_count:,}행)")
+            info['rows'] = raw_count
+    except FileNotFoundError:
+        print(f"❌ 파일을 찾을 수 없습니다: {file_path}")
+        return None
+
+    validation.finish()
+    print(f"총 데이터 개수: {raw_count:,}개")
+    print(f"{'조건에 맞는' if row_filter is not None else '정리 후'} 데이터 개수: {cube.row_count:,}개")
+    validation.print_summary()
+    print()
+
+    return cube
+
+def load_incremental_cube(file_path, state_dir=STATE_DIR, chunksize=DEFAULT_CHUNK_SIZE, quarantine_path=QUARANTINE_PATH):
+    """
+    저장된 누적 큐브에 마지막 처리 날짜(high-water mark) 이후의 행만 추가 집계
+
+    Args:
+        file_path (str): CSV 파일 경로
+        state_dir (str): 누적 큐브와 상태 파일을 저장할 폴더
+        chunksize (int): 한 번에 읽을 행 수
+        quarantine_path (str): 이번 실행에서 제거된 행을 사유와 함께 저장할 CSV 경로 (None이면 저장 안 함)
+
+    Returns:
+        SalesCube: 전체 기간 누적 집계 큐브 (실패 시 None)
+
+    Note:
+        마지막 처리 날짜와 같은 날짜로 나중에 추가된 행은 반영되지 않으므로,
+        CSV에는 하루치 데이터가 모두 모인 뒤에 추가하는 것을 전제로 합니다.
+    """
+    print("=== 증분 모드로 데이터 로드 중 ===")
+
+    cube_path = os.path.join(state_dir, 'cube.pkl')
+    state_path = os.path.join(state_dir, 'state.json')
+
+    cube = SalesCube()
+    high_water_mark = None
+
+    # 1. 이전 실행의 누적 상태 불러오기 (전처리 규칙이 바뀌었으면 처음부터 다시 집계)
+    if os.path.exists(cube_path) and os.path.exists(state_path):
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('rules_version') == cleaning_rules_key():
+                cube = SalesCube.load(cube_path)
+                high_water_mark = pd.Timestamp(state['high_water_mark'])
+                print(f"📂 누적 상태 로드: {high_water_mark.strftime('%Y-%m-%d')}까지 처리됨 ({cube.row_count:,}건)")
+            else:
+                print("⚠️  전처리 규칙이 변경되어 전체 데이터를 다시 집계합니다.")
+        except Exception as e:
+            print(f"⚠️  누적 상태를 읽을 수 없어 전체 데이터를 다시 집계합니다: {e}")
+            cube = SalesCube()
+            high_water_mark = None
+    else:
+        print("📂 저장된 누적 상태가 없어 전체 데이터를 집계합니다.")
+
+    # 2. 마지막 처리 날짜 이후의 행만 정리하여 큐브에 합산
+    #    (날짜가 없거나 형식이 잘못된 행도 함께 넘겨 검증에서 제거 사유와 함께 격리되도록 함)
+    new_count = 0
+    validation = ValidationReport(quarantine_path)
+    try:
+        with stage('load_clean_aggregate') as info:
+            for chunk in read_sales_csv(file_path, chunksize=chunksize):
+                if high_water_mark is not None:
+                    dates = pd.to_datetime(chunk['Date'], format=DATE_FORMAT, errors='coerce')
+                    chunk = chunk[(dates > high_water_mark) | dates.isna()]
+                    if chunk.empty:
+                        continue
+                chunk = clean_sales_data(chunk, validation)
+                new_count += len(chunk)
+                cube.update(chunk)
+            info['rows'] = new_count
+    except FileNotFoundError:
+        print(f"❌ 파일을 찾을 수 없습니다: {file_path}")
+        return None
+
+    validation.finish()
+    print(f"➕ 새로 반영된 데이터: {new_count:,}건")
+    print(f"📊 누적 데이터 개수: {cube.row_count:,}건")
+    if validation.checked:
+        validation.print_summary()
+
+    # 3. 누적 상태 저장
+    if new_count > 0:
+        try:
+            cube.save(cube_path)
+            state = {
+                'high_water_mark': cube.data['Date'].max().isoformat(),
+                'rules_version': cleaning_rules_key(),
+                'source': os.path.basename(file_path),
+                'updated_at': pd.Timestamp.now().isoformat()
+            }
+            with open(state_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            print(f"💾 누적 상태 저장: {state_dir}")
+        except Exception as e:
+            print(f"⚠️  누적 상태 저장 실패 (다음 실행에서 다시 집계됨): {e}")
+    print()
+
+    return cube
@@ -0,0 +1,294 @@
+"""
+판매 데이터 조회 색인
+정리된 데이터를 날짜순으로 정렬해 두고(날짜 범위 → 이진 탐색으로 행 구간),
+지역/카테고리/영업사원마다 값별 행 번호 목록(역색인)을 만들어 두어
+"9월 셋째 주 North 지역" 같은 좁은 조건의 보고서를 전체 행 비교 없이 바로 뽑아냅니다.
+
+색인은 원본 CSV 해시와 전처리 규칙 버전으로 .cache/sales_index/에 저장되어 재사용됩니다.
+보고서 스크립트는 --start, --end, --region, --category, --salesperson 옵션으로 조건을 받습니다.
+
+사용 예:
+    python word_report_generator.py --start 2025-09-15 --end 2025-09-21 --region North
+    df = load_report_data('cicd_data.csv', {'start': pd.Timestamp('2025-09-15'), 'Region': ['North']})
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+from sales_data_loader import (load_and_clean_data, file_content_hash, read_cached_data, write_cached_data,
+                               normalize_text_values, cleaning_rules_key, TITLE_CASE_COLUMNS, TEXT_ALIASES)
+from sales_cube import match_values
+from pipeline_metrics import stage
+
+# 역색인을 만드는 차원과 보고서에 표시할 이름
+INDEX_DIMENSIONS = {
+    'Region': '지역',
+    'Category': '카테고리',
+    'Salesperson': '영업사원'
+}
+
+# 명령줄 옵션 → 차원
+FILTER_OPTIONS = {
+    'region': 'Region',
+    'category': 'Category',
+    'salesperson': 'Salesperson'
+}
+
+# 색인 저장 폴더
+INDEX_CACHE_DIR = os.path.join('.cache', 'sales_index')
+
+class SalesIndex:
+    """
+    날짜순 정렬 데이터와 차원별 역색인
+
+    역색인은 차원마다 (값 목록, 값 순서로 모은 행 번호, 값별 시작 위치)로 보관하며,
+    값 하나의 행 번호 목록은 오름차순이므로 날짜 구간으로 자르는 것도 이진 탐색으로 처리합니다.
+    """
+
+    def __init__(self, data, postings):
+        self.data = data
+        self._dates = data['Date'].to_numpy()
+        self._postings = postings
+        self._value_positions = {
+            dimension: {value: position for position, value in enumerate(values)}
+            for dimension, (values, _, _) in postings.items()
+        }
+
+    @classmethod
+    def build(cls, df):
+        """정리된 판매 데이터로 색인 생성"""
+        with stage('index_build', rows=len(df)):
+            data = df.sort_values('Date', kind='stable').reset_index(drop=True)
+            postings = {}
+            for dimension in INDEX_DIMENSIONS:
+                column = data[dimension]
+                if not isinstance(column.dtype, pd.CategoricalDtype):
+                    column = column.astype('category')
+                codes = column.cat.codes.to_numpy()
+                # 같은 값끼리 모으되 값 안에서는 행 번호 오름차순 유지 (결측값 -1은 앞쪽에 모여 제외)
+                order = np.argsort(codes, kind='stable')
+                missing = int(np.count_nonzero(codes < 0))
+                counts = np.bincount(codes[codes >= 0], minlength=len(column.cat.categories))
+                offsets = np.concatenate([[0], np.cumsum(counts)])
+                postings[dimension] = (list(column.cat.categories), order[missing:].astype(np.int64), offsets)
+        return cls(data, postings)
+
+    def _posting(self, dimension, value):
+        """값 하나의 행 번호 목록 (없는 값이면 빈 배열)"""
+        _, order, offsets = self._postings[dimension]
+        position = self._value_positions[dimension].get(value)
+        if position is None:
+            return order[:0]
+        return order[offsets[position]:offsets[position + 1]]
+
+    def date_range(self, start=None, end=None):
+        """날짜 범위(양 끝 포함)에 해당하는 정렬 데이터의 행 구간 (시작, 끝)"""
+        low = 0 if start is None else int(np.searchsorted(self._dates, np.datetime64(pd.Timestamp(start)), 'left'))
+        high = len(self._dates) if end is None else int(np.searchsorted(self._dates, np.datetime64(pd.Timestamp(end)), 'right'))
+        return low, max(low, high)
+
+    def lookup(self, filters):
+        """
+        조건에 맞는 행 번호 계산
+
+        Args:
+            filters (dict): 'start', 'end'와 INDEX_DIMENSIONS 차원별 값 목록
+
+        Returns:
+            slice 또는 ndarray: 날짜 조건만 있으면 행 구간, 차원 조건이 있으면 오름차순 행 번호
+        """
+        low, high = self.date_range(filters.get('start'), filters.get('end'))
+        selected = None
+        for dimension in INDEX_DIMENSIONS:
+            values = filters.get(dimension)
+            if not values:
+                continue
+            # 값별 목록을 날짜 구간으로 자른 뒤 합치기 (여러 값이면 합집합, 대소문자 차이는 무시)
+            parts = []
+            for value in match_values(self._value_positions[dimension], values):
+                posting = self._posting(dimension, value)
+                parts.append(posting[np.searchsorted(posting, low):np.searchsorted(posting, high)])
+            rows = parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+            # 차원 사이는 교집합
+            selected = rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+        return slice(low, high) if selected is None else selected
+
+    def select(self, filters):
+        """조건에 맞는 정리된 판매 데이터 (날짜순)"""
+        rows = self.lookup(filters)
+        if isinstance(rows, slice):
+            return self.data.iloc[rows]
+        return self.data.take(rows)
+
+    def save(self, base_path):
+        """색인 저장 (정렬 데이터는 Feather, 역색인은 npz)"""
+        if not write_cached_data(self.data, f"{base_path}.feather"):
+            return False
+        arrays = {}
+        for dimension, (values, order, offsets) in self._postings.items():
+            arrays[f"{dimension}_values"] = np.array(values, dtype=str)
+            arrays[f"{dimension}_order"] = order
+            arrays[f"{dimension}_offsets"] = offsets
+        tmp_path = f"{base_path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, f"{base_path}.npz")
+        return True
+
+    @classmethod
+    def load(cls, base_path):
+        """저장된 색인 불러오기 (없거나 손상되었으면 None)"""
+        if not os.path.exists(f"{base_path}.npz"):
+            return None
+        data = read_cached_data(f"{base_path}.feather")
+        if data is None:
+            return None
+        try:
+            with np.load(f"{base_path}.npz") as arrays:
+                postings = {
+                    dimension: (arrays[f"{dimension}_values"].tolist(), arrays[f"{dimension}_order"],
+                                arrays[f"{dimension}_offsets"])
+                    for dimension in INDEX_DIMENSIONS
+                }
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️  색인을 읽을 수 없어 다시 만듭니다: {e}")
+            return None
+        return cls(data, postings)
+
+def load_sales_index(file_path, cache_dir=INDEX_CACHE_DIR):
+    """
+    CSV에 해당하는 색인 불러오기 (없으면 정리된 데이터로 만들어 저장)
+
+    Args:
+        file_path (str): CSV 파일 경로
+        cache_dir (str): 색인 저장 폴더
+
+    Returns:
+        SalesIndex: 조회 색인 (데이터 로드 실패 시 None)
+    """
+    base_path = None
+    if os.path.exists(file_path):
+        base_path = os.path.join(cache_dir, f"{file_content_hash(file_path)[:32]}_{cleaning_rules_key()}")
+        with stage('index_load'):
+            index = SalesIndex.load(base_path)
+        if index is not None:
+            print(f"⚡ 조회 색인 로드: {base_path} ({len(index.data):,}건)")
+            return index
+
+    df = load_and_clean_data(file_path)
+    if df is None:
+        return None
+    index = SalesIndex.build(df)
+    if base_path is not None and index.save(base_path):
+        print(f"💾 조회 색인 저장: {base_path}")
+    return index
+
+def normalize_filters(filters):
+    """
+    조건의 차원 값을 데이터 정리와 같은 규칙으로 정리 (공백 정리, 대소문자 정리, 별칭 치환)
+
+    Args:
+        filters (dict): 'start', 'end'와 차원별 값 목록
+
+    Returns:
+        dict: 차원 값이 정리된 조건 (예: {'Salesperson': ['sue  kim']} → {'Salesperson': ['Sue Kim']})
+    """
+    if not filters:
+        return filters
+    normalized = dict(filters)
+    for dimension in INDEX_DIMENSIONS:
+        if filters.get(dimension):
+            values = normalize_text_values(pd.Index([str(value) for value in filters[dimension]]),
+                                           dimension in TITLE_CASE_COLUMNS, TEXT_ALIASES.get(dimension))
+            normalized[dimension] = list(dict.fromkeys(values.dropna()))
+    return normalized
+
+def print_no_matching_rows(filters):
+    """데이터는 읽었지만 남은 행이 없을 때 안내 (데이터 로드 실패와 구분)"""
+    if filters:
+        print(f"📭 조건에 맞는 데이터가 없습니다: {describe_filters(filters)}")
+    else:
+        print("📭 정리 후 남은 데이터가 없습니다.")
+
+def describe_filters(filters):
+    """보고서 대상 설명 (예: '기간: 2025-09-15 ~ 2025-09-21 / 지역: North', 조건이 없으면 None)"""
+    if not filters:
+        return None
+    parts = []
+    if filters.get('start') is not None or filters.get('end') is not None:
+        start = filters['start'].strftime('%Y-%m-%d') if filters.get('start') is not None else '처음'
+        end = filters['end'].strftime('%Y-%m-%d') if filters.get('end') is not None else '마지막'
+        parts.append(f"기간: {start} ~ {end}")
+    for dimension, label in INDEX_DIMENSIONS.items():
+        if filters.get(dimension):
+            parts.append(f"{label}: {', '.join(filters[dimension])}")
+    return ' / '.join(parts)
+
+def select_rows(df, filters):
+    """색인 없이 조건으로 행 선택 (저장소에서 이미 줄여 읽은 작은 데이터용)"""
+    if not filters:
+        return df
+    mask = np.ones(len(df), dtype=bool)
+    if filters.get('start') is not None:
+        mask &= (df['Date'] >= filters['start']).to_numpy()
+    if filters.get('end') is not None:
+        mask &= (df['Date'] <= filters['end']).to_numpy()
+    for dimension in INDEX_DIMENSIONS:
+        if filters.get(dimension):
+            values = match_values(df[dimension].dropna().unique(), filters[dimension])
+            mask &= df[dimension].isin(values).to_numpy()
+    return df[mask]
+
+def load_report_data(file_path, filters=None):
+    """
+    보고서용 정리된 데이터 로드 (조건이 있으면 색인으로 해당 행만 선택)
+
+    Args:
+        file_path (str): CSV 파일 경로
+        filters (dict): 'start', 'end'와 차원별 값 목록 (None이면 전체)
+
+    Returns:
+        DataFrame: 정리된 판매 데이터 (실패 시 None)
+    """
+    if not filters:
+        return load_and_clean_data(file_path)
+
+    filters = normalize_filters(filters)
+    index = load_sales_index(file_path)
+    if index is None:
+        return None
+    started = time.perf_counter()
+    with stage('index_lookup') as info:
+        df = index.select(filters)
+        info['rows'] = len(df)
+    print(f"🔍 {describe_filters(filters)}: {len(df):,}건 조회 ({(time.perf_counter() - started) * 1000:.1f}ms)")
+    print()
+    return df
+
+def add_filter_arguments(parser):
+    """보고서 조건 명령줄 인자 추가"""
+    parser.add_argument('--start', help='시작 날짜 (YYYY-MM-DD, 포함)')
+    parser.add_argument('--end', help='종료 날짜 (YYYY-MM-DD, 포함)')
+    parser.add_argument('--region', action='append', help='지역 (여러 번 지정 가능)')
+    parser.add_argument('--category', action='append', help='카테고리 (여러 번 지정 가능)')
+    parser.add_argument('--salesperson', action='append', help='영업사원 (여러 번 지정 가능)')
+
+def filters_from_args(args):
+    """명령줄 인자에서 조건 딕셔너리 추출 (조건이 없으면 빈 딕셔너리)"""
+    filters = {}
+    if args.start:
+        filters['start'] = pd.Timestamp(args.start)
+    if args.end:
+        filters['end'] = pd.Timestamp(args.end)
+    for option, dimension in FILTER_OPTIONS.items():
+        if getattr(args, option):
+            filters[dimension] = getattr(args, option)
+    return normalize_filters(filters)
+
+def parse_report_filters(argv):
+    """스크립트 명령줄에서 조건 옵션만 읽기 (다른 옵션은 무시)"""
+    parser = argparse.ArgumentParser(add_help=False)
+    add_filter_arguments(parser)
+    args, _ = parser.parse_known_args(argv)
+    return filters_from_args(args)
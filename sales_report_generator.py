@@ -1,71 +1,38 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
-import numpy as np
-from matplotlib import font_manager
-from docx import Document
-from docx.shared import Inches, Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml.shared import OxmlElement, qn
-import os
+import sys
+from sales_cube import SalesCube
+from sales_index import load_report_data, parse_report_filters, describe_filters, print_no_matching_rows
 import warnings
 warnings.filterwarnings('ignore')
 
-# matplotlib 백엔드 설정 (GUI 없이 이미지만 생성)
-import matplotlib
-matplotlib.use('Agg')
+# matplotlib, python-docx, openpyxl은 차트/보고서를 만드는 함수 안에서만 가져옴 (분석만 할 때 시작 시간 단축)
 
-# 한글 폰트 설정 (Windows 환경에서 한글 표시를 위함)
-plt.rcParams['font.family'] = 'Malgun Gothic'  # Windows 기본 한글 폰트
-plt.rcParams['axes.unicode_minus'] = False  # 마이너스 기호 표시 오류 해결
+def _pyplot():
+    """matplotlib pyplot 가져오기 (GUI 없는 백엔드와 한글 폰트 설정)"""
+    import matplotlib
+    # matplotlib 백엔드 설정 (GUI 없이 이미지만 생성)
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
 
-def load_and_clean_data(file_path):
-    """데이터 로드 및 전처리"""
-    # CSV 파일 읽기
-    df = pd.read_csv(file_path)
-    
-    print("=== 원본 데이터 정보 ===")
-    print(f"총 데이터 개수: {len(df)}개")
-    print(f"컬럼: {list(df.columns)}")
-    print()
-    
-    # 데이터 정리
-    # 1. 날짜 컬럼 변환
-    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-    
-    # 2. 제품명과 카테고리 대소문자 정리
-    df['ProductName'] = df['ProductName'].str.title()  # 첫 글자만 대문자
-    df['Category'] = df['Category'].str.title()
-    df['Salesperson'] = df['Salesperson'].str.title()
-    
-    # 3. 빈 값이나 잘못된 데이터 제거
-    df = df.dropna(subset=['Date', 'ProductID', 'Quantity', 'UnitPrice'])
-    df = df[df['ProductID'] != 'P0000']  # 잘못된 제품 ID 제거
-    df = df[df['Quantity'] > 0]  # 수량이 0인 데이터 제거
-    df = df[df['UnitPrice'] > 0]  # 단가가 0인 데이터 제거
-    
-    # 4. TotalPrice 재계산 (일부 데이터에 오류가 있을 수 있음)
-    df['TotalPrice'] = df['Quantity'] * df['UnitPrice']
-    
-    print("=== 정리된 데이터 정보 ===")
-    print(f"정리 후 데이터 개수: {len(df)}개")
-    print()
-    
-    return df
+    # 한글 폰트 설정 (Windows 환경에서 한글 표시를 위함)
+    plt.rcParams['font.family'] = 'Malgun Gothic'  # Windows 기본 한글 폰트
+    plt.rcParams['axes.unicode_minus'] = False  # 마이너스 기호 표시 오류 해결
+    return plt
 
-def generate_summary_statistics(df):
+def generate_summary_statistics(cube):
     """요약 통계 생성"""
     print("="*50)
     print("📊 판매 데이터 요약 보고서")
     print("="*50)
     
     # 기본 통계
-    total_sales = df['TotalPrice'].sum()
-    total_quantity = df['Quantity'].sum()
-    avg_order_value = df['TotalPrice'].mean()
-    unique_products = df['ProductID'].nunique()
-    date_range = f"{df['Date'].min().strftime('%Y-%m-%d')} ~ {df['Date'].max().strftime('%Y-%m-%d')}"
+    summary = cube.summary()
+    total_sales = summary['total_sales']
+    total_quantity = summary['total_quantity']
+    avg_order_value = summary['avg_order_value']
+    unique_products = summary['unique_products']
+    date_range = f"{summary['min_date'].strftime('%Y-%m-%d')} ~ {summary['max_date'].strftime('%Y-%m-%d')}"
     
     print(f"📅 분석 기간: {date_range}")
     print(f"💰 총 매출액: {total_sales:,.0f}원")
@@ -74,99 +41,66 @@ def generate_summary_statistics(df):
     print(f"🛍️ 판매된 제품 종류: {unique_products}개")
     print()
 
-def analyze_by_category(df):
+def analyze_by_category(cube):
     """카테고리별 분석"""
     print("="*30)
     print("📊 카테고리별 판매 분석")
     print("="*30)
     
-    category_sales = df.groupby('Category').agg({
-        'TotalPrice': 'sum',
-        'Quantity': 'sum',
-        'ProductID': 'nunique'
-    }).round(2)
-    
-    category_sales.columns = ['총 매출액', '총 수량', '제품 종류 수']
-    category_sales = category_sales.sort_values('총 매출액', ascending=False)
+    category_sales = cube.category_sales()
     
     print(category_sales)
     print()
     
     return category_sales
 
-def analyze_by_product(df):
+def analyze_by_product(cube):
     """제품별 분석"""
     print("="*30)
     print("🏆 베스트셀러 제품 TOP 10")
     print("="*30)
     
-    product_sales = df.groupby(['ProductID', 'ProductName']).agg({
-        'TotalPrice': 'sum',
-        'Quantity': 'sum'
-    }).round(2)
-    
-    product_sales.columns = ['총 매출액', '총 수량']
-    top_products = product_sales.sort_values('총 매출액', ascending=False).head(10)
+    top_products = cube.product_sales(top_n=10)
     
     print(top_products)
     print()
     
     return top_products
 
-def analyze_by_region(df):
+def analyze_by_region(cube):
     """지역별 분석"""
     print("="*30)
     print("🌍 지역별 판매 분석")
     print("="*30)
     
-    region_sales = df.groupby('Region').agg({
-        'TotalPrice': 'sum',
-        'Quantity': 'sum'
-    }).round(2)
-    
-    region_sales.columns = ['총 매출액', '총 수량']
-    region_sales = region_sales.sort_values('총 매출액', ascending=False)
+    region_sales = cube.region_sales()
     
     print(region_sales)
     print()
     
     return region_sales
 
-def analyze_by_salesperson(df):
+def analyze_by_salesperson(cube):
     """영업사원별 분석"""
     print("="*30)
     print("👤 영업사원별 판매 성과")
     print("="*30)
     
-    # 빈 값 제거
-    df_clean = df[df['Salesperson'].notna() & (df['Salesperson'] != '')]
-    
-    salesperson_sales = df_clean.groupby('Salesperson').agg({
-        'TotalPrice': 'sum',
-        'Quantity': 'sum',
-        'Date': 'count'  # 거래 횟수
-    }).round(2)
-    
-    salesperson_sales.columns = ['총 매출액', '총 수량', '거래 횟수']
-    salesperson_sales = salesperson_sales.sort_values('총 매출액', ascending=False)
+    # 빈 값은 제외하고 거래 횟수까지 집계
+    salesperson_sales = cube.salesperson_sales()
     
     print(salesperson_sales)
     print()
     
     return salesperson_sales
 
-def analyze_daily_trends(df):
+def analyze_daily_trends(cube):
     """일별 판매 추이 분석"""
     print("="*30)
     print("📈 일별 판매 추이")
     print("="*30)
     
-    daily_sales = df.groupby('Date').agg({
-        'TotalPrice': 'sum',
-        'Quantity': 'sum'
-    }).round(2)
-    
-    daily_sales.columns = ['일별 매출액', '일별 수량']
+    daily_sales = cube.daily_sales()
     
     # 최고/최저 매출일
     max_sales_day = daily_sales['일별 매출액'].idxmax()
@@ -179,15 +113,14 @@ def analyze_daily_trends(df):
     
     return daily_sales
 
-def create_visualizations(df, category_sales, region_sales, daily_sales):
+def create_visualizations(cube, category_sales, region_sales, daily_sales):
     """데이터 시각화"""
     print("="*30)
     print("📊 차트 생성 중...")
     print("="*30)
     
-    # 한글 폰트 설정 재확인
-    plt.rcParams['font.family'] = 'Malgun Gothic'
-    plt.rcParams['axes.unicode_minus'] = False
+    # pyplot과 한글 폰트 설정
+    plt = _pyplot()
     
     # 2x2 서브플롯 생성
     fig, axes = plt.subplots(2, 2, figsize=(15, 12))
@@ -211,7 +144,7 @@ def create_visualizations(df, category_sales, region_sales, daily_sales):
     axes[1, 0].tick_params(axis='x', rotation=45)
     
     # 4. 제품별 수량 TOP 5 막대차트
-    top5_products = df.groupby('ProductName')['Quantity'].sum().sort_values(ascending=False).head(5)
+    top5_products = cube.rollup('ProductName')['Quantity'].sort_values(ascending=False).head(5)
     axes[1, 1].barh(range(len(top5_products)), top5_products.values)
     axes[1, 1].set_yticks(range(len(top5_products)))
     axes[1, 1].set_yticklabels(top5_products.index)
@@ -223,50 +156,52 @@ def create_visualizations(df, category_sales, region_sales, daily_sales):
     print("차트가 'sales_analysis_dashboard.png' 파일로 저장되었습니다.")
     plt.show()
 
-def generate_excel_report(df, category_sales, region_sales, salesperson_sales, daily_sales):
+def generate_excel_report(df, cube, category_sales, region_sales, salesperson_sales, daily_sales):
     """Excel 보고서 생성"""
     print("="*30)
     print("📝 Excel 보고서 생성 중...")
     print("="*30)
     
-    with pd.ExcelWriter('sales_analysis_report.xlsx', engine='openpyxl') as writer:
-        # 원본 데이터 (정리된 버전)
-        df.to_excel(writer, sheet_name='원본데이터', index=False)
-        
-        # 요약 통계
-        summary_data = {
-            '구분': ['총 매출액', '총 판매수량', '평균 주문금액', '제품 종류 수', '분석 기간'],
-            '값': [
-                f"{df['TotalPrice'].sum():,.0f}원",
-                f"{df['Quantity'].sum():,}개",
-                f"{df['TotalPrice'].mean():,.0f}원",
-                f"{df['ProductID'].nunique()}개",
-                f"{df['Date'].min().strftime('%Y-%m-%d')} ~ {df['Date'].max().strftime('%Y-%m-%d')}"
-            ]
-        }
-        pd.DataFrame(summary_data).to_excel(writer, sheet_name='요약통계', index=False)
-        
-        # 각 분석 결과를 별도 시트에 저장
-        category_sales.to_excel(writer, sheet_name='카테고리별분석')
-        region_sales.to_excel(writer, sheet_name='지역별분석')
-        salesperson_sales.to_excel(writer, sheet_name='영업사원별분석')
-        daily_sales.to_excel(writer, sheet_name='일별추이')
-        
-        # 베스트셀러 제품
-        top_products = df.groupby(['ProductID', 'ProductName']).agg({
-            'TotalPrice': 'sum',
-            'Quantity': 'sum'
-        }).sort_values('TotalPrice', ascending=False).head(10)
-        top_products.to_excel(writer, sheet_name='베스트셀러제품')
+    from excel_writer import write_excel_report
+    
+    # 요약 통계
+    summary = cube.summary()
+    summary_data = {
+        '구분': ['총 매출액', '총 판매수량', '평균 주문금액', '제품 종류 수', '분석 기간'],
+        '값': [
+            f"{summary['total_sales']:,.0f}원",
+            f"{summary['total_quantity']:,}개",
+            f"{summary['avg_order_value']:,.0f}원",
+            f"{summary['unique_products']}개",
+            f"{summary['min_date'].strftime('%Y-%m-%d')} ~ {summary['max_date'].strftime('%Y-%m-%d')}"
+        ]
+    }
+    
+    # 베스트셀러 제품
+    top_products = cube.product_sales(top_n=10)
+    
+    # 원본 데이터(정리된 버전)와 각 분석 결과를 별도 시트에 행 단위로 기록
+    write_excel_report('sales_analysis_report.xlsx', [
+        ('요약통계', pd.DataFrame(summary_data), False),
+        ('카테고리별분석', category_sales, True),
+        ('지역별분석', region_sales, True),
+        ('영업사원별분석', salesperson_sales, True),
+        ('일별추이', daily_sales, True),
+        ('베스트셀러제품', top_products, True)
+    ], raw_data=df)
     
     print("Excel 보고서가 'sales_analysis_report.xlsx' 파일로 저장되었습니다.")
 
-def generate_word_report(df, category_sales, region_sales, salesperson_sales, daily_sales):
-    """워드 파일(.docx) 보고서 생성"""
+def generate_word_report(cube, category_sales, region_sales, salesperson_sales, daily_sales, scope=None):
+    """워드 파일(.docx) 보고서 생성 (scope는 보고서 대상 설명)"""
     print("="*30)
     print("📄 Word 보고서 생성 중...")
     print("="*30)
     
+    from docx import Document
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx_tables import add_dataframe_table, format_numbers, format_dates
+    
     try:
         # 새 문서 생성
         doc = Document()
@@ -277,25 +212,20 @@ def generate_word_report(df, category_sales, region_sales, salesperson_sales, da
         
         # 생성 일자 추가
         doc.add_paragraph(f"보고서 생성일: {datetime.now().strftime('%Y년 %m월 %d일')}")
+        if scope:
+            doc.add_paragraph(f"보고서 대상: {scope}")
         doc.add_paragraph("")  # 빈 줄
         
         # === 1. 요약 통계 ===
         doc.add_heading('📊 요약 통계', level=1)
         
-        # 요약 통계 표 생성
-        summary_table = doc.add_table(rows=6, cols=2)
-        summary_table.style = 'Table Grid'
-        
-        # 표 헤더
-        summary_table.cell(0, 0).text = '구분'
-        summary_table.cell(0, 1).text = '값'
-        
         # 요약 데이터
-        total_sales = df['TotalPrice'].sum()
-        total_quantity = df['Quantity'].sum()
-        avg_order_value = df['TotalPrice'].mean()
-        unique_products = df['ProductID'].nunique()
-        date_range = f"{df['Date'].min().strftime('%Y-%m-%d')} ~ {df['Date'].max().strftime('%Y-%m-%d')}"
+        summary = cube.summary()
+        total_sales = summary['total_sales']
+        total_quantity = summary['total_quantity']
+        avg_order_value = summary['avg_order_value']
+        unique_products = summary['unique_products']
+        date_range = f"{summary['min_date'].strftime('%Y-%m-%d')} ~ {summary['max_date'].strftime('%Y-%m-%d')}"
         
         summary_data = [
             ['분석 기간', date_range],
@@ -305,9 +235,8 @@ def generate_word_report(df, category_sales, region_sales, salesperson_sales, da
             ['판매된 제품 종류', f"{unique_products}개"]
         ]
         
-        for i, (category, value) in enumerate(summary_data, 1):
-            summary_table.cell(i, 0).text = category
-            summary_table.cell(i, 1).text = value
+        # 요약 통계 표 생성
+        add_dataframe_table(doc, pd.DataFrame(summary_data, columns=['구분', '값']))
         
         doc.add_paragraph("")  # 빈 줄
         
@@ -315,20 +244,12 @@ def generate_word_report(df, category_sales, region_sales, salesperson_sales, da
         doc.add_heading('📊 카테고리별 판매 분석', level=1)
         
         # 카테고리별 분석 표
-        cat_table = doc.add_table(rows=len(category_sales)+1, cols=4)
-        cat_table.style = 'Table Grid'
-        
-        # 표 헤더
-        cat_headers = ['카테고리', '총 매출액 (원)', '총 수량 (개)', '제품 종류 수']
-        for i, header in enumerate(cat_headers):
-            cat_table.cell(0, i).text = header
-        
-        # 카테고리 데이터
-        for i, (category, row) in enumerate(category_sales.iterrows(), 1):
-            cat_table.cell(i, 0).text = category
-            cat_table.cell(i, 1).text = f"{row['총 매출액']:,.0f}"
-            cat_table.cell(i, 2).text = f"{row['총 수량']:,.0f}"
-            cat_table.cell(i, 3).text = str(row['제품 종류 수'])
+        add_dataframe_table(doc, pd.DataFrame({
+            '카테고리': category_sales.index,
+            '총 매출액 (원)': format_numbers(category_sales['총 매출액']),
+            '총 수량 (개)': format_numbers(category_sales['총 수량']),
+            '제품 종류 수': category_sales['제품 종류 수'].astype('float64')
+        }))
         
         doc.add_paragraph("")  # 빈 줄
         
@@ -336,19 +257,11 @@ def generate_word_report(df, category_sales, region_sales, salesperson_sales, da
         doc.add_heading('🌍 지역별 판매 분석', level=1)
         
         # 지역별 분석 표
-        region_table = doc.add_table(rows=len(region_sales)+1, cols=3)
-        region_table.style = 'Table Grid'
-        
-        # 표 헤더
-        region_headers = ['지역', '총 매출액 (원)', '총 수량 (개)']
-        for i, header in enumerate(region_headers):
-            region_table.cell(0, i).text = header
-        
-        # 지역 데이터
-        for i, (region, row) in enumerate(region_sales.iterrows(), 1):
-            region_table.cell(i, 0).text = region
-            region_table.cell(i, 1).text = f"{row['총 매출액']:,.0f}"
-            region_table.cell(i, 2).text = f"{row['총 수량']:,.0f}"
+        add_dataframe_table(doc, pd.DataFrame({
+            '지역': region_sales.index,
+            '총 매출액 (원)': format_numbers(region_sales['총 매출액']),
+            '총 수량 (개)': format_numbers(region_sales['총 수량'])
+        }))
         
         doc.add_paragraph("")  # 빈 줄
         
@@ -356,55 +269,28 @@ def generate_word_report(df, category_sales, region_sales, salesperson_sales, da
         doc.add_heading('🏆 베스트셀러 제품 TOP 10', level=1)
         
         # 베스트셀러 제품 데이터
-        top_products = df.groupby(['ProductID', 'ProductName']).agg({
-            'TotalPrice': 'sum',
-            'Quantity': 'sum'
-        }).sort_values('TotalPrice', ascending=False).head(10)
+        top_products = cube.product_sales(top_n=10)
         
         # 베스트셀러 표
-        product_table = doc.add_table(rows=len(top_products)+1, cols=4)
-        product_table.style = 'Table Grid'
-        
-        # 표 헤더
-        product_headers = ['순위', '제품명', '총 매출액 (원)', '총 수량 (개)']
-        for i, header in enumerate(product_headers):
-            product_table.cell(0, i).text = header
-        
-        # 제품 데이터
-        for i, ((product_id, product_name), row) in enumerate(top_products.iterrows(), 1):
-            product_table.cell(i, 0).text = str(i)
-            product_table.cell(i, 1).text = product_name
-            product_table.cell(i, 2).text = f"{row['TotalPrice']:,.0f}"
-            product_table.cell(i, 3).text = f"{row['Quantity']:,.0f}"
+        add_dataframe_table(doc, pd.DataFrame({
+            '순위': range(1, len(top_products) + 1),
+            '제품명': top_products.index.get_level_values('ProductName'),
+            '총 매출액 (원)': format_numbers(top_products['총 매출액']),
+            '총 수량 (개)': format_numbers(top_products['총 수량'])
+        }))
         
         doc.add_paragraph("")  # 빈 줄
         
         # === 5. 영업사원별 분석 ===
         doc.add_heading('👤 영업사원별 판매 성과', level=1)
         
-        # 빈 값 제거
-        df_clean = df[df['Salesperson'].notna() & (df['Salesperson'] != '')]
-        salesperson_data = df_clean.groupby('Salesperson').agg({
-            'TotalPrice': 'sum',
-            'Quantity': 'sum',
-            'Date': 'count'
-        }).sort_values('TotalPrice', ascending=False)
-        
         # 영업사원 분석 표
-        sales_table = doc.add_table(rows=len(salesperson_data)+1, cols=4)
-        sales_table.style = 'Table Grid'
-        
-        # 표 헤더
-        sales_headers = ['영업사원', '총 매출액 (원)', '총 수량 (개)', '거래 횟수']
-        for i, header in enumerate(sales_headers):
-            sales_table.cell(0, i).text = header
-        
-        # 영업사원 데이터
-        for i, (salesperson, row) in enumerate(salesperson_data.iterrows(), 1):
-            sales_table.cell(i, 0).text = salesperson
-            sales_table.cell(i, 1).text = f"{row['TotalPrice']:,.0f}"
-            sales_table.cell(i, 2).text = f"{row['Quantity']:,.0f}"
-            sales_table.cell(i, 3).text = str(row['Date'])
+        add_dataframe_table(doc, pd.DataFrame({
+            '영업사원': salesperson_sales.index,
+            '총 매출액 (원)': format_numbers(salesperson_sales['총 매출액']),
+            '총 수량 (개)': format_numbers(salesperson_sales['총 수량']),
+            '거래 횟수': format_numbers(salesperson_sales['거래 횟수'])
+        }))
         
         doc.add_paragraph("")  # 빈 줄
         
@@ -427,19 +313,11 @@ def generate_word_report(df, category_sales, region_sales, salesperson_sales, da
         
         top10_days = daily_sales.sort_values('일별 매출액', ascending=False).head(10)
         
-        daily_table = doc.add_table(rows=len(top10_days)+1, cols=3)
-        daily_table.style = 'Table Grid'
-        
-        # 표 헤더
-        daily_headers = ['순위', '날짜', '매출액 (원)']
-        for i, header in enumerate(daily_headers):
-            daily_table.cell(0, i).text = header
-        
-        # 일별 데이터
-        for i, (date, row) in enumerate(top10_days.iterrows(), 1):
-            daily_table.cell(i, 0).text = str(i)
-            daily_table.cell(i, 1).text = date.strftime('%Y-%m-%d')
-            daily_table.cell(i, 2).text = f"{row['일별 매출액']:,.0f}"
+        add_dataframe_table(doc, pd.DataFrame({
+            '순위': range(1, len(top10_days) + 1),
+            '날짜': format_dates(top10_days.index),
+            '매출액 (원)': format_numbers(top10_days['일별 매출액'])
+        }))
         
         # 문서 저장
         doc.save('sales_analysis_report.docx')
@@ -449,29 +327,40 @@ def generate_word_report(df, category_sales, region_sales, salesperson_sales, da
         print(f"❌ Word 파일 생성 중 오류 발생: {e}")
         print("python-docx 라이브러리가 제대로 설치되었는지 확인해주세요.")
 
-def main():
-    """메인 함수"""
+def main(filters=None):
+    """메인 함수 (filters: 기간과 지역/카테고리/영업사원 조건, None이면 전체)"""
     print("🚀 판매 데이터 분석을 시작합니다...\n")
+    if filters:
+        print(f"🔍 보고서 대상: {describe_filters(filters)}\n")
+    
+    # 데이터 로드 및 전처리 (조건이 있으면 색인으로 해당 행만 선택)
+    df = load_report_data('cicd_data.csv', filters)
+    if df is None:
+        print("❌ 데이터 로드에 실패했습니다.")
+        return
+    if df.empty:
+        print_no_matching_rows(filters)
+        return
     
-    # 데이터 로드 및 전처리
-    df = load_and_clean_data('cicd_data.csv')
+    # 집계 큐브 생성 (모든 분석, 차트, 표는 이 결과를 다시 묶어서 사용)
+    cube = SalesCube.from_dataframe(df)
     
     # 각종 분석 수행
-    generate_summary_statistics(df)
-    category_sales = analyze_by_category(df)
-    analyze_by_product(df)
-    region_sales = analyze_by_region(df)
-    salesperson_sales = analyze_by_salesperson(df)
-    daily_sales = analyze_daily_trends(df)
+    generate_summary_statistics(cube)
+    category_sales = analyze_by_category(cube)
+    analyze_by_product(cube)
+    region_sales = analyze_by_region(cube)
+    salesperson_sales = analyze_by_salesperson(cube)
+    daily_sales = analyze_daily_trends(cube)
     
     # 시각화 생성
-    create_visualizations(df, category_sales, region_sales, daily_sales)
+    create_visualizations(cube, category_sales, region_sales, daily_sales)
     
     # Excel 보고서 생성
-    generate_excel_report(df, category_sales, region_sales, salesperson_sales, daily_sales)
+    generate_excel_report(df, cube, category_sales, region_sales, salesperson_sales, daily_sales)
     
     # Word 보고서 생성
-    generate_word_report(df, category_sales, region_sales, salesperson_sales, daily_sales)
+    generate_word_report(cube, category_sales, region_sales, salesperson_sales, daily_sales, scope=describe_filters(filters))
     
     print("\n" + "="*50)
     print("✅ 분석이 완료되었습니다!")
@@ -482,4 +371,4 @@ def main():
     print("="*50)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(filters=parse_report_filters(sys.argv[1:]))
\ No newline at end of file
@@ -0,0 +1,352 @@
+"""
+SQL 분석 백엔드
+정리된 판매 데이터를 로컬 내장 데이터베이스(DuckDB가 있으면 DuckDB, 없으면 SQLite)에 청크 단위로 적재하고,
+요약/카테고리/제품/지역/영업사원/일별 분석을 SQL로 실행합니다.
+SqlSalesCube는 SalesCube와 같은 함수와 같은 모양의 DataFrame을 반환하므로 Word/Excel 보고서 코드에 그대로 넘길 수 있으며,
+데이터 전체를 메모리에 올리지 않아 메모리보다 큰 데이터도 처리할 수 있습니다.
+
+사용 예:
+    cube = open_sales_cube('cicd_data.csv', backend='sql')    # DuckDB가 없으면 SQLite 사용
+    cube.filter(Region='North').category_sales()
+"""
+
+import os
+import sqlite3
+import pandas as pd
+from sales_cube import CUBE_DIMENSIONS, SalesCube
+from sales_data_loader import (read_sales_csv, clean_sales_data, load_and_clean_data, file_content_hash,
+                               ValidationReport, DATE_FORMAT, DEFAULT_CHUNK_SIZE, cleaning_rules_key,
+                               QUARANTINE_PATH, _write_cached_validation, _print_cached_validation)
+from pipeline_metrics import stage, instrumented
+
+# DuckDB가 설치된 경우에만 사용 (없으면 표준 라이브러리 SQLite로 대체)
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# 지원하는 분석 백엔드 ('sql'은 사용 가능한 SQL 엔진 자동 선택)
+ANALYTICS_BACKENDS = ['pandas', 'sql', 'duckdb', 'sqlite']
+
+# 적재한 데이터베이스 저장 폴더 (원본 파일 해시와 전처리 규칙 버전으로 구분)
+SQL_CACHE_DIR = os.path.join('.cache', 'sales_db')
+
+# 판매 테이블 스키마 (날짜는 두 엔진에서 같게 비교되도록 'YYYY-MM-DD' 문자열로 저장)
+SALES_TABLE_COLUMNS = {
+    'Date': 'VARCHAR',
+    'ProductID': 'VARCHAR',
+    'ProductName': 'VARCHAR',
+    'Category': 'VARCHAR',
+    'Quantity': 'INTEGER',
+    'UnitPrice': 'DOUBLE',
+    'TotalPrice': 'DOUBLE',
+    'Region': 'VARCHAR',
+    'Salesperson': 'VARCHAR'
+}
+
+def default_sql_engine():
+    """사용 가능한 SQL 엔진 이름 (DuckDB 우선)"""
+    return 'duckdb' if duckdb is not None else 'sqlite'
+
+def _connect(db_path, engine):
+    """데이터베이스 연결 (SQLite는 보고서 서버의 다른 스레드에서도 쓸 수 있도록 스레드 검사 해제)"""
+    if engine == 'duckdb':
+        return duckdb.connect(db_path)
+    return sqlite3.connect(db_path, check_same_thread=False)
+
+def _to_table_rows(chunk):
+    """정리된 청크를 테이블 스키마에 맞게 변환 (category → 문자열, 날짜 → 'YYYY-MM-DD')"""
+    chunk = chunk.astype({column: object for column in chunk.select_dtypes('category').columns})
+    chunk['Date'] = chunk['Date'].dt.strftime(DATE_FORMAT)
+    return chunk[list(SALES_TABLE_COLUMNS)]
+
+def build_sales_database(file_path, db_path, engine, chunksize=DEFAULT_CHUNK_SIZE, quarantine_path=QUARANTINE_PATH):
+    """
+    CSV를 청크 단위로 읽고 정리하여 데이터베이스 sales 테이블에 적재
+
+    Args:
+        file_path (str): CSV 파일 경로
+        db_path (str): 만들 데이터베이스 파일 경로
+        engine (str): 'duckdb' 또는 'sqlite'
+        chunksize (int): 한 번에 읽을 행 수
+        quarantine_path (str): 제거된 행을 사유와 함께 저장할 CSV 경로 (None이면 저장 안 함)
+
+    Returns:
+        int: 적재한 행 수
+    """
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    # 다른 프로세스가 만들다 만 데이터베이스를 열지 않도록 임시 파일에 만든 뒤 교체
+    tmp_path = f"{db_path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    validation = ValidationReport(quarantine_path)
+    loaded = 0
+    conn = _connect(tmp_path, engine)
+    try:
+        columns = ', '.join(f"{name} {sql_type}" for name, sql_type in SALES_TABLE_COLUMNS.items())
+        conn.execute(f"CREATE TABLE sales ({columns})")
+        for chunk in read_sales_csv(file_path, chunksize=chunksize):
+            rows = _to_table_rows(clean_sales_data(chunk, validation))
+            if engine == 'duckdb':
+                conn.register('chunk_rows', rows)
+                conn.execute("INSERT INTO sales SELECT * FROM chunk_rows")
+                conn.unregister('chunk_rows')
+            else:
+                rows.to_sql('sales', conn, if_exists='append', index=False)
+            loaded += len(rows)
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+
+    validation.finish()
+    validation.print_summary()
+    _write_cached_validation(db_path, validation)
+    return loaded
+
+class SqlSalesCube:
+    """
+    SQL 데이터베이스의 sales 테이블을 대상으로 SalesCube와 같은 분석 결과를 만드는 큐브
+
+    filter()는 조건만 추가한 새 큐브를 반환하며(같은 연결 공유), 모든 분석은 조건이 붙은 SQL로 실행됩니다.
+    """
+
+    def __init__(self, conn, engine, conditions=None):
+        self._conn = conn
+        self.engine = engine
+        self._conditions = conditions or []
+
+    @classmethod
+    def open(cls, file_path, engine=None, db_dir=SQL_CACHE_DIR, chunksize=DEFAULT_CHUNK_SIZE,
+             quarantine_path=QUARANTINE_PATH):
+        """
+        CSV에 해당하는 데이터베이스를 열기 (없으면 적재)
+
+        Args:
+            file_path (str): CSV 파일 경로
+            engine (str): 'duckdb' 또는 'sqlite' (None이면 자동 선택)
+            db_dir (str): 데이터베이스 저장 폴더
+            chunksize (int): 적재할 때 한 번에 읽을 행 수
+            quarantine_path (str): 제거된 행을 사유와 함께 저장할 CSV 경로
+
+        Returns:
+            SqlSalesCube: 전체 데이터 큐브
+        """
+        engine = engine or default_sql_engine()
+        if engine == 'duckdb' and duckdb is None:
+            raise RuntimeError("duckdb가 설치되어 있지 않습니다. (pip install duckdb)")
+
+        source_hash = file_content_hash(file_path)
+        extension = 'duckdb' if engine == 'duckdb' else 'sqlite'
+        db_path = os.path.join(db_dir, f"{source_hash[:32]}_{cleaning_rules_key()}.{extension}")
+
+        if os.path.exists(db_path):
+            print(f"⚡ 적재된 데이터베이스 사용: {db_path}")
+            _print_cached_validation(db_path)
+        else:
+            print(f"=== {engine} 데이터베이스에 적재 중 (청크 크기: {chunksize:,}행) ===")
+            with stage('sql_load') as info:
+                info['rows'] = build_sales_database(file_path, db_path, engine, chunksize, quarantine_path)
+            print(f"💾 데이터베이스 저장: {db_path} ({info['rows']:,}건)")
+        print()
+        return cls(_connect(db_path, engine), engine)
+
+    def _where(self, not_null=()):
+        """조건과 결측 제외 조건으로 WHERE 절과 매개변수 생성"""
+        clauses = [clause for clause, _ in self._conditions]
+        params = [value for _, values in self._conditions for value in values]
+        clauses += [f"{column} IS NOT NULL" for column in not_null]
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ''), params
+
+    def _read(self, sql, params=()):
+        """쿼리 결과를 DataFrame으로 반환"""
+        if self.engine == 'duckdb':
+            return self._conn.execute(sql, list(params)).df()
+        return pd.read_sql_query(sql, self._conn, params=list(params))
+
+    @staticmethod
+    def _column(name):
+        """SQL에 넣을 차원 이름 확인 (큐브 차원만 허용)"""
+        if name not in CUBE_DIMENSIONS:
+            raise ValueError(f"지원하지 않는 차원: {name}")
+        return name
+
+    def _grouped(self, dimensions, measures, order_by=None, limit=None, extra_where=None):
+        """차원별 집계 쿼리 실행 (결측 차원 값은 제외, 날짜 차원은 Timestamp로 변환)"""
+        dimensions = [self._column(name) for name in dimensions]
+        where, params = self._where(not_null=dimensions)
+        if extra_where:
+            where += (' AND ' if where else ' WHERE ') + extra_where
+        select = ', '.join(dimensions + [f"{expression} AS {alias}" for alias, expression in measures.items()])
+        sql = f"SELECT {select} FROM sales{where} GROUP BY {', '.join(dimensions)}"
+        sql += f" ORDER BY {order_by or ', '.join(dimensions)}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        result = self._read(sql, params)
+        if 'Date' in dimensions:
+            result['Date'] = pd.to_datetime(result['Date'], format=DATE_FORMAT)
+        return result.set_index(dimensions)
+
+    def filter(self, **conditions):
+        """차원 값과 날짜 범위(start, end 포함)로 일부만 선택한 큐브 (예: cube.filter(Region='North', start='2025-09-01'))"""
+        added = []
+        for column, value in conditions.items():
+            if column in ('start', 'end'):
+                operator = '>=' if column == 'start' else '<='
+                added.append((f"Date {operator} ?", [pd.Timestamp(value).strftime(DATE_FORMAT)]))
+                continue
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            placeholders = ', '.join('?' * len(values))
+            if column == 'Date':
+                values = [v.strftime(DATE_FORMAT) if hasattr(v, 'strftime') else v for v in values]
+                added.append((f"Date IN ({placeholders})", values))
+            else:
+                # 문자열 차원은 대소문자 차이를 무시 (SalesCube.filter와 같은 결과)
+                values = [' '.join(str(v).split()).lower() for v in values]
+                added.append((f"LOWER({self._column(column)}) IN ({placeholders})", values))
+        return SqlSalesCube(self._conn, self.engine, self._conditions + added)
+
+    def iter_rows(self, chunksize=DEFAULT_CHUNK_SIZE):
+        """정리된 원본 행을 청크 단위로 반환 (Excel 원본데이터 시트용)"""
+        where, params = self._where()
+        sql = f"SELECT * FROM sales{where} ORDER BY rowid" if self.engine == 'sqlite' else f"SELECT * FROM sales{where}"
+        if self.engine == 'duckdb':
+            reader = self._conn.execute(sql, list(params))
+            while True:
+                chunk = reader.fetch_df_chunk(max(1, chunksize // 2048))
+                if chunk.empty:
+                    break
+                chunk['Date'] = pd.to_datetime(chunk['Date'], format=DATE_FORMAT)
+                yield chunk
+        else:
+            for chunk in pd.read_sql_query(sql, self._conn, params=list(params), chunksize=chunksize):
+                chunk['Date'] = pd.to_datetime(chunk['Date'], format=DATE_FORMAT)
+                yield chunk
+
+    @property
+    def row_count(self):
+        """조건에 해당하는 원본 거래 건수"""
+        where, params = self._where()
+        return int(self._read(f"SELECT COUNT(*) AS n FROM sales{where}", params)['n'].iloc[0])
+
+    @property
+    def empty(self):
+        return self.row_count == 0
+
+    def rollup(self, dimensions):
+        """지정한 차원으로 묶은 합계 (SalesCube.rollup과 같은 측정값 컬럼)"""
+        dimensions = [dimensions] if isinstance(dimensions, str) else list(dimensions)
+        return self._grouped(dimensions, {
+            'TotalPrice': 'SUM(TotalPrice)',
+            'Quantity': 'CAST(SUM(Quantity) AS BIGINT)',
+            'OrderCount': 'COUNT(*)'
+        })
+
+    @instrumented('rollup:sales_by', rows=len)
+    def sales_by(self, dimension):
+        """차원별 매출액 Series (매출액 내림차순, 차트용)"""
+        return self._grouped([dimension], {'TotalPrice': 'SUM(TotalPrice)'}, order_by='TotalPrice DESC')['TotalPrice']
+
+    @instrumented('rollup:daily_totals', rows=len)
+    def daily_totals(self):
+        """일별 매출액 Series (날짜순, 차트용)"""
+        return self._grouped(['Date'], {'TotalPrice': 'SUM(TotalPrice)'})['TotalPrice']
+
+    @instrumented('rollup:summary')
+    def summary(self):
+        """요약 통계 딕셔너리 반환"""
+        where, params = self._where()
+        row = self._read(
+            "SELECT COUNT(*) AS row_count, SUM(TotalPrice) AS total_sales, "
+            "CAST(SUM(Quantity) AS BIGINT) AS total_quantity, COUNT(DISTINCT ProductID) AS unique_products, "
+            f"MIN(Date) AS min_date, MAX(Date) AS max_date FROM sales{where}", params
+        ).iloc[0]
+        row_count = int(row['row_count'])
+        total_sales = float(row['total_sales']) if row_count else 0.0
+        return {
+            'row_count': row_count,
+            'total_sales': total_sales,
+            'total_quantity': int(row['total_quantity']) if row_count else 0,
+            'avg_order_value': total_sales / row_count if row_count else 0.0,
+            'unique_products': int(row['unique_products']),
+            'min_date': pd.to_datetime(row['min_date'], format=DATE_FORMAT),
+            'max_date': pd.to_datetime(row['max_date'], format=DATE_FORMAT)
+        }
+
+    @instrumented('rollup:category_sales', rows=len)
+    def category_sales(self):
+        """카테고리별 분석 (총 매출액, 총 수량, 제품 종류 수)"""
+        category_sales = self._grouped(['Category'], {
+            'TotalPrice': 'SUM(TotalPrice)',
+            'Quantity': 'CAST(SUM(Quantity) AS BIGINT)',
+            'Products': 'COUNT(DISTINCT ProductID)'
+        }, order_by='TotalPrice DESC').round(2)
+        category_sales.columns = ['총 매출액', '총 수량', '제품 종류 수']
+        return category_sales
+
+    @instrumented('rollup:product_sales', rows=len)
+    def product_sales(self, top_n=10):
+        """제품별 분석 (매출액 상위 top_n개, None이면 전체)"""
+        product_sales = self._grouped(['ProductID', 'ProductName'], {
+            'TotalPrice': 'SUM(TotalPrice)',
+            'Quantity': 'CAST(SUM(Quantity) AS BIGINT)'
+        }, order_by='TotalPrice DESC', limit=top_n).round(2)
+        product_sales.columns = ['총 매출액', '총 수량']
+        return product_sales
+
+    @instrumented('rollup:region_sales', rows=len)
+    def region_sales(self):
+        """지역별 분석 (총 매출액, 총 수량)"""
+        region_sales = self._grouped(['Region'], {
+            'TotalPrice': 'SUM(TotalPrice)',
+            'Quantity': 'CAST(SUM(Quantity) AS BIGINT)'
+        }, order_by='TotalPrice DESC').round(2)
+        region_sales.columns = ['총 매출액', '총 수량']
+        return region_sales
+
+    @instrumented('rollup:salesperson_sales', rows=len)
+    def salesperson_sales(self):
+        """영업사원별 분석 (총 매출액, 총 수량, 거래 횟수 - 빈 값 제외)"""
+        salesperson_sales = self._grouped(['Salesperson'], {
+            'TotalPrice': 'SUM(TotalPrice)',
+            'Quantity': 'CAST(SUM(Quantity) AS BIGINT)',
+            'OrderCount': 'COUNT(*)'
+        }, order_by='TotalPrice DESC', extra_where="Salesperson <> ''").round(2)
+        salesperson_sales.columns = ['총 매출액', '총 수량', '거래 횟수']
+        return salesperson_sales
+
+    @instrumented('rollup:daily_sales', rows=len)
+    def daily_sales(self):
+        """일별 분석 (일별 매출액, 일별 수량)"""
+        daily_sales = self._grouped(['Date'], {
+            'TotalPrice': 'SUM(TotalPrice)',
+            'Quantity': 'CAST(SUM(Quantity) AS BIGINT)'
+        }).round(2)
+        daily_sales.columns = ['일별 매출액', '일별 수량']
+        return daily_sales
+
+def open_sales_cube(file_path, backend='pandas', chunksize=DEFAULT_CHUNK_SIZE):
+    """
+    분석 백엔드에 맞는 큐브 열기
+
+    Args:
+        file_path (str): CSV 파일 경로
+        backend (str): 'pandas'(메모리 집계 큐브), 'sql'(자동 선택), 'duckdb', 'sqlite'
+        chunksize (int): SQL 백엔드로 적재할 때 한 번에 읽을 행 수
+
+    Returns:
+        SalesCube 또는 SqlSalesCube: 분석 큐브 (실패 시 None)
+    """
+    if backend == 'pandas':
+        df = load_and_clean_data(file_path)
+        return SalesCube.from_dataframe(df) if df is not None else None
+
+    try:
+        return SqlSalesCube.open(file_path, None if backend == 'sql' else backend, chunksize=chunksize)
+    except FileNotFoundError:
+        print(f"❌ 파일을 찾을 수 없습니다: {file_path}")
+        return None
+    except Exception as e:
+        print(f"❌ 데이터베이스 준비 중 오류 발생: {e}")
+        return None
@@ -0,0 +1,246 @@
+"""
+월/지역별 분할 판매 데이터 저장소
+새로 받은 CSV 파일을 정리한 뒤 Month=YYYY-MM/Region=지역 폴더로 나눈 Parquet 데이터셋에 추가하고,
+읽을 때는 날짜 범위와 지역 조건에 맞는 폴더(파티션)만 읽습니다(predicate pushdown).
+"지난주 보고서"나 "North 지역 보고서"는 전체 기간 파일을 훑지 않고 해당 월/지역 파일만 읽습니다.
+
+같은 CSV 파일을 다시 추가하면 내용 해시로 확인하여 건너뛰므로 중복 저장되지 않습니다.
+
+사용 예:
+    python sales_store.py append cicd_data.csv           # sales_store/에 추가
+    python sales_store.py info                           # 파티션과 추가된 파일 목록
+    df = read_sales_store(start='2025-09-22', end='2025-09-28', regions=['North'])
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from sales_data_loader import (read_sales_csv, clean_sales_data, file_content_hash, ValidationReport,
+                               SALES_DTYPES, DEFAULT_CHUNK_SIZE, cleaning_rules_key, QUARANTINE_PATH)
+from sales_cube import match_values
+from pipeline_metrics import stage
+
+# 저장소 기본 폴더
+SALES_STORE_DIR = 'sales_store'
+
+# 추가된 CSV 파일 기록 (이름이 '_'로 시작하므로 데이터셋 파일로 읽히지 않음)
+STORE_MANIFEST = '_manifest.json'
+
+# 파티션 컬럼 (폴더 이름은 Month=2025-09/Region=North 형식)
+PARTITION_SCHEMA = pa.schema([('Month', pa.string()), ('Region', pa.string())])
+
+# 파티션 월 형식
+MONTH_FORMAT = '%Y-%m'
+
+# 읽은 뒤 보고서 코드가 기대하는 컬럼 순서
+STORE_COLUMNS = ['Date', 'ProductID', 'ProductName', 'Category', 'Quantity', 'UnitPrice', 'TotalPrice', 'Region', 'Salesperson']
+
+def _manifest_path(store_dir):
+    return os.path.join(store_dir, STORE_MANIFEST)
+
+def read_manifest(store_dir=SALES_STORE_DIR):
+    """저장소에 추가된 CSV 파일 기록 (저장소가 없으면 빈 기록)"""
+    try:
+        with open(_manifest_path(store_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'rules_version': cleaning_rules_key(), 'sources': []}
+
+def _write_manifest(store_dir, manifest):
+    """추가 기록 저장 (임시 파일에 쓴 뒤 교체)"""
+    tmp_path = f"{_manifest_path(store_dir)}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, _manifest_path(store_dir))
+
+def _partitioning():
+    return ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+
+def _to_store_table(chunk):
+    """정리된 청크를 저장용 Arrow 테이블로 변환 (category → 문자열, 파티션용 Month 컬럼 추가)"""
+    chunk = chunk.astype({column: object for column in chunk.select_dtypes('category').columns})
+    chunk['Month'] = chunk['Date'].dt.strftime(MONTH_FORMAT)
+    return pa.Table.from_pandas(chunk, preserve_index=False)
+
+def append_csv(file_path, store_dir=SALES_STORE_DIR, chunksize=DEFAULT_CHUNK_SIZE, quarantine_path=QUARANTINE_PATH):
+    """
+    CSV 파일을 정리하여 월/지역별 파티션에 추가
+
+    Args:
+        file_path (str): 추가할 CSV 파일 경로
+        store_dir (str): 저장소 폴더
+        chunksize (int): 한 번에 읽을 행 수
+        quarantine_path (str): 제거된 행을 사유와 함께 저장할 CSV 경로 (None이면 저장 안 함)
+
+    Returns:
+        int: 추가한 행 수 (이미 추가된 파일이면 0)
+    """
+    manifest = read_manifest(store_dir)
+    if manifest.get('rules_version') != cleaning_rules_key() and manifest['sources']:
+        raise RuntimeError(f"저장소의 전처리 규칙({manifest.get('rules_version')})이 현재 규칙"
+                           f"({cleaning_rules_key()})과 다릅니다. 저장소를 새로 만들어 주세요.")
+
+    source_hash = file_content_hash(file_path)
+    if any(source['hash'] == source_hash for source in manifest['sources']):
+        print(f"⏭️  이미 추가된 파일입니다: {file_path}")
+        return 0
+
+    os.makedirs(store_dir, exist_ok=True)
+    validation = ValidationReport(quarantine_path)
+    appended = 0
+    months = set()
+    with stage('store_append') as info:
+        for chunk_index, chunk in enumerate(read_sales_csv(file_path, chunksize=chunksize)):
+            chunk = clean_sales_data(chunk, validation)
+            if chunk.empty:
+                continue
+            table = _to_store_table(chunk)
+            # 파일 이름에 원본 해시를 넣어, 중단 후 다시 추가해도 같은 파일을 덮어쓰도록 함
+            ds.write_dataset(table, store_dir, format='parquet', partitioning=_partitioning(),
+                             basename_template=f"part-{source_hash[:16]}-{chunk_index}-{{i}}.parquet",
+                             existing_data_behavior='overwrite_or_ignore')
+            appended += len(chunk)
+            months.update(table.column('Month').unique().to_pylist())
+        info['rows'] = appended
+    validation.finish()
+    validation.print_summary()
+
+    manifest['rules_version'] = cleaning_rules_key()
+    manifest['sources'].append({
+        'file': os.path.basename(file_path),
+        'hash': source_hash,
+        'rows': appended,
+        'months': sorted(months),
+        'appended_at': datetime.now().isoformat(timespec='seconds')
+    })
+    _write_manifest(store_dir, manifest)
+    print(f"✅ 저장소에 추가: {file_path} → {store_dir} ({appended:,}건, {', '.join(sorted(months)) or '-'})")
+    return appended
+
+def store_filter(start=None, end=None, regions=None):
+    """
+    날짜 범위와 지역 조건을 데이터셋 필터 식으로 변환
+
+    파티션 컬럼(Month, Region) 조건은 폴더 단위로 걸러지고, Date 조건은 남은 파일 안에서 적용됩니다.
+
+    Args:
+        start: 시작 날짜 (포함, 문자열 또는 Timestamp)
+        end: 종료 날짜 (포함)
+        regions (list): 지역 목록
+
+    Returns:
+        Expression: 필터 식 (조건이 없으면 None)
+    """
+    conditions = []
+    if start is not None:
+        start = pd.Timestamp(start)
+        conditions += [ds.field('Month') >= start.strftime(MONTH_FORMAT), ds.field('Date') >= start.to_pydatetime()]
+    if end is not None:
+        end = pd.Timestamp(end)
+        conditions += [ds.field('Month') <= end.strftime(MONTH_FORMAT), ds.field('Date') <= end.to_pydatetime()]
+    if regions:
+        conditions.append(ds.field('Region').isin(list(regions)))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+def open_store_dataset(store_dir=SALES_STORE_DIR):
+    """저장소를 Arrow 데이터셋으로 열기"""
+    if not os.path.isdir(store_dir):
+        raise FileNotFoundError(store_dir)
+    return ds.dataset(store_dir, format='parquet', partitioning=_partitioning())
+
+def partition_values(dataset, column):
+    """데이터셋 파티션 폴더에 있는 값 목록 (예: Region → ['East', 'North', ...])"""
+    values = {ds.get_partition_keys(fragment.partition_expression).get(column) for fragment in dataset.get_fragments()}
+    return sorted(value for value in values if value is not None)
+
+def read_sales_store(store_dir=SALES_STORE_DIR, start=None, end=None, regions=None):
+    """
+    조건에 맞는 파티션만 읽어 정리된 판매 데이터로 반환
+
+    Args:
+        store_dir (str): 저장소 폴더
+        start: 시작 날짜 (포함, 문자열 또는 Timestamp)
+        end: 종료 날짜 (포함)
+        regions (list): 지역 목록 (대소문자 차이는 무시)
+
+    Returns:
+        DataFrame: load_and_clean_data()와 같은 컬럼과 dtype의 데이터 (실패 시 None)
+    """
+    print("=== 저장소에서 데이터 로드 중 ===")
+    try:
+        with stage('store_read') as info:
+            dataset = open_store_dataset(store_dir)
+            if regions:
+                # 파티션 폴더 이름과 정확히 같아야 걸러지므로 저장된 지역 표기로 맞춤
+                regions = match_values(partition_values(dataset, 'Region'), regions)
+            expression = store_filter(start, end, regions)
+            total_files = len(dataset.files)
+            read_files = len(list(dataset.get_fragments(filter=expression)))
+            table = dataset.to_table(columns=STORE_COLUMNS, filter=expression)
+            df = table.to_pandas()
+            info['rows'] = len(df)
+    except FileNotFoundError:
+        print(f"❌ 저장소를 찾을 수 없습니다: {store_dir} (python sales_store.py append <CSV>로 먼저 추가하세요)")
+        return None
+    except Exception as e:
+        print(f"❌ 저장소 읽기 중 오류 발생: {e}")
+        return None
+
+    # CSV 로더와 같은 dtype으로 맞춤 (정리가 끝난 데이터이므로 Quantity는 int32)
+    dtypes = dict(SALES_DTYPES, Quantity='int32')
+    df = df.astype(dtypes)
+    df['Date'] = df['Date'].astype('datetime64[us]')
+
+    print(f"📂 읽은 파일: {read_files}/{total_files}개 (조건에 맞는 파티션만 읽음)")
+    print(f"📊 데이터 개수: {len(df):,}개")
+    print()
+    return df
+
+def store_info(store_dir=SALES_STORE_DIR):
+    """저장소의 파티션별 파일 수와 추가된 CSV 파일 목록 출력"""
+    manifest = read_manifest(store_dir)
+    if not manifest['sources']:
+        print(f"📭 저장소가 비어 있습니다: {store_dir}")
+        return
+    partitions = {}
+    for path in open_store_dataset(store_dir).files:
+        partition = os.path.relpath(os.path.dirname(path), store_dir)
+        partitions[partition] = partitions.get(partition, 0) + 1
+    print(f"📦 저장소: {store_dir} (파티션 {len(partitions)}개, 파일 {sum(partitions.values())}개)")
+    for partition, count in sorted(partitions.items()):
+        print(f"   - {partition}: {count}개")
+    print("📥 추가된 파일:")
+    for source in manifest['sources']:
+        print(f"   - {source['file']}: {source['rows']:,}건 ({', '.join(source['months'])}, {source['appended_at']})")
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='월/지역별 분할 판매 데이터 저장소')
+    parser.add_argument('--store', default=SALES_STORE_DIR, help='저장소 폴더')
+    commands = parser.add_subparsers(dest='command', required=True)
+    append = commands.add_parser('append', help='CSV 파일을 저장소에 추가')
+    append.add_argument('files', nargs='+', help='추가할 CSV 파일')
+    commands.add_parser('info', help='저장소 파티션과 추가된 파일 목록')
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'append':
+            for file_path in args.files:
+                append_csv(file_path, args.store)
+        else:
+            store_info(args.store)
+    except FileNotFoundError as e:
+        print(f"❌ 파일을 찾을 수 없습니다: {e.filename or e}")
+    except Exception as e:
+        print(f"❌ 저장소 작업 중 오류 발생: {e}")
+
+if __name__ == "__main__":
+    main()
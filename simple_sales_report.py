@@ -1,54 +1,26 @@
 import pandas as pd
 from datetime import datetime
+from functools import partial
+import sys
+from sales_data_loader import load_and_aggregate_streaming, iter_clean_chunks, DEFAULT_CHUNK_SIZE
+from sales_cube import SalesCube
+from sales_index import load_report_data, select_rows, parse_report_filters, describe_filters, print_no_matching_rows
 import warnings
 warnings.filterwarnings('ignore')
 
-def load_and_clean_data(file_path):
-    """데이터 로드 및 전처리"""
-    # CSV 파일 읽기
-    df = pd.read_csv(file_path)
-    
-    print("=== 원본 데이터 정보 ===")
-    print(f"총 데이터 개수: {len(df)}개")
-    print(f"컬럼: {list(df.columns)}")
-    print()
-    
-    # 데이터 정리
-    # 1. 날짜 컬럼 변환
-    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-    
-    # 2. 제품명과 카테고리 대소문자 정리
-    df['ProductName'] = df['ProductName'].str.title()  # 첫 글자만 대문자
-    df['Category'] = df['Category'].str.title()
-    df['Salesperson'] = df['Salesperson'].str.title()
-    
-    # 3. 빈 값이나 잘못된 데이터 제거
-    df = df.dropna(subset=['Date', 'ProductID', 'Quantity', 'UnitPrice'])
-    df = df[df['ProductID'] != 'P0000']  # 잘못된 제품 ID 제거
-    df = df[df['Quantity'] > 0]  # 수량이 0인 데이터 제거
-    df = df[df['UnitPrice'] > 0]  # 단가가 0인 데이터 제거
-    
-    # 4. TotalPrice 재계산 (일부 데이터에 오류가 있을 수 있음)
-    df['TotalPrice'] = df['Quantity'] * df['UnitPrice']
-    
-    print("=== 정리된 데이터 정보 ===")
-    print(f"정리 후 데이터 개수: {len(df)}개")
-    print()
-    
-    return df
-
-def generate_summary_statistics(df):
+def generate_summary_statistics(cube):
     """요약 통계 생성"""
     print("="*50)
     print("📊 판매 데이터 요약 보고서")
     print("="*50)
     
     # 기본 통계
-    total_sales = df['TotalPrice'].sum()
-    total_quantity = df['Quantity'].sum()
-    avg_order_value = df['TotalPrice'].mean()
-    unique_products = df['ProductID'].nunique()
-    date_range = f"{df['Date'].min().strftime('%Y-%m-%d')} ~ {df['Date'].max().strftime('%Y-%m-%d')}"
+    summary = cube.summary()
+    total_sales = summary['total_sales']
+    total_quantity = summary['total_quantity']
+    avg_order_value = summary['avg_order_value']
+    unique_products = summary['unique_products']
+    date_range = f"{summary['min_date'].strftime('%Y-%m-%d')} ~ {summary['max_date'].strftime('%Y-%m-%d')}"
     
     print(f"📅 분석 기간: {date_range}")
     print(f"💰 총 매출액: {total_sales:,.0f}원")
@@ -57,99 +29,66 @@ def generate_summary_statistics(df):
     print(f"🛍️ 판매된 제품 종류: {unique_products}개")
     print()
 
-def analyze_by_category(df):
+def analyze_by_category(cube):
     """카테고리별 분석"""
     print("="*30)
     print("📊 카테고리별 판매 분석")
     print("="*30)
     
-    category_sales = df.groupby('Category').agg({
-        'TotalPrice': 'sum',
-        'Quantity': 'sum',
-        'ProductID': 'nunique'
-    }).round(2)
-    
-    category_sales.columns = ['총 매출액', '총 수량', '제품 종류 수']
-    category_sales = category_sales.sort_values('총 매출액', ascending=False)
+    category_sales = cube.category_sales()
     
     print(category_sales)
     print()
     
     return category_sales
 
-def analyze_by_product(df):
+def analyze_by_product(cube):
     """제품별 분석"""
     print("="*30)
     print("🏆 베스트셀러 제품 TOP 10")
     print("="*30)
     
-    product_sales = df.groupby(['ProductID', 'ProductName']).agg({
-        'TotalPrice': 'sum',
-        'Quantity': 'sum'
-    }).round(2)
-    
-    product_sales.columns = ['총 매출액', '총 수량']
-    top_products = product_sales.sort_values('총 매출액', ascending=False).head(10)
+    top_products = cube.product_sales(top_n=10)
     
     print(top_products)
     print()
     
     return top_products
 
-def analyze_by_region(df):
+def analyze_by_region(cube):
     """지역별 분석"""
     print("="*30)
     print("🌍 지역별 판매 분석")
     print("="*30)
     
-    region_sales = df.groupby('Region').agg({
-        'TotalPrice': 'sum',
-        'Quantity': 'sum'
-    }).round(2)
-    
-    region_sales.columns = ['총 매출액', '총 수량']
-    region_sales = region_sales.sort_values('총 매출액', ascending=False)
+    region_sales = cube.region_sales()
     
     print(region_sales)
     print()
     
     return region_sales
 
-def analyze_by_salesperson(df):
+def analyze_by_salesperson(cube):
     """영업사원별 분석"""
     print("="*30)
     print("👤 영업사원별 판매 성과")
     print("="*30)
     
-    # 빈 값 제거
-    df_clean = df[df['Salesperson'].notna() & (df['Salesperson'] != '')]
-    
-    salesperson_sales = df_clean.groupby('Salesperson').agg({
-        'TotalPrice': 'sum',
-        'Quantity': 'sum',
-        'Date': 'count'  # 거래 횟수
-    }).round(2)
-    
-    salesperson_sales.columns = ['총 매출액', '총 수량', '거래 횟수']
-    salesperson_sales = salesperson_sales.sort_values('총 매출액', ascending=False)
+    # 빈 값은 제외하고 거래 횟수까지 집계
+    salesperson_sales = cube.salesperson_sales()
     
     print(salesperson_sales)
     print()
     
     return salesperson_sales
 
-def analyze_daily_trends(df):
+def analyze_daily_trends(cube):
     """일별 판매 추이 분석"""
     print("="*30)
     print("📈 일별 판매 추이")
     print("="*30)
     
-    daily_sales = df.groupby('Date').agg({
-        'TotalPrice': 'sum',
-        'Quantity': 'sum'
-    }).round(2)
-    
-    daily_sales.columns = ['일별 매출액', '일별 수량']
+    daily_sales = cube.daily_sales()
     
     # 최고/최저 매출일
     max_sales_day = daily_sales['일별 매출액'].idxmax()
@@ -169,59 +108,108 @@ def analyze_daily_trends(df):
     
     return daily_sales
 
-def generate_excel_report(df, category_sales, region_sales, salesperson_sales, daily_sales, top_products):
-    """Excel 보고서 생성"""
+def generate_excel_report(raw_data, cube, category_sales, region_sales, salesperson_sales, daily_sales, top_products):
+    """
+    Excel 보고서 생성
+    
+    Args:
+        raw_data (DataFrame 또는 iterable): 정리된 원본 데이터 또는 정리된 청크 반복자 (iter_clean_chunks)
+        cube (SalesCube): 판매 집계 큐브 (요약 통계와 원본 행 수 계산용)
+        category_sales, region_sales, salesperson_sales, daily_sales, top_products (DataFrame): 분석 결과
+    """
     print("="*30)
     print("📝 Excel 보고서 생성 중...")
     print("="*30)
     
+    # openpyxl은 Excel 보고서를 만들 때만 가져옴 (분석 요약만 할 때 시작 시간 단축)
+    from excel_writer import write_excel_report
+    
     try:
-        with pd.ExcelWriter('sales_analysis_report.xlsx', engine='openpyxl') as writer:
-            # 원본 데이터 (정리된 버전)
-            df.to_excel(writer, sheet_name='원본데이터', index=False)
-            
-            # 요약 통계
-            summary_data = {
-                '구분': ['총 매출액', '총 판매수량', '평균 주문금액', '제품 종류 수', '분석 기간'],
-                '값': [
-                    f"{df['TotalPrice'].sum():,.0f}원",
-                    f"{df['Quantity'].sum():,}개",
-                    f"{df['TotalPrice'].mean():,.0f}원",
-                    f"{df['ProductID'].nunique()}개",
-                    f"{df['Date'].min().strftime('%Y-%m-%d')} ~ {df['Date'].max().strftime('%Y-%m-%d')}"
-                ]
-            }
-            pd.DataFrame(summary_data).to_excel(writer, sheet_name='요약통계', index=False)
-            
-            # 각 분석 결과를 별도 시트에 저장
-            category_sales.to_excel(writer, sheet_name='카테고리별분석')
-            region_sales.to_excel(writer, sheet_name='지역별분석')
-            salesperson_sales.to_excel(writer, sheet_name='영업사원별분석')
-            daily_sales.to_excel(writer, sheet_name='일별추이')
-            top_products.to_excel(writer, sheet_name='베스트셀러제품')
+        # 요약 통계
+        summary = cube.summary()
+        summary_data = {
+            '구분': ['총 매출액', '총 판매수량', '평균 주문금액', '제품 종류 수', '분석 기간'],
+            '값': [
+                f"{summary['total_sales']:,.0f}원",
+                f"{summary['total_quantity']:,}개",
+                f"{summary['avg_order_value']:,.0f}원",
+                f"{summary['unique_products']}개",
+                f"{summary['min_date'].strftime('%Y-%m-%d')} ~ {summary['max_date'].strftime('%Y-%m-%d')}"
+            ]
+        }
+        
+        # 원본 데이터(정리된 버전)와 각 분석 결과를 별도 시트에 행 단위로 기록
+        write_excel_report('sales_analysis_report.xlsx', [
+            ('요약통계', pd.DataFrame(summary_data), False),
+            ('카테고리별분석', category_sales, True),
+            ('지역별분석', region_sales, True),
+            ('영업사원별분석', salesperson_sales, True),
+            ('일별추이', daily_sales, True),
+            ('베스트셀러제품', top_products, True)
+        ], raw_data=raw_data, raw_row_count=cube.row_count)
         
         print("✅ Excel 보고서가 'sales_analysis_report.xlsx' 파일로 저장되었습니다.")
     except Exception as e:
         print(f"❌ Excel 파일 생성 중 오류 발생: {e}")
 
-def main():
-    """메인 함수"""
+def main(streaming=False, chunksize=DEFAULT_CHUNK_SIZE, backend='pandas', store_dir=None, filters=None):
+    """
+    메인 함수
+
+    Args:
+        streaming (bool): 대용량 CSV를 청크 단위로 처리 (조건은 청크마다 적용)
+        chunksize (int): 한 번에 읽을 행 수
+        backend (str): 'pandas'가 아니면 SQL 데이터베이스에서 분석
+        store_dir (str): 분할 저장소 폴더 (지정하면 CSV 대신 저장소에서 읽음)
+        filters (dict): 기간과 지역/카테고리/영업사원 조건 (None이면 전체)
+    """
     print("🚀 판매 데이터 분석을 시작합니다...\n")
+    if filters:
+        print(f"🔍 보고서 대상: {describe_filters(filters)}\n")
     
     try:
-        # 데이터 로드 및 전처리
-        df = load_and_clean_data('cicd_data.csv')
+        if store_dir:
+            # 분할 저장소: 기간과 지역 조건에 맞는 파티션만 읽고 나머지 조건은 읽은 데이터에 적용
+            from sales_store import read_sales_store
+            filters = filters or {}
+            raw_data = read_sales_store(store_dir, filters.get('start'), filters.get('end'), filters.get('Region'))
+            raw_data = select_rows(raw_data, filters) if raw_data is not None else None
+            cube = SalesCube.from_dataframe(raw_data) if raw_data is not None else None
+        elif backend != 'pandas':
+            # SQL 백엔드: 데이터베이스에서 집계하고, 원본데이터 시트는 청크 단위로 다시 조회
+            from sales_sql import open_sales_cube
+            cube = open_sales_cube('cicd_data.csv', backend, chunksize=chunksize)
+            if cube is not None and filters:
+                cube = cube.filter(**filters)
+            raw_data = cube.iter_rows(chunksize) if cube is not None else None
+        elif streaming:
+            # 스트리밍 모드: 청크 단위로 읽어 집계 큐브만 유지 (조건은 청크마다 적용)
+            row_filter = partial(select_rows, filters=filters) if filters else None
+            cube = load_and_aggregate_streaming('cicd_data.csv', chunksize=chunksize, row_filter=row_filter)
+            # 원본데이터 시트는 CSV를 청크 단위로 다시 읽어 바로 기록
+            raw_data = iter_clean_chunks('cicd_data.csv', chunksize=chunksize, row_filter=row_filter)
+        else:
+            # 데이터 로드 및 전처리 (조건이 있으면 색인으로 해당 행만 선택)
+            raw_data = load_report_data('cicd_data.csv', filters)
+            cube = SalesCube.from_dataframe(raw_data) if raw_data is not None else None
+        
+        if cube is None:
+            print("❌ 데이터 로드에 실패했습니다.")
+            return
+        if cube.empty:
+            print_no_matching_rows(filters)
+            return
         
-        # 각종 분석 수행
-        generate_summary_statistics(df)
-        category_sales = analyze_by_category(df)
-        top_products = analyze_by_product(df)
-        region_sales = analyze_by_region(df)
-        salesperson_sales = analyze_by_salesperson(df)
-        daily_sales = analyze_daily_trends(df)
+        # 각종 분석 수행 (모두 같은 집계 큐브에서 계산)
+        generate_summary_statistics(cube)
+        category_sales = analyze_by_category(cube)
+        top_products = analyze_by_product(cube)
+        region_sales = analyze_by_region(cube)
+        salesperson_sales = analyze_by_salesperson(cube)
+        daily_sales = analyze_daily_trends(cube)
         
         # Excel 보고서 생성
-        generate_excel_report(df, category_sales, region_sales, salesperson_sales, daily_sales, top_products)
+        generate_excel_report(raw_data, cube, category_sales, region_sales, salesperson_sales, daily_sales, top_products)
         
         print("\n" + "="*50)
         print("✅ 분석이 완료되었습니다!")
@@ -233,4 +221,6 @@ def main():
         print(f"❌ 분석 중 오류가 발생했습니다: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # --stream 옵션: 대용량 CSV를 청크 단위로 처리
+    # --start/--end/--region/--category/--salesperson 옵션: 보고서 대상 조건
+    main(streaming='--stream' in sys.argv, filters=parse_report_filters(sys.argv[1:]))
\ No newline at end of file
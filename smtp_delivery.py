@@ -0,0 +1,603 @@
+"""
+보고서 이메일 전송 서비스
+로그인까지 마친 SMTP 연결을 풀에 보관해 여러 메시지에 재사용하고, 새 연결은 이전 TLS 세션을 재개하여 핸드셰이크를 줄입니다.
+받는 사람을 개인별 또는 그룹별 메시지로 나누어 여러 연결로 동시에 보내며,
+일시적인 오류(4xx 응답, 연결 끊김, 시간 초과)는 간격을 늘려가며 다시 시도하고 영구 오류(5xx, 인증 실패)는 바로 실패 처리합니다.
+첨부 파일은 메모리 매핑으로 한 번만 base64 인코딩해 캐시에 저장하고, 전송할 때 캐시 파일을 조각 단위로 소켓에 씁니다.
+
+로컬 테스트 서버(aiosmtpd 등)에는 use_tls=False, username=None으로 연결하면 됩니다.
+"""
+
+import atexit
+import base64
+import hashlib
+import mmap
+import os
+import queue
+import smtplib
+import ssl
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email import encoders
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+# 워드 보고서 첨부파일 MIME 형식
+DOCX_MIME_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+# 서버당 동시에 열어 둘 최대 연결 수
+DEFAULT_POOL_SIZE = 4
+
+# 한 메시지의 최대 전송 시도 횟수
+DEFAULT_MAX_ATTEMPTS = 3
+
+# 첫 재시도 대기 시간(초), 재시도마다 두 배로 증가
+DEFAULT_BACKOFF_SECONDS = 1.0
+
+# SMTP 연결 시간 제한(초)
+DEFAULT_TIMEOUT = 30
+
+# 이 시간(초) 이상 쉰 연결은 재사용 전에 서버가 끊지 않았는지 확인
+IDLE_CHECK_SECONDS = 30
+
+# 메시지 하나에 넣을 받는 사람 수 (1이면 개인별 메시지)
+DEFAULT_GROUP_SIZE = 1
+
+# base64로 인코딩한 첨부 파일 캐시 폴더와 유지할 최대 파일 수
+ATTACHMENT_CACHE_DIR = os.path.join('.cache', 'attachments')
+ATTACHMENT_CACHE_MAX_FILES = 200
+ATTACHMENT_CACHE_VERSION = 1
+
+# 첨부 파일을 한 번에 인코딩할 크기 (57바이트 = base64 한 줄, 줄 단위로 나누어 떨어져야 함)
+ENCODE_CHUNK_BYTES = 57 * 16 * 1024
+
+# SMTP 소켓에 한 번에 쓸 크기
+SEND_CHUNK_BYTES = 256 * 1024
+
+class SessionReusingSMTP(smtplib.SMTP):
+    """STARTTLS 때 이전 연결의 TLS 세션을 재개하는 SMTP 연결"""
+
+    def __init__(self, host='', port=0, tls_session=None, **kwargs):
+        self.tls_session = tls_session
+        super().__init__(host, port, **kwargs)
+
+    def starttls(self, context=None):
+        """smtplib.SMTP.starttls와 같은 절차에 TLS 세션 재개만 추가"""
+        self.ehlo_or_helo_if_needed()
+        if not self.has_extn('starttls'):
+            raise smtplib.SMTPNotSupportedError("STARTTLS extension not supported by server.")
+        resp, reply = self.docmd('STARTTLS')
+        if resp != 220:
+            raise smtplib.SMTPResponseException(resp, reply)
+
+        if context is None:
+            context = ssl.create_default_context()
+        self.sock = context.wrap_socket(self.sock, server_hostname=self._host, session=self.tls_session)
+        self.file = None
+        # RFC 3207: TLS 협상 전에 받은 서버 정보는 버림
+        self.helo_resp = None
+        self.ehlo_resp = None
+        self.esmtp_features = {}
+        self.does_esmtp = False
+        return resp, reply
+
+class SMTPConnectionPool:
+    """
+    로그인된 SMTP 연결 풀
+
+    연결은 처음 필요할 때 만들어지고, 사용이 끝나면 풀에 돌아가 다음 메시지에 재사용됩니다.
+    with 문으로 사용하면 끝날 때 모든 연결을 닫습니다.
+    """
+
+    def __init__(self, host, port, username=None, password=None, size=DEFAULT_POOL_SIZE,
+                 use_tls=True, timeout=DEFAULT_TIMEOUT, ssl_context=None):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.use_tls = use_tls
+        self.timeout = timeout
+        # TLS 세션은 같은 SSLContext에서만 재개할 수 있으므로 풀 전체가 하나의 컨텍스트를 공유
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.tls_session = None
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """새 연결을 열고 STARTTLS, 로그인까지 수행"""
+        server = SessionReusingSMTP(self.host, self.port, tls_session=self.tls_session, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls(context=self.ssl_context)
+                server.ehlo()
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            self._close(server)
+            raise
+
+        # TLS 1.3 세션 티켓은 핸드셰이크 뒤 첫 응답과 함께 도착하므로 EHLO 이후에 세션을 저장
+        if self.use_tls:
+            with self._lock:
+                self.tls_session = server.sock.session
+        return server
+
+    @staticmethod
+    def _close(server):
+        """연결 종료 (이미 끊긴 연결은 무시)"""
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    @staticmethod
+    def _reusable(server, error):
+        """응답 코드 오류 뒤에도 연결을 다시 쓸 수 있는지 (421 응답은 smtplib과 전송 코드가 이미 연결을 닫음)"""
+        if isinstance(error, smtplib.SMTPAuthenticationError) or getattr(error, 'smtp_code', None) == 421:
+            return False
+        return server.sock is not None
+
+    def _checkout(self):
+        """쉬고 있는 연결을 꺼내거나 새로 연결 (오래 쉰 연결은 NOOP으로 살아 있는지 확인)"""
+        while True:
+            try:
+                server, returned_at = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - returned_at < IDLE_CHECK_SECONDS:
+                return server
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close(server)
+
+    def open(self):
+        """첫 연결을 미리 열어 서버 주소와 인증 정보를 확인 (실패하면 예외 발생)"""
+        with self.connection():
+            pass
+
+    @contextmanager
+    def connection(self):
+        """풀에서 연결 하나를 빌려 사용 (오류로 연결 상태가 불확실하면 반납하지 않고 닫음)"""
+        self._slots.acquire()
+        server = None
+        try:
+            server = self._checkout()
+            yield server
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused) as e:
+            # 서버가 응답 코드로 거절한 경우 연결은 정상이므로 다시 사용 (닫힌 연결은 아래에서 정리)
+            if server is not None and self._reusable(server, e):
+                self._idle.put((server, time.monotonic()))
+                server = None
+            raise
+        else:
+            self._idle.put((server, time.monotonic()))
+            server = None
+        finally:
+            if server is not None:
+                self._close(server)
+            self._slots.release()
+
+    def close(self):
+        """풀에 남은 모든 연결 종료"""
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._close(server)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# 프로세스 안에서 재사용하는 연결 풀 ((서버, 포트, 사용자) → 풀)
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(host, port, username=None, password=None, size=DEFAULT_POOL_SIZE,
+             use_tls=True, timeout=DEFAULT_TIMEOUT, ssl_context=None):
+    """
+    같은 서버와 계정에 대한 연결 풀을 프로세스 안에서 재사용
+
+    비밀번호나 풀 설정(size, use_tls, timeout, ssl_context)이 기존 풀과 다르면
+    기존 연결을 닫고 새 설정으로 풀을 다시 만듭니다.
+
+    Args:
+        host (str): SMTP 서버 주소
+        port (int): SMTP 포트 번호
+        username (str): 로그인 계정 (None이면 로그인 생략)
+        password (str): 로그인 비밀번호
+        size (int): 최대 동시 연결 수
+        use_tls (bool): STARTTLS 사용 여부
+        timeout (float): 연결 시간 제한(초)
+        ssl_context (SSLContext): TLS 설정 (None이면 기본 설정)
+
+    Returns:
+        SMTPConnectionPool: 연결 풀
+    """
+    key = (host, port, username)
+    settings = (password, size, use_tls, timeout)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if (pool is None or (pool.password, pool.size, pool.use_tls, pool.timeout) != settings
+                or (ssl_context is not None and pool.ssl_context is not ssl_context)):
+            if pool is not None:
+                pool.close()
+            pool = SMTPConnectionPool(host, port, username, password, size=size, use_tls=use_tls,
+                                      timeout=timeout, ssl_context=ssl_context)
+            _pools[key] = pool
+    return pool
+
+@atexit.register
+def close_pools():
+    """재사용 중인 모든 연결 풀 종료"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+def is_transient_error(error):
+    """다시 시도하면 성공할 수 있는 오류인지 판단"""
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return False
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(error, smtplib.SMTPException):
+        return False
+    # 연결 거부, 시간 초과 등 네트워크 오류
+    return isinstance(error, OSError)
+
+def _chunk_recipients(recipients, group_size):
+    """받는 사람 목록을 group_size명씩 나눔"""
+    group_size = max(1, group_size or len(recipients))
+    return [recipients[i:i + group_size] for i in range(0, len(recipients), group_size)]
+
+def _attachment_cache_path(file_path, cache_dir):
+    """첨부 파일의 인코딩 캐시 경로 (파일 경로, 크기, 수정 시각이 같으면 같은 캐시)"""
+    stat = os.stat(file_path)
+    key = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}|v{ATTACHMENT_CACHE_VERSION}"
+    return os.path.join(cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest()[:32] + '.b64')
+
+def _prune_attachment_cache(cache_dir, keep=ATTACHMENT_CACHE_MAX_FILES):
+    """오래된 인코딩 캐시 파일 정리 (최근 keep개만 유지)"""
+    entries = [entry for entry in os.scandir(cache_dir) if entry.name.endswith('.b64')]
+    if len(entries) <= keep:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime)
+    for entry in entries[:-keep]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+def encode_attachment(file_path, cache_dir=ATTACHMENT_CACHE_DIR):
+    """
+    첨부 파일을 base64로 인코딩한 캐시 파일 경로 반환 (이미 인코딩했으면 재사용)
+
+    파일은 메모리 매핑하여 ENCODE_CHUNK_BYTES씩 인코딩하므로 파일 전체를 메모리에 올리지 않습니다.
+    캐시 파일은 76자 줄과 CRLF로 되어 있어 SMTP DATA에 그대로 쓸 수 있습니다.
+
+    Args:
+        file_path (str): 첨부할 파일 경로
+        cache_dir (str): 인코딩 캐시 저장 폴더
+
+    Returns:
+        str: base64 캐시 파일 경로
+    """
+    encoded_path = _attachment_cache_path(file_path, cache_dir)
+    if os.path.exists(encoded_path):
+        return encoded_path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # 다른 스레드/프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = f"{encoded_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(file_path, 'rb') as source, open(tmp_path, 'wb') as encoded:
+        size = os.fstat(source.fileno()).st_size
+        if size:
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for start in range(0, size, ENCODE_CHUNK_BYTES):
+                    lines = base64.encodebytes(mapped[start:start + ENCODE_CHUNK_BYTES])
+                    encoded.write(lines.replace(b'\n', b'\r\n'))
+            # 마지막 줄바꿈은 메시지 뒷부분(경계 줄)이 붙이므로 제거
+            encoded.truncate(encoded.tell() - 2)
+    os.replace(tmp_path, encoded_path)
+    _prune_attachment_cache(cache_dir)
+    return encoded_path
+
+def encode_attachment_bytes(data):
+    """메모리의 첨부 파일 내용을 SMTP DATA에 그대로 쓸 수 있는 base64 바이트로 인코딩 (76자 줄, CRLF)"""
+    # 마지막 줄바꿈은 메시지 뒷부분(경계 줄)이 붙이므로 제거
+    return base64.encodebytes(data).replace(b'\n', b'\r\n')[:-2]
+
+class StreamingMessage:
+    """
+    첨부 파일 본문을 인코딩 캐시에서 조각으로 읽어 SMTP 소켓에 바로 쓰는 메시지
+
+    메시지 머리글과 본문은 작은 문자열로 만들고, 첨부 파일 자리에는 자리표시자를 넣어 앞뒤로 나눈 뒤
+    전송할 때 (앞부분 → 메모리 매핑한 캐시 파일 또는 인코딩된 바이트 → 뒷부분) 순서로 DATA에 씁니다.
+    """
+
+    def __init__(self, msg, encoded, placeholder):
+        self.msg = msg
+        # 인코딩 캐시 파일 경로 또는 encode_attachment_bytes()의 결과
+        self.encoded = encoded
+        text = msg.as_string()
+        head, tail = text.split(placeholder)
+        # SMTP DATA 형식(CRLF, 마침표 이스케이프)으로 미리 변환
+        self.head = smtplib.quotedata(head).encode('ascii')
+        self.tail = smtplib.quotedata(tail).encode('ascii')
+        if not self.tail.endswith(b'\r\n'):
+            self.tail += b'\r\n'
+
+    def __getitem__(self, name):
+        return self.msg[name]
+
+    @staticmethod
+    def _send_chunks(server, buffer):
+        """버퍼를 복사하지 않고 SEND_CHUNK_BYTES씩 소켓에 씀"""
+        view = memoryview(buffer)
+        try:
+            for start in range(0, len(view), SEND_CHUNK_BYTES):
+                server.send(view[start:start + SEND_CHUNK_BYTES])
+        finally:
+            view.release()
+
+    def _write_data(self, server):
+        """DATA 명령으로 메시지를 조각 단위로 전송 (base64 줄은 마침표로 시작하지 않으므로 그대로 씀)"""
+        code, reply = server.docmd('data')
+        if code != 354:
+            raise smtplib.SMTPDataError(code, reply)
+
+        server.send(self.head)
+        if isinstance(self.encoded, bytes):
+            self._send_chunks(server, self.encoded)
+        else:
+            with open(self.encoded, 'rb') as encoded:
+                if os.fstat(encoded.fileno()).st_size:
+                    with mmap.mmap(encoded.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        self._send_chunks(server, mapped)
+        server.send(self.tail + b'.\r\n')
+        return server.getreply()
+
+    def send(self, server, recipients):
+        """
+        smtplib.SMTP.sendmail과 같은 절차로 전송 (서버가 거절한 받는 사람 딕셔너리 반환)
+
+        Args:
+            server (smtplib.SMTP): 로그인된 SMTP 연결
+            recipients (list): 받는 사람 이메일 주소 리스트
+
+        Returns:
+            dict: 거절된 받는 사람 → (응답 코드, 응답 메시지)
+        """
+        from_addr = self.msg['From']
+        server.ehlo_or_helo_if_needed()
+        code, reply = server.mail(from_addr)
+        if code != 250:
+            if code == 421:
+                server.close()
+            else:
+                server._rset()
+            raise smtplib.SMTPSenderRefused(code, reply, from_addr)
+
+        refused = {}
+        for recipient in recipients:
+            code, reply = server.rcpt(recipient)
+            if code not in (250, 251):
+                refused[recipient] = (code, reply)
+            if code == 421:
+                server.close()
+                raise smtplib.SMTPRecipientsRefused(refused)
+        if len(refused) == len(recipients):
+            server._rset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+        code, reply = self._write_data(server)
+        if code != 250:
+            if code == 421:
+                server.close()
+            else:
+                server._rset()
+            raise smtplib.SMTPDataError(code, reply)
+        return refused
+
+def build_attachment(file_path, mime_type=DOCX_MIME_TYPE, placeholder=None, data=None):
+    """
+    첨부 파트 생성 (여러 메시지가 같은 파트를 공유)
+
+    placeholder를 주면 파일 내용 대신 자리표시자를 넣은 파트를 만들고, 본문은 전송할 때 인코딩 캐시에서 채웁니다.
+    data를 주면 파일을 읽지 않고 data를 첨부하며, file_path는 첨부 파일 이름으로만 사용합니다.
+    """
+    maintype, subtype = mime_type.split('/', 1)
+    part = MIMEBase(maintype, subtype)
+    if placeholder is None:
+        if data is None:
+            with open(file_path, 'rb') as attachment:
+                data = attachment.read()
+        part.set_payload(data)
+        encoders.encode_base64(part)
+    else:
+        part.set_payload(placeholder)
+        part['Content-Transfer-Encoding'] = 'base64'
+    part.add_header(
+        'Content-Disposition',
+        f'attachment; filename= {os.path.basename(file_path)}',
+    )
+    return part
+
+def build_report_messages(sender, recipients, subject, body, attachment_path=None,
+                          mime_type=DOCX_MIME_TYPE, group_size=DEFAULT_GROUP_SIZE, streaming=True,
+                          attachment_data=None):
+    """
+    받는 사람을 개인별 또는 그룹별로 나누어 보고서 메시지 생성
+
+    Args:
+        sender (str): 보내는 사람 이메일 주소
+        recipients (list): 받는 사람 이메일 주소 리스트
+        subject (str): 제목
+        body (str): 본문
+        attachment_path (str): 첨부 파일 경로 (None이면 첨부 없음)
+        mime_type (str): 첨부 파일 MIME 형식
+        group_size (int): 메시지 하나에 넣을 받는 사람 수 (1이면 개인별, None이면 전체를 한 메시지로)
+        streaming (bool): 첨부 파일을 인코딩 캐시에서 조각으로 전송 (False이면 메시지 안에 인코딩)
+        attachment_data (bytes): 메모리의 첨부 파일 내용 (주면 attachment_path는 첨부 파일 이름으로만 사용)
+
+    Returns:
+        list: (받는 사람 리스트, 메시지) 튜플 리스트
+    """
+    attachment = None
+    encoded = None
+    placeholder = None
+    if attachment_path:
+        if streaming:
+            # 첨부 파일은 한 번만 인코딩하고(파일은 캐시에 저장), 메시지에는 자리표시자만 넣음
+            if attachment_data is None:
+                encoded = encode_attachment(attachment_path)
+            else:
+                encoded = encode_attachment_bytes(attachment_data)
+            placeholder = f"ATTACHMENT-{uuid.uuid4().hex}"
+            attachment = build_attachment(attachment_path, mime_type, placeholder=placeholder)
+        else:
+            # 첨부 파일은 한 번만 읽고 인코딩
+            attachment = build_attachment(attachment_path, mime_type, data=attachment_data)
+
+    messages = []
+    for group in _chunk_recipients(list(recipients), group_size):
+        msg = MIMEMultipart()
+        msg['From'] = sender
+        msg['To'] = ", ".join(group)
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'plain', 'utf-8'))
+        if attachment is not None:
+            msg.attach(attachment)
+        if encoded is not None:
+            msg = StreamingMessage(msg, encoded, placeholder)
+        messages.append((group, msg))
+    return messages
+
+def new_result(recipients):
+    """메시지 하나의 전송 결과 딕셔너리 초기값"""
+    return {'recipients': recipients, 'success': False, 'attempts': 0, 'refused': {}, 'error': None}
+
+def flatten_message(msg):
+    """전송할 메시지 문자열 (첨부 파일을 조각으로 전송하는 메시지는 None)"""
+    return None if isinstance(msg, StreamingMessage) else msg.as_string()
+
+def send_once(pool, recipients, msg, text):
+    """풀에서 연결을 빌려 메시지를 한 번 전송 (서버가 거절한 받는 사람 딕셔너리 반환)"""
+    with pool.connection() as server:
+        if text is None:
+            return msg.send(server, recipients)
+        return server.sendmail(msg['From'], recipients, text)
+
+def retry_delay(error, attempt, max_attempts, backoff, recipients):
+    """다시 시도할 오류이면 대기 시간(초)을 반환하고, 아니면 None"""
+    if not is_transient_error(error) or attempt >= max_attempts:
+        return None
+    delay = backoff * (2 ** (attempt - 1))
+    print(f"⚠️  전송 재시도 {attempt}/{max_attempts - 1} ({', '.join(recipients)}): {error} - {delay:.1f}초 후")
+    return delay
+
+def _deliver_one(pool, recipients, msg, max_attempts, backoff):
+    """메시지 하나를 전송 (일시적인 오류는 대기 시간을 두 배씩 늘려가며 재시도)"""
+    started = time.perf_counter()
+    text = flatten_message(msg)
+    result = new_result(recipients)
+
+    for attempt in range(1, max_attempts + 1):
+        result['attempts'] = attempt
+        try:
+            result['refused'] = send_once(pool, recipients, msg, text)
+            result['success'] = True
+            result['error'] = None
+            break
+        except Exception as e:
+            result['error'] = e
+            delay = retry_delay(e, attempt, max_attempts, backoff, recipients)
+            if delay is None:
+                break
+            time.sleep(delay)
+
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+def deliver_messages(pool, messages, max_attempts=DEFAULT_MAX_ATTEMPTS, backoff=DEFAULT_BACKOFF_SECONDS,
+                     max_workers=None):
+    """
+    여러 메시지를 연결 풀로 동시에 전송
+
+    Args:
+        pool (SMTPConnectionPool): 연결 풀
+        messages (list): (받는 사람 리스트, 메시지) 튜플 리스트
+        max_attempts (int): 메시지당 최대 전송 시도 횟수
+        backoff (float): 첫 재시도 대기 시간(초)
+        max_workers (int): 동시 전송 스레드 수 (None이면 풀 크기)
+
+    Returns:
+        list: 메시지별 결과 딕셔너리 (recipients, success, attempts, refused, error, seconds)
+    """
+    if not messages:
+        return []
+
+    workers = min(max_workers or pool.size, len(messages))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_deliver_one, pool, recipients, msg, max_attempts, backoff)
+            for recipients, msg in messages
+        ]
+        return [future.result() for future in futures]
+
+def send_messages(messages, smtp_server, smtp_port, username=None, password=None,
+                  max_attempts=DEFAULT_MAX_ATTEMPTS, backoff=DEFAULT_BACKOFF_SECONDS, **pool_options):
+    """
+    재사용 연결 풀로 메시지 전송 (첫 연결에서 인증 오류가 나면 예외 발생)
+
+    Args:
+        messages (list): (받는 사람 리스트, 메시지) 튜플 리스트
+        smtp_server (str): SMTP 서버 주소
+        smtp_port (int): SMTP 포트 번호
+        username (str): 로그인 계정 (None이면 로그인 생략)
+        password (str): 로그인 비밀번호
+        max_attempts (int): 메시지당 최대 전송 시도 횟수
+        backoff (float): 첫 재시도 대기 시간(초)
+        **pool_options: 연결 풀 추가 설정 (size, use_tls, timeout)
+
+    Returns:
+        list: 메시지별 결과 딕셔너리
+    """
+    pool = get_pool(smtp_server, smtp_port, username, password, **pool_options)
+    pool.open()
+    return deliver_messages(pool, messages, max_attempts=max_attempts, backoff=backoff)
+
+def failed_recipients(results):
+    """전송에 실패했거나 서버가 거절한 받는 사람 목록"""
+    failed = []
+    for result in results:
+        if not result['success']:
+            failed.extend(result['recipients'])
+        else:
+            failed.extend(result['refused'])
+    return failed
+
+def print_delivery_failures(results):
+    """전송에 실패한 메시지와 오류 내용 출력"""
+    for result in results:
+        if not result['success']:
+            print(f"   - {', '.join(result['recipients'])}: {result['error']} (시도 {result['attempts']}회)")
+        for recipient, (code, reply) in result['refused'].items():
+            print(f"   - {recipient}: {code} {reply.decode(errors='replace') if isinstance(reply, bytes) else reply}")
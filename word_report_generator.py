@@ -1,178 +1,46 @@
 import pandas as pd
 from datetime import datetime
-from docx import Document
-from docx.shared import Inches, Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-import matplotlib.pyplot as plt
-import matplotlib
-import seaborn as sns
-import numpy as np
+import io
 import os
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
+import sys
+from sales_cube import SalesCube
+from sales_index import load_report_data, parse_report_filters, describe_filters, print_no_matching_rows
+from chart_renderer import chart_task, render_charts
+from docx_tables import format_numbers, format_dates
+from report_template import get_template_path, load_template, fill_template
+from pipeline_metrics import stage, instrumented
 import warnings
 warnings.filterwarnings('ignore')
 
-# matplotlib 백엔드 설정 (GUI 없이 이미지만 생성)
-matplotlib.use('Agg')
+# 차트 렌더 프로파일 (이메일 첨부 용량을 줄이기 위해 'email' 사용, 인쇄용은 'print')
+CHART_PROFILE = 'email'
 
-# 한글 폰트 설정 (Windows 환경)
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
-
-def load_and_clean_data(file_path):
-    """데이터 로드 및 전처리"""
-    # CSV 파일 읽기
-    df = pd.read_csv(file_path)
-    
-    print("=== 데이터 로드 중 ===")
-    print(f"총 데이터 개수: {len(df)}개")
-    
-    # 데이터 정리
-    # 1. 날짜 컬럼 변환
-    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-    
-    # 2. 제품명과 카테고리 대소문자 정리
-    df['ProductName'] = df['ProductName'].str.title()
-    df['Category'] = df['Category'].str.title()
-    df['Salesperson'] = df['Salesperson'].str.title()
-    
-    # 3. 빈 값이나 잘못된 데이터 제거
-    df = df.dropna(subset=['Date', 'ProductID', 'Quantity', 'UnitPrice'])
-    df = df[df['ProductID'] != 'P0000']
-    df = df[df['Quantity'] > 0]
-    df = df[df['UnitPrice'] > 0]
-    
-    # 4. TotalPrice 재계산
-    df['TotalPrice'] = df['Quantity'] * df['UnitPrice']
-    
-    print(f"정리 후 데이터 개수: {len(df)}개")
-    return df
-
-def create_charts(df):
-    """차트 생성 및 이미지 파일로 저장"""
-    print("📊 차트 생성 중...")
-    
-    # 차트 파일들을 저장할 리스트
-    chart_files = []
-    
-    try:
+def build_chart_tasks(cube):
+    """보고서 차트 작업 정의 (각 작업에는 집계된 Series만 전달)"""
+    return [
         # 1. 카테고리별 매출 파이차트
-        category_sales = df.groupby('Category')['TotalPrice'].sum().sort_values(ascending=False)
-        
-        plt.figure(figsize=(8, 6))
-        colors = plt.cm.Set3(np.linspace(0, 1, len(category_sales)))
-        wedges, texts, autotexts = plt.pie(category_sales.values, labels=category_sales.index, 
-                                          autopct='%1.1f%%', colors=colors, startangle=90)
-        plt.title('카테고리별 매출 비율', fontsize=14, fontweight='bold', pad=20)
-        
-        # 범례 추가
-        plt.legend(wedges, [f'{cat}\n{val:,.0f}원' for cat, val in category_sales.items()], 
-                  title="카테고리별 매출액", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
-        
-        plt.tight_layout()
-        chart1_path = 'chart_category_pie.png'
-        plt.savefig(chart1_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        chart_files.append(chart1_path)
-        
+        chart_task('pie', cube.sales_by('Category'), 'chart_category_pie.png'),
         # 2. 지역별 매출 막대차트
-        region_sales = df.groupby('Region')['TotalPrice'].sum().sort_values(ascending=False)
-        
-        plt.figure(figsize=(10, 6))
-        bars = plt.bar(region_sales.index, region_sales.values, color=['#FF9999', '#66B2FF', '#99FF99', '#FFCC99'])
-        plt.title('지역별 매출액', fontsize=14, fontweight='bold', pad=20)
-        plt.xlabel('지역', fontsize=12)
-        plt.ylabel('매출액 (원)', fontsize=12)
-        
-        # 막대 위에 값 표시
-        for bar, value in zip(bars, region_sales.values):
-            plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(region_sales.values) * 0.01, 
-                    f'{value:,.0f}원', ha='center', va='bottom', fontsize=10)
-        
-        plt.xticks(rotation=45)
-        plt.grid(axis='y', alpha=0.3)
-        plt.tight_layout()
-        chart2_path = 'chart_region_bar.png'
-        plt.savefig(chart2_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        chart_files.append(chart2_path)
-        
+        chart_task('bar', cube.sales_by('Region'), 'chart_region_bar.png',
+                   title='지역별 매출액', xlabel='지역',
+                   color=['#FF9999', '#66B2FF', '#99FF99', '#FFCC99']),
         # 3. 일별 매출 추이 선 그래프
-        daily_sales = df.groupby('Date')['TotalPrice'].sum().sort_index()
-        
-        plt.figure(figsize=(12, 6))
-        plt.plot(daily_sales.index, daily_sales.values, marker='o', linewidth=2, markersize=4, color='#2E86AB')
-        plt.title('일별 매출 추이', fontsize=14, fontweight='bold', pad=20)
-        plt.xlabel('날짜', fontsize=12)
-        plt.ylabel('매출액 (원)', fontsize=12)
-        
-        # 최고/최저점 표시
-        max_idx = daily_sales.idxmax()
-        min_idx = daily_sales.idxmin()
-        plt.annotate(f'최고: {daily_sales[max_idx]:,.0f}원', 
-                    xy=(max_idx, daily_sales[max_idx]), xytext=(10, 10),
-                    textcoords='offset points', ha='left',
-                    bbox=dict(boxstyle='round,pad=0.3', fc='yellow', alpha=0.7),
-                    arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
-        
-        plt.xticks(rotation=45)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        chart3_path = 'chart_daily_trend.png'
-        plt.savefig(chart3_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        chart_files.append(chart3_path)
-        
+        chart_task('line', cube.daily_totals(), 'chart_daily_trend.png'),
         # 4. 베스트셀러 제품 TOP 5 막대차트
-        top5_products = df.groupby('ProductName')['TotalPrice'].sum().sort_values(ascending=False).head(5)
-        
-        plt.figure(figsize=(10, 6))
-        bars = plt.barh(range(len(top5_products)), top5_products.values, color='#FFB347')
-        plt.title('베스트셀러 제품 TOP 5 (매출액 기준)', fontsize=14, fontweight='bold', pad=20)
-        plt.xlabel('매출액 (원)', fontsize=12)
-        plt.ylabel('제품명', fontsize=12)
-        
-        # y축 레이블 설정
-        plt.yticks(range(len(top5_products)), top5_products.index)
-        
-        # 막대 끝에 값 표시
-        for i, (bar, value) in enumerate(zip(bars, top5_products.values)):
-            plt.text(bar.get_width() + max(top5_products.values) * 0.01, bar.get_y() + bar.get_height()/2, 
-                    f'{value:,.0f}원', ha='left', va='center', fontsize=10)
-        
-        plt.grid(axis='x', alpha=0.3)
-        plt.tight_layout()
-        chart4_path = 'chart_top_products.png'
-        plt.savefig(chart4_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        chart_files.append(chart4_path)
-        
+        chart_task('barh', cube.sales_by('ProductName').head(5), 'chart_top_products.png',
+                   title='베스트셀러 제품 TOP 5 (매출액 기준)', ylabel='제품명'),
         # 5. 영업사원별 성과 비교 차트
-        df_clean = df[df['Salesperson'].notna() & (df['Salesperson'] != '')]
-        salesperson_sales = df_clean.groupby('Salesperson')['TotalPrice'].sum().sort_values(ascending=False)
-        
-        plt.figure(figsize=(10, 6))
-        bars = plt.bar(salesperson_sales.index, salesperson_sales.values, color='#98FB98')
-        plt.title('영업사원별 매출 성과', fontsize=14, fontweight='bold', pad=20)
-        plt.xlabel('영업사원', fontsize=12)
-        plt.ylabel('매출액 (원)', fontsize=12)
-        
-        # 막대 위에 값 표시
-        for bar, value in zip(bars, salesperson_sales.values):
-            plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(salesperson_sales.values) * 0.01, 
-                    f'{value:,.0f}원', ha='center', va='bottom', fontsize=9, rotation=0)
-        
-        plt.xticks(rotation=45)
-        plt.grid(axis='y', alpha=0.3)
-        plt.tight_layout()
-        chart5_path = 'chart_salesperson.png'
-        plt.savefig(chart5_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        chart_files.append(chart5_path)
+        chart_task('bar', cube.salesperson_sales()['총 매출액'], 'chart_salesperson.png',
+                   title='영업사원별 매출 성과', xlabel='영업사원',
+                   color='#98FB98', value_fontsize=9)
+    ]
+
+def create_charts(cube):
+    """차트 생성 및 이미지 파일로 저장 (차트별로 병렬 렌더링)"""
+    print("📊 차트 생성 중...")
+    
+    try:
+        chart_files = render_charts(build_chart_tasks(cube), profile=CHART_PROFILE)
         
         print(f"✅ {len(chart_files)}개의 차트가 생성되었습니다.")
         return chart_files
@@ -181,260 +49,231 @@ def create_charts(df):
         print(f"❌ 차트 생성 중 오류 발생: {e}")
         return []
 
-def generate_word_report(df):
-    """워드 파일(.docx) 보고서 생성"""
+def build_report_skeleton(doc):
+    """보고서 골격 작성 (제목, 머리글, 고정 문구와 자리표시자)"""
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    
+    # 제목 추가
+    title = doc.add_heading('판매 데이터 분석 보고서', 0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    
+    # 생성 일자 추가
+    doc.add_paragraph("보고서 생성일: {{report_date}}")
+    doc.add_paragraph("")  # 빈 줄
+    
+    # === 1. 요약 통계 ===
+    doc.add_heading('📊 요약 통계', level=1)
+    doc.add_paragraph("{{table:summary}}")
+    doc.add_paragraph("")  # 빈 줄
+    
+    # === 2. 카테고리별 분석 ===
+    doc.add_heading('📊 카테고리별 판매 분석', level=1)
+    doc.add_paragraph("{{table:category}}")
+    doc.add_paragraph("{{chart:category}}")
+    doc.add_paragraph("")  # 빈 줄
+    
+    # === 3. 지역별 분석 ===
+    doc.add_heading('🌍 지역별 판매 분석', level=1)
+    doc.add_paragraph("{{table:region}}")
+    doc.add_paragraph("{{chart:region}}")
+    doc.add_paragraph("")  # 빈 줄
+    
+    # === 4. 베스트셀러 제품 ===
+    doc.add_heading('🏆 베스트셀러 제품 TOP 10', level=1)
+    doc.add_paragraph("{{table:products}}")
+    doc.add_paragraph("{{chart:products}}")
+    doc.add_paragraph("")  # 빈 줄
+    
+    # === 5. 영업사원별 분석 ===
+    doc.add_heading('👤 영업사원별 판매 성과', level=1)
+    doc.add_paragraph("{{table:salesperson}}")
+    doc.add_paragraph("{{chart:salesperson}}")
+    doc.add_paragraph("")  # 빈 줄
+    
+    # === 6. 일별 매출 추이 분석 ===
+    doc.add_heading('📈 일별 매출 추이 분석', level=1)
+    
+    daily_stats = doc.add_paragraph()
+    daily_stats.add_run("• 최고 매출일: {{max_sales_day}} - {{max_sales}}원\n")
+    daily_stats.add_run("• 최저 매출일: {{min_sales_day}} - {{min_sales}}원\n")
+    daily_stats.add_run("• 일평균 매출액: {{avg_daily_sales}}원")
+    
+    doc.add_paragraph("{{chart:daily}}")
+    
+    # 일별 매출 TOP 10
+    doc.add_paragraph("")
+    doc.add_heading('일별 매출 TOP 10', level=2)
+    doc.add_paragraph("{{table:top_days}}")
+    
+    # === 7. 결론 및 제안사항 ===
+    doc.add_heading('💡 결론 및 제안사항', level=1)
+    
+    conclusions = doc.add_paragraph()
+    conclusions.add_run("1. 주요 성과 카테고리: '{{top_category}}' 카테고리가 전체 매출의 주요 부분을 차지하고 있습니다.\n\n")
+    conclusions.add_run("2. 핵심 지역: '{{top_region}}' 지역이 가장 높은 매출을 기록했습니다.\n\n")
+    conclusions.add_run("3. 우수 영업사원: '{{top_salesperson}}' 사원이 최고 성과를 달성했습니다.\n\n")
+    conclusions.add_run("4. 일평균 매출: {{avg_daily_sales}}원으로, 지속적인 매출 관리가 필요합니다.\n\n")
+    conclusions.add_run("5. 제안사항: 상위 성과 카테고리와 지역에 대한 마케팅 투자 확대를 고려해보시기 바랍니다.")
+
+@instrumented('document')
+def build_report_document(cube, chart_files, template_path=None, scope=None):
+    """
+    보고서 골격 템플릿에 큐브의 분석 결과와 차트를 채운 문서 생성
+    
+    Args:
+        cube (SalesCube): 판매 집계 큐브 (전체 또는 지역/영업사원별 일부)
+        chart_files (list): build_chart_tasks() 순서대로 렌더링된 차트 파일 경로 또는 ChartImage 리스트
+        template_path (str): 사용할 템플릿 .docx 경로 (기본값: 골격을 자동 생성하여 캐시에 저장)
+        scope (str): 보고서 대상 설명 (예: '지역: North', 생성일 옆에 표시)
+    
+    Returns:
+        Document: 채워진 문서
+    """
+    from docx.shared import Inches
+    
+    def chart_at(index):
+        """index번째 차트 파일 (생성되지 않았으면 None)"""
+        return chart_files[index] if len(chart_files) > index else None
+    
+    # 요약 데이터
+    summary = cube.summary()
+    total_sales = summary['total_sales']
+    total_quantity = summary['total_quantity']
+    avg_order_value = summary['avg_order_value']
+    unique_products = summary['unique_products']
+    date_range = f"{summary['min_date'].strftime('%Y-%m-%d')} ~ {summary['max_date'].strftime('%Y-%m-%d')}"
+    
+    summary_data = [
+        ['분석 기간', date_range],
+        ['총 매출액', f"{total_sales:,.0f}원"],
+        ['총 판매 수량', f"{total_quantity:,}개"],
+        ['평균 주문 금액', f"{avg_order_value:,.0f}원"],
+        ['판매된 제품 종류', f"{unique_products}개"]
+    ]
+    
+    # 분석 데이터 생성
+    category_sales = cube.category_sales()
+    region_sales = cube.region_sales()
+    top_products = cube.product_sales(top_n=10)
+    salesperson_data = cube.salesperson_sales()
+    daily_sales = cube.daily_sales()
+    
+    # 일별 통계
+    max_sales_day = daily_sales['일별 매출액'].idxmax()
+    min_sales_day = daily_sales['일별 매출액'].idxmin()
+    avg_daily_sales = daily_sales['일별 매출액'].mean()
+    top10_days = daily_sales.sort_values('일별 매출액', ascending=False).head(10)
+    
+    # 텍스트 자리표시자 값
+    values = {
+        'report_date': datetime.now().strftime('%Y년 %m월 %d일') + (f" (대상 {scope})" if scope else ''),
+        'max_sales_day': max_sales_day.strftime('%Y-%m-%d'),
+        'max_sales': f"{daily_sales.loc[max_sales_day, '일별 매출액']:,.0f}",
+        'min_sales_day': min_sales_day.strftime('%Y-%m-%d'),
+        'min_sales': f"{daily_sales.loc[min_sales_day, '일별 매출액']:,.0f}",
+        'avg_daily_sales': f"{avg_daily_sales:,.0f}",
+        # 자동 생성된 인사이트
+        'top_category': category_sales.index[0],
+        'top_region': region_sales.index[0],
+        # 영업사원 정보가 없는 일부 보고서(예: 한 지역)는 '-'로 표시
+        'top_salesperson': salesperson_data.index[0] if len(salesperson_data) else '-'
+    }
+    
+    # 표 자리표시자 데이터
+    tables = {
+        'summary': pd.DataFrame(summary_data, columns=['구분', '값']),
+        'category': pd.DataFrame({
+            '카테고리': category_sales.index,
+            '총 매출액 (원)': format_numbers(category_sales['총 매출액']),
+            '총 수량 (개)': format_numbers(category_sales['총 수량']),
+            '제품 종류 수': category_sales['제품 종류 수'].astype('float64')
+        }),
+        'region': pd.DataFrame({
+            '지역': region_sales.index,
+            '총 매출액 (원)': format_numbers(region_sales['총 매출액']),
+            '총 수량 (개)': format_numbers(region_sales['총 수량'])
+        }),
+        'products': pd.DataFrame({
+            '순위': range(1, len(top_products) + 1),
+            '제품명': top_products.index.get_level_values('ProductName'),
+            '총 매출액 (원)': format_numbers(top_products['총 매출액']),
+            '총 수량 (개)': format_numbers(top_products['총 수량'])
+        }),
+        'salesperson': pd.DataFrame({
+            '영업사원': salesperson_data.index,
+            '총 매출액 (원)': format_numbers(salesperson_data['총 매출액']),
+            '총 수량 (개)': format_numbers(salesperson_data['총 수량']),
+            '거래 횟수': format_numbers(salesperson_data['거래 횟수'])
+        }),
+        'top_days': pd.DataFrame({
+            '순위': range(1, len(top10_days) + 1),
+            '날짜': format_dates(top10_days.index),
+            '매출액 (원)': format_numbers(top10_days['일별 매출액'])
+        })
+    }
+    
+    # 차트 자리표시자 (차트 파일, 이미지 너비, 차트 제목)
+    charts = {
+        'category': (chart_at(0), Inches(6), "📊 카테고리별 매출 비율 차트"),
+        'region': (chart_at(1), Inches(6), "📊 지역별 매출 비교 차트"),
+        'daily': (chart_at(2), Inches(7), "📊 일별 매출 추이 차트"),
+        'products': (chart_at(3), Inches(6), "📊 베스트셀러 제품 TOP 5 차트"),
+        'salesperson': (chart_at(4), Inches(6), "📊 영업사원별 매출 성과 차트")
+    }
+    
+    # 보고서 골격을 불러와 데이터만 채움
+    if template_path is None:
+        template_path = get_template_path('sales_analysis_report', build_report_skeleton)
+    doc = load_template(template_path)
+    fill_template(doc, values, tables, charts)
+    return doc
+
+def render_word_report(cube, template_path=None, scope=None, parallel=True):
+    """
+    차트와 보고서를 파일로 저장하지 않고 메모리에서 만들어 .docx 바이트로 반환
+    (고정된 차트 파일 이름을 쓰지 않으므로 한 프로세스에서 여러 보고서를 동시에 만들어도 안전)
+    
+    Args:
+        cube (SalesCube): 판매 집계 큐브
+        template_path (str): 사용할 템플릿 .docx 경로 (기본값: 골격을 자동 생성하여 캐시에 저장)
+        scope (str): 보고서 대상 설명 (예: '지역: North')
+        parallel (bool): False이면 차트를 현재 프로세스에서 순서대로 렌더링
+    
+    Returns:
+        bytes: .docx 파일 내용
+    """
+    charts = render_charts(build_chart_tasks(cube), profile=CHART_PROFILE, parallel=parallel, in_memory=True)
+    doc = build_report_document(cube, charts, template_path, scope=scope)
+    with stage('save'):
+        buffer = io.BytesIO()
+        doc.save(buffer)
+    return buffer.getvalue()
+
+def generate_word_report(cube, template_path=None, scope=None):
+    """
+    워드 파일(.docx) 보고서 생성 (보고서 골격 템플릿에 데이터만 채워 넣음)
+    
+    Args:
+        cube (SalesCube): 판매 집계 큐브
+        template_path (str): 사용할 템플릿 .docx 경로 (기본값: 골격을 자동 생성하여 캐시에 저장)
+        scope (str): 보고서 대상 설명 (예: '기간: 2025-09-15 ~ 2025-09-21 / 지역: North')
+    
+    Returns:
+        bool: 생성 성공 여부
+    """
     print("="*30)
     print("📄 Word 보고서 생성 중...")
     print("="*30)
     
     try:
         # 차트 생성
-        chart_files = create_charts(df)
-        
-        # 새 문서 생성
-        doc = Document()
-        
-        # 제목 추가
-        title = doc.add_heading('판매 데이터 분석 보고서', 0)
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        # 생성 일자 추가
-        doc.add_paragraph(f"보고서 생성일: {datetime.now().strftime('%Y년 %m월 %d일')}")
-        doc.add_paragraph("")  # 빈 줄
-        
-        # === 1. 요약 통계 ===
-        doc.add_heading('📊 요약 통계', level=1)
-        
-        # 요약 통계 표 생성
-        summary_table = doc.add_table(rows=6, cols=2)
-        summary_table.style = 'Table Grid'
-        
-        # 표 헤더
-        summary_table.cell(0, 0).text = '구분'
-        summary_table.cell(0, 1).text = '값'
-        
-        # 요약 데이터
-        total_sales = df['TotalPrice'].sum()
-        total_quantity = df['Quantity'].sum()
-        avg_order_value = df['TotalPrice'].mean()
-        unique_products = df['ProductID'].nunique()
-        date_range = f"{df['Date'].min().strftime('%Y-%m-%d')} ~ {df['Date'].max().strftime('%Y-%m-%d')}"
-        
-        summary_data = [
-            ['분석 기간', date_range],
-            ['총 매출액', f"{total_sales:,.0f}원"],
-            ['총 판매 수량', f"{total_quantity:,}개"],
-            ['평균 주문 금액', f"{avg_order_value:,.0f}원"],
-            ['판매된 제품 종류', f"{unique_products}개"]
-        ]
-        
-        for i, (category, value) in enumerate(summary_data, 1):
-            summary_table.cell(i, 0).text = category
-            summary_table.cell(i, 1).text = value
-        
-        doc.add_paragraph("")  # 빈 줄
-        
-        # === 2. 카테고리별 분석 ===
-        doc.add_heading('📊 카테고리별 판매 분석', level=1)
-        
-        # 카테고리별 데이터 생성
-        category_sales = df.groupby('Category').agg({
-            'TotalPrice': 'sum',
-            'Quantity': 'sum',
-            'ProductID': 'nunique'
-        }).round(2)
-        category_sales.columns = ['총 매출액', '총 수량', '제품 종류 수']
-        category_sales = category_sales.sort_values('총 매출액', ascending=False)
-        
-        # 카테고리별 분석 표
-        cat_table = doc.add_table(rows=len(category_sales)+1, cols=4)
-        cat_table.style = 'Table Grid'
-        
-        # 표 헤더
-        cat_headers = ['카테고리', '총 매출액 (원)', '총 수량 (개)', '제품 종류 수']
-        for i, header in enumerate(cat_headers):
-            cat_table.cell(0, i).text = header
-        
-        # 카테고리 데이터
-        for i, (category, row) in enumerate(category_sales.iterrows(), 1):
-            cat_table.cell(i, 0).text = category
-            cat_table.cell(i, 1).text = f"{row['총 매출액']:,.0f}"
-            cat_table.cell(i, 2).text = f"{row['총 수량']:,.0f}"
-            cat_table.cell(i, 3).text = str(row['제품 종류 수'])
-        
-        # 카테고리별 매출 파이차트 삽입
-        if len(chart_files) > 0 and os.path.exists(chart_files[0]):
-            doc.add_paragraph("")
-            doc.add_paragraph("📊 카테고리별 매출 비율 차트", style='Heading 2')
-            doc.add_picture(chart_files[0], width=Inches(6))
-        
-        doc.add_paragraph("")  # 빈 줄
-        
-        # === 3. 지역별 분석 ===
-        doc.add_heading('🌍 지역별 판매 분석', level=1)
-        
-        # 지역별 데이터 생성
-        region_sales = df.groupby('Region').agg({
-            'TotalPrice': 'sum',
-            'Quantity': 'sum'
-        }).round(2)
-        region_sales.columns = ['총 매출액', '총 수량']
-        region_sales = region_sales.sort_values('총 매출액', ascending=False)
-        
-        # 지역별 분석 표
-        region_table = doc.add_table(rows=len(region_sales)+1, cols=3)
-        region_table.style = 'Table Grid'
-        
-        # 표 헤더
-        region_headers = ['지역', '총 매출액 (원)', '총 수량 (개)']
-        for i, header in enumerate(region_headers):
-            region_table.cell(0, i).text = header
-        
-        # 지역 데이터
-        for i, (region, row) in enumerate(region_sales.iterrows(), 1):
-            region_table.cell(i, 0).text = region
-            region_table.cell(i, 1).text = f"{row['총 매출액']:,.0f}"
-            region_table.cell(i, 2).text = f"{row['총 수량']:,.0f}"
-        
-        # 지역별 매출 막대차트 삽입
-        if len(chart_files) > 1 and os.path.exists(chart_files[1]):
-            doc.add_paragraph("")
-            doc.add_paragraph("📊 지역별 매출 비교 차트", style='Heading 2')
-            doc.add_picture(chart_files[1], width=Inches(6))
-        
-        doc.add_paragraph("")  # 빈 줄
-        
-        # === 4. 베스트셀러 제품 ===
-        doc.add_heading('🏆 베스트셀러 제품 TOP 10', level=1)
+        chart_files = create_charts(cube)
         
-        # 베스트셀러 제품 데이터
-        top_products = df.groupby(['ProductID', 'ProductName']).agg({
-            'TotalPrice': 'sum',
-            'Quantity': 'sum'
-        }).sort_values('TotalPrice', ascending=False).head(10)
-        
-        # 베스트셀러 표
-        product_table = doc.add_table(rows=len(top_products)+1, cols=4)
-        product_table.style = 'Table Grid'
-        
-        # 표 헤더
-        product_headers = ['순위', '제품명', '총 매출액 (원)', '총 수량 (개)']
-        for i, header in enumerate(product_headers):
-            product_table.cell(0, i).text = header
-        
-        # 제품 데이터
-        for i, ((product_id, product_name), row) in enumerate(top_products.iterrows(), 1):
-            product_table.cell(i, 0).text = str(i)
-            product_table.cell(i, 1).text = product_name
-            product_table.cell(i, 2).text = f"{row['TotalPrice']:,.0f}"
-            product_table.cell(i, 3).text = f"{row['Quantity']:,.0f}"
-        
-        # 베스트셀러 제품 차트 삽입
-        if len(chart_files) > 3 and os.path.exists(chart_files[3]):
-            doc.add_paragraph("")
-            doc.add_paragraph("📊 베스트셀러 제품 TOP 5 차트", style='Heading 2')
-            doc.add_picture(chart_files[3], width=Inches(6))
-        
-        doc.add_paragraph("")  # 빈 줄
-        
-        # === 5. 영업사원별 분석 ===
-        doc.add_heading('👤 영업사원별 판매 성과', level=1)
-        
-        # 영업사원별 데이터 생성
-        df_clean = df[df['Salesperson'].notna() & (df['Salesperson'] != '')]
-        salesperson_data = df_clean.groupby('Salesperson').agg({
-            'TotalPrice': 'sum',
-            'Quantity': 'sum',
-            'Date': 'count'
-        }).sort_values('TotalPrice', ascending=False)
-        
-        # 영업사원 분석 표
-        sales_table = doc.add_table(rows=len(salesperson_data)+1, cols=4)
-        sales_table.style = 'Table Grid'
-        
-        # 표 헤더
-        sales_headers = ['영업사원', '총 매출액 (원)', '총 수량 (개)', '거래 횟수']
-        for i, header in enumerate(sales_headers):
-            sales_table.cell(0, i).text = header
-        
-        # 영업사원 데이터
-        for i, (salesperson, row) in enumerate(salesperson_data.iterrows(), 1):
-            sales_table.cell(i, 0).text = salesperson
-            sales_table.cell(i, 1).text = f"{row['TotalPrice']:,.0f}"
-            sales_table.cell(i, 2).text = f"{row['Quantity']:,.0f}"
-            sales_table.cell(i, 3).text = str(row['Date'])
-        
-        # 영업사원별 성과 차트 삽입
-        if len(chart_files) > 4 and os.path.exists(chart_files[4]):
-            doc.add_paragraph("")
-            doc.add_paragraph("📊 영업사원별 매출 성과 차트", style='Heading 2')
-            doc.add_picture(chart_files[4], width=Inches(6))
-        
-        doc.add_paragraph("")  # 빈 줄
-        
-        # === 6. 일별 매출 추이 분석 ===
-        doc.add_heading('📈 일별 매출 추이 분석', level=1)
-        
-        # 일별 데이터 생성
-        daily_sales = df.groupby('Date').agg({
-            'TotalPrice': 'sum',
-            'Quantity': 'sum'
-        }).round(2)
-        daily_sales.columns = ['일별 매출액', '일별 수량']
-        
-        # 일별 통계
-        max_sales_day = daily_sales['일별 매출액'].idxmax()
-        min_sales_day = daily_sales['일별 매출액'].idxmin()
-        avg_daily_sales = daily_sales['일별 매출액'].mean()
-        
-        daily_stats = doc.add_paragraph()
-        daily_stats.add_run(f"• 최고 매출일: {max_sales_day.strftime('%Y-%m-%d')} - {daily_sales.loc[max_sales_day, '일별 매출액']:,.0f}원\n")
-        daily_stats.add_run(f"• 최저 매출일: {min_sales_day.strftime('%Y-%m-%d')} - {daily_sales.loc[min_sales_day, '일별 매출액']:,.0f}원\n")
-        daily_stats.add_run(f"• 일평균 매출액: {avg_daily_sales:,.0f}원")
-        
-        # 일별 매출 추이 차트 삽입
-        if len(chart_files) > 2 and os.path.exists(chart_files[2]):
-            doc.add_paragraph("")
-            doc.add_paragraph("📊 일별 매출 추이 차트", style='Heading 2')
-            doc.add_picture(chart_files[2], width=Inches(7))
-        
-        # 일별 매출 TOP 10
-        doc.add_paragraph("")
-        doc.add_heading('일별 매출 TOP 10', level=2)
-        
-        top10_days = daily_sales.sort_values('일별 매출액', ascending=False).head(10)
-        
-        daily_table = doc.add_table(rows=len(top10_days)+1, cols=3)
-        daily_table.style = 'Table Grid'
-        
-        # 표 헤더
-        daily_headers = ['순위', '날짜', '매출액 (원)']
-        for i, header in enumerate(daily_headers):
-            daily_table.cell(0, i).text = header
-        
-        # 일별 데이터
-        for i, (date, row) in enumerate(top10_days.iterrows(), 1):
-            daily_table.cell(i, 0).text = str(i)
-            daily_table.cell(i, 1).text = date.strftime('%Y-%m-%d')
-            daily_table.cell(i, 2).text = f"{row['일별 매출액']:,.0f}"
-        
-        # === 7. 결론 및 제안사항 ===
-        doc.add_heading('💡 결론 및 제안사항', level=1)
-        
-        # 자동 생성된 인사이트
-        top_category = category_sales.index[0]
-        top_region = region_sales.index[0]
-        top_salesperson = salesperson_data.index[0]
-        
-        conclusions = doc.add_paragraph()
-        conclusions.add_run(f"1. 주요 성과 카테고리: '{top_category}' 카테고리가 전체 매출의 주요 부분을 차지하고 있습니다.\n\n")
-        conclusions.add_run(f"2. 핵심 지역: '{top_region}' 지역이 가장 높은 매출을 기록했습니다.\n\n")
-        conclusions.add_run(f"3. 우수 영업사원: '{top_salesperson}' 사원이 최고 성과를 달성했습니다.\n\n")
-        conclusions.add_run(f"4. 일평균 매출: {avg_daily_sales:,.0f}원으로, 지속적인 매출 관리가 필요합니다.\n\n")
-        conclusions.add_run("5. 제안사항: 상위 성과 카테고리와 지역에 대한 마케팅 투자 확대를 고려해보시기 바랍니다.")
+        doc = build_report_document(cube, chart_files, template_path, scope=scope)
         
         # 문서 저장
-        doc.save('sales_analysis_report.docx')
+        with stage('save'):
+            doc.save('sales_analysis_report.docx')
         print("✅ Word 보고서가 'sales_analysis_report.docx' 파일로 저장되었습니다.")
         
         # 임시 차트 파일들 정리 (선택적)
@@ -449,7 +288,7 @@ def generate_word_report(df):
         return False
 
 def send_email_with_report(docx_file_path, recipient_emails, sender_email=None, sender_password=None, 
-                          smtp_server="smtp.gmail.com", smtp_port=587):
+                          smtp_server="smtp.gmail.com", smtp_port=587, group_size=1):
     """
     워드 보고서를 첨부하여 이메일 전송
     
@@ -460,10 +299,15 @@ def send_email_with_report(docx_file_path, recipient_emails, sender_email=None,
         sender_password (str): 보내는 사람 이메일 비밀번호 (앱 비밀번호 권장)
         smtp_server (str): SMTP 서버 주소 (기본값: Gmail)
         smtp_port (int): SMTP 포트 번호 (기본값: 587)
+        group_size (int): 메시지 하나에 넣을 받는 사람 수 (1이면 개인별 메시지, None이면 전체를 한 메시지로)
     
     Returns:
         bool: 전송 성공 여부
     """
+    # 이메일 모듈은 전송할 때만 가져옴 (보고서 생성만 하는 실행은 SMTP 라이브러리를 불러오지 않음)
+    import smtplib
+    from smtp_delivery import build_report_messages, send_messages, failed_recipients, print_delivery_failures
+    
     print("="*30)
     print("📧 이메일 전송 중...")
     print("="*30)
@@ -477,11 +321,7 @@ def send_email_with_report(docx_file_path, recipient_emails, sender_email=None,
             import getpass
             sender_password = getpass.getpass("이메일 비밀번호(앱 비밀번호)를 입력하세요: ")
         
-        # 이메일 메시지 생성
-        msg = MIMEMultipart()
-        msg['From'] = sender_email
-        msg['To'] = ", ".join(recipient_emails)
-        msg['Subject'] = f"판매 데이터 분석 보고서 - {datetime.now().strftime('%Y년 %m월 %d일')}"
+        subject = f"판매 데이터 분석 보고서 - {datetime.now().strftime('%Y년 %m월 %d일')}"
         
         # 이메일 본문 작성
         body = f"""
@@ -506,42 +346,24 @@ def send_email_with_report(docx_file_path, recipient_emails, sender_email=None,
 자동 생성된 보고서입니다.
 """
         
-        # 본문을 이메일에 추가
-        msg.attach(MIMEText(body, 'plain', 'utf-8'))
-        
-        # 워드 파일 첨부
+        # 워드 파일 첨부 (받는 사람별 또는 그룹별 메시지 생성)
         if os.path.exists(docx_file_path):
-            with open(docx_file_path, "rb") as attachment:
-                # MIMEBase 객체 생성
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(attachment.read())
-            
-            # 파일을 base64로 인코딩
-            encoders.encode_base64(part)
-            
-            # 헤더 추가
-            filename = os.path.basename(docx_file_path)
-            part.add_header(
-                'Content-Disposition',
-                f'attachment; filename= {filename}',
-            )
-            
-            # 이메일에 파일 첨부
-            msg.attach(part)
-            print(f"✅ 파일 '{filename}' 첨부 완료")
+            messages = build_report_messages(sender_email, recipient_emails, subject, body,
+                                             attachment_path=docx_file_path, mime_type='application/octet-stream',
+                                             group_size=group_size)
+            print(f"✅ 파일 '{os.path.basename(docx_file_path)}' 첨부 완료")
         else:
             print(f"❌ 파일을 찾을 수 없습니다: {docx_file_path}")
             return False
         
-        # SMTP 서버 연결 및 이메일 전송
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.starttls()  # TLS 보안 연결 시작
-        server.login(sender_email, sender_password)
+        # 재사용 연결 풀로 SMTP 서버 연결 및 이메일 전송
+        results = send_messages(messages, smtp_server, smtp_port, sender_email, sender_password)
         
-        # 이메일 전송
-        text = msg.as_string()
-        server.sendmail(sender_email, recipient_emails, text)
-        server.quit()
+        failed = failed_recipients(results)
+        if failed:
+            print(f"❌ 일부 받는 사람에게 전송하지 못했습니다 ({len(failed)}명):")
+            print_delivery_failures(results)
+            return False
         
         print(f"✅ 이메일이 성공적으로 전송되었습니다!")
         print(f"📧 받는 사람: {', '.join(recipient_emails)}")
@@ -636,16 +458,25 @@ def send_email_interactive():
         print(f"\n❌ 오류가 발생했습니다: {e}")
         return False
 
-def main():
-    """메인 함수"""
+def main(filters=None):
+    """메인 함수 (filters: 기간과 지역/카테고리/영업사원 조건, None이면 전체)"""
     print("🚀 판매 데이터 Word 보고서 생성을 시작합니다...\n")
     
     try:
-        # 데이터 로드 및 전처리
-        df = load_and_clean_data('cicd_data.csv')
+        # 데이터 로드 및 전처리 (조건이 있으면 색인으로 해당 행만 선택)
+        df = load_report_data('cicd_data.csv', filters)
+        if df is None:
+            print("❌ 데이터 로드에 실패했습니다.")
+            return
+        if df.empty:
+            print_no_matching_rows(filters)
+            return
+        
+        # 집계 큐브 생성 (차트와 표는 모두 이 결과를 다시 묶어서 사용)
+        cube = SalesCube.from_dataframe(df)
         
         # Word 보고서 생성
-        if generate_word_report(df):
+        if generate_word_report(cube, scope=describe_filters(filters)):
             print("\n" + "="*50)
             print("✅ Word 보고서 생성이 완료되었습니다!")
             print("📄 생성된 파일: sales_analysis_report.docx")
@@ -667,4 +498,5 @@ def main():
         print(f"❌ 분석 중 오류가 발생했습니다: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # --start/--end/--region/--category/--salesperson 옵션: 보고서 대상 조건
+    main(filters=parse_report_filters(sys.argv[1:]))
\ No newline at end of file